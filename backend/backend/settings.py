@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "news.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -171,6 +172,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "news.tasks.fetch_and_store_news",
         "schedule": 1800.0,
     },
+    "reconcile-article-counts": {
+        "task": "news.tasks.reconcile_article_counts",
+        "schedule": 6 * 60 * 60.0,
+    },
 }
 
 # --------------------------------------------------------------------------
@@ -179,6 +184,66 @@ CELERY_BEAT_SCHEDULE = {
 NEWS_API_KEY = os.environ.get("NEWS_API_KEY", "YOUR_NEWS_API_KEY_HERE")
 NEWS_API_BASE_URL = "https://newsapi.org/v2"
 
+# Countries polled by the periodic fetch (one feed per category × country)
+NEWS_API_COUNTRIES = os.environ.get("NEWS_API_COUNTRIES", "us").split(",")
+# Parallel HTTP requests per fetch run, and per-request timeout / retries
+NEWS_API_CONCURRENCY = int(os.environ.get("NEWS_API_CONCURRENCY", 8))
+NEWS_API_TIMEOUT = 30
+NEWS_API_MAX_RETRIES = 3
+# Shared request budget for the API key (see news/quota.py): a token bucket
+# refilling NEWS_API_QUOTA_REQUESTS per NEWS_API_QUOTA_WINDOW seconds.
+NEWS_API_QUOTA_REQUESTS = int(os.environ.get("NEWS_API_QUOTA_REQUESTS", 1000))
+NEWS_API_QUOTA_WINDOW = 24 * 60 * 60
+# Share of the bucket each priority class must leave for higher classes
+NEWS_API_QUOTA_RESERVE = {"scheduled": 0.0, "manual": 0.2}
+# Seconds a request of each class may wait for tokens before being rejected
+NEWS_API_QUOTA_MAX_WAIT = {"scheduled": 60, "manual": 0}
+# Article list totals (see news/counts.py): exact COUNT(*) below the
+# threshold, planner estimates above it; counts are cached per query and
+# refreshed after each ingest run for the most recent queries
+NEWS_COUNT_EXACT_THRESHOLD = 10000
+NEWS_COUNT_CACHE_TTL = 30 * 60
+NEWS_COUNT_REFRESH_LIMIT = 100
+
+# Manual fetch jobs: how long records are kept, and how long identical
+# requests are coalesced into a job that has not finished
+NEWS_FETCH_JOB_TTL = 24 * 60 * 60
+NEWS_FETCH_JOB_TIMEOUT = 10 * 60
+# Cached list responses; ingest invalidates touched slices by generation,
+# so this only bounds how long unread entries stay in Redis
+NEWS_RESPONSE_CACHE_TTL = 24 * 60 * 60
+# After this many seconds a cached response is served stale while one
+# request rebuilds it: "background" (Celery task) or "inline"
+NEWS_RESPONSE_CACHE_SOFT_TTL = 5 * 60
+NEWS_RESPONSE_REBUILD = "background"
+NEWS_RESPONSE_REBUILD_LOCK_TIMEOUT = 30
+# How long a miss waits for another request building the same response
+NEWS_RESPONSE_REBUILD_WAIT = 2
+# Distinct list requests kept in the per-key hit/miss statistics
+NEWS_RESPONSE_STATS_KEYS = 200
+# Cached article detail payloads; rows are dropped when saved or deleted
+NEWS_ARTICLE_CACHE_TTL = 7 * 24 * 60 * 60
+NEWS_ARTICLE_BATCH_MAX = 100
+# First pages of the article list pre-rendered at the end of each ingest
+# run (news/snapshots.py), for the public origin of the API
+NEWS_SNAPSHOT_PAGES = 3
+NEWS_SNAPSHOT_ORIGIN = os.environ.get("NEWS_SNAPSHOT_ORIGIN", "http://localhost:8000")
+# Values returned per facet by /api/news/articles/facets/ (news/facets.py)
+NEWS_FACET_LIMIT = 20
+# JSON bodies smaller than this are sent uncompressed (news/compression.py)
+NEWS_COMPRESSION_MIN_BYTES = 1024
+# Result pages buffered ahead of the store stage when paging /everything
+NEWS_API_PREFETCH_PAGES = 2
+
+# Near-duplicate stories: "cluster" (store with a shared cluster_id),
+# "skip" (drop later copies) or "off"
+NEWS_DEDUP_POLICY = os.environ.get("NEWS_DEDUP_POLICY", "cluster")
+NEWS_DEDUP_MAX_DISTANCE = 3  # differing SimHash bits
+NEWS_DEDUP_WINDOW = 50000  # recent articles kept in the in-memory index
+
+# Max Source / Category keys kept in each worker's in-memory resolver cache
+NEWS_RESOLVER_CACHE_SIZE = int(os.environ.get("NEWS_RESOLVER_CACHE_SIZE", 10000))
+
 # --------------------------------------------------------------------------
 # Password validation
 # --------------------------------------------------------------------------
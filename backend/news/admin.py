@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import Article, Category, Source
+from .models import Article, Category, FeedState, Source
 
 
 @admin.register(Category)
@@ -26,3 +26,17 @@ class ArticleAdmin(admin.ModelAdmin):
     list_filter = ("category", "country", "published_at")
     date_hierarchy = "published_at"
     raw_id_fields = ("source", "category")
+
+
+@admin.register(FeedState)
+class FeedStateAdmin(admin.ModelAdmin):
+    list_display = (
+        "endpoint",
+        "category",
+        "country",
+        "query",
+        "last_published_at",
+        "updated_at",
+    )
+    list_filter = ("endpoint", "country")
+    readonly_fields = ("response_hash", "recent_urls", "updated_at")
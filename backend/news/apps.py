@@ -7,3 +7,6 @@ class NewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "news"
     verbose_name = "News Articles"
+
+    def ready(self):
+        from . import signals  # noqa: F401
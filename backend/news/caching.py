@@ -0,0 +1,480 @@
+"""
+Response caching for the list endpoints, invalidated by generation.
+
+Every cached response key embeds the current value of the generation
+counters its result depends on:
+
+    news:gen:epoch                 every response (bumped by admin edits)
+    news:gen:global                unfiltered / search-only article lists,
+                                   category and source lists (counts)
+    news:gen:category:<slug>       ?category=<slug>
+    news:gen:source:<source_id>    ?source=<source_id>
+    news:gen:country:<code>        ?country=<code>
+
+Ingest bumps the global counter and those of the categories, sources
+and countries it created rows for, once the batch commits. The next
+request for a touched slice then computes a new key and misses, while
+responses for untouched slices keep their keys and stay valid for
+NEWS_RESPONSE_CACHE_TTL. Old entries are never deleted, they just stop
+being read and expire.
+
+Within one generation, entries go stale after a soft TTL and are then
+rebuilt by a single request (stale-while-revalidate); see
+GenerationCacheMixin.
+
+Article detail payloads are cached per row for NEWS_ARTICLE_CACHE_TTL
+(see get_article_payloads). Ingest never updates an existing row, so
+only model saves and deletes drop an entry, and category or source
+edits retire them all through the `related` generation.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Iterable, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+
+from .compression import coded_etag, encode_all, use_variant
+from .models import Article
+from .serializers import ArticleSerializer
+
+logger = logging.getLogger("news")
+
+GENERATION_PREFIX = "news:gen"
+EPOCH = "epoch"
+GLOBAL = "global"
+RELATED = "related"
+# Bumped when the shape of the cached detail entries changes
+ARTICLE_PREFIX = "news:article:v2"
+
+STATS_PREFIX = "news:response-stats"
+KEY_REGISTRY = f"{STATS_PREFIX}:keys"
+CACHED_VIEWS = ("articles", "facets", "categories", "sources")
+HIT, STALE, MISS = "hit", "stale", "miss"
+# Served from an ingest-published snapshot (see snapshots.py)
+SNAPSHOT = "snapshot"
+OUTCOMES = (HIT, STALE, MISS, SNAPSHOT)
+# Seconds between polls while waiting for another request's rebuild
+WAIT_INTERVAL = 0.05
+
+
+def generation_key(scope: str, value: Optional[str] = None) -> str:
+    """Cache key of one generation counter, e.g. news:gen:category:sports."""
+    if value is None:
+        return f"{GENERATION_PREFIX}:{scope}"
+    return f"{GENERATION_PREFIX}:{scope}:{value}"
+
+
+def get_generations(keys: list[str]) -> list[int]:
+    """Current values of `keys`, in order (0 for counters never bumped)."""
+    values = cache.get_many(keys)
+    return [values.get(key, 0) for key in keys]
+
+
+def modified_key(key: str) -> str:
+    """Key holding the Unix time a generation counter was last bumped."""
+    return f"{key}:at"
+
+
+def bump(keys: Iterable[str]) -> None:
+    """Increment generation counters and stamp the time; they never expire."""
+    keys = list(keys)
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+    now = int(time.time())
+    cache.set_many({modified_key(key): now for key in keys}, timeout=None)
+
+
+def bump_ingest_generations(
+    category: Optional[str] = None,
+    sources: Iterable[str] = (),
+    countries: Iterable[str] = (),
+) -> None:
+    """
+    Invalidate the slices touched by an ingest batch once it commits.
+
+    Call only for batches that created rows.
+    """
+    keys = [generation_key(GLOBAL)]
+    if category:
+        keys.append(generation_key("category", category))
+    keys += [generation_key("source", source) for source in sorted(set(sources))]
+    keys += [
+        generation_key("country", country)
+        for country in sorted(set(countries))
+        if country
+    ]
+    transaction.on_commit(lambda: bump(keys))
+
+
+def invalidate_all() -> None:
+    """Invalidate every cached response (admin edits, deletes)."""
+    transaction.on_commit(lambda: bump([generation_key(EPOCH)]))
+
+
+def get_article_entries(pks: Iterable[int]) -> dict[int, dict]:
+    """
+    Cached detail entries of the articles `pks`: the serialized payload
+    (ArticleSerializer) under "data", with the row's "updated_at" and a
+    "version" digest for conditional requests. "last_modified" (Unix
+    time) is the later of updated_at and the last category / source
+    edit, since the payload embeds their names.
+
+    Read through the cache with one get_many; the articles not cached
+    are loaded with a single query and stored. Unknown ids are left out.
+    """
+    pks = list(dict.fromkeys(pks))
+    related_key = generation_key(RELATED)
+    related, related_at = get_generations([related_key, modified_key(related_key)])
+    keys = {pk: _article_key(pk, related) for pk in pks}
+    cached = cache.get_many(list(keys.values()))
+    entries = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+    missing = [pk for pk in pks if pk not in entries]
+    if missing:
+        articles = Article.objects.select_related("category", "source").filter(
+            pk__in=missing
+        )
+        loaded = {
+            article.pk: {
+                "data": dict(ArticleSerializer(article).data),
+                "updated_at": article.updated_at,
+                "version": _digest(
+                    f"{article.pk}:{related}:{article.updated_at.isoformat()}"
+                ),
+            }
+            for article in articles
+        }
+        cache.set_many(
+            {keys[pk]: entry for pk, entry in loaded.items()},
+            timeout=settings.NEWS_ARTICLE_CACHE_TTL,
+        )
+        entries.update(loaded)
+    return {
+        pk: {
+            **entry,
+            "last_modified": max(int(entry["updated_at"].timestamp()), related_at),
+        }
+        for pk, entry in entries.items()
+    }
+
+
+def article_etag(entry: dict, variant: str) -> str:
+    """Strong ETag of one rendering (`variant`) of a detail entry."""
+    return quote_etag(_digest(f"{entry['version']}:{variant}"))
+
+
+def get_article_payloads(pks: Iterable[int]) -> dict[int, dict]:
+    """Serialized detail payloads of the articles `pks` (see above)."""
+    return {pk: entry["data"] for pk, entry in get_article_entries(pks).items()}
+
+
+def invalidate_article(pk: int) -> None:
+    """Drop the cached detail payload of one article once saved."""
+
+    def delete():
+        (related,) = get_generations([generation_key(RELATED)])
+        cache.delete(_article_key(pk, related))
+
+    transaction.on_commit(delete)
+
+
+def invalidate_related() -> None:
+    """Retire every cached detail payload (category / source edits)."""
+    transaction.on_commit(lambda: bump([generation_key(RELATED)]))
+
+
+def _article_key(pk: int, related: int) -> str:
+    return f"{ARTICLE_PREFIX}:{related}:{pk}"
+
+
+def record_outcome(prefix: str, outcome: str, query: str = "") -> None:
+    """
+    Count a cache hit, stale or miss for one list endpoint, overall and
+    for the (canonical) query string it was requested with.
+    """
+    _increment(f"{STATS_PREFIX}:{prefix}:{outcome}", timeout=None)
+    digest = _digest(f"{prefix}?{query}")
+    _increment(
+        f"{STATS_PREFIX}:key:{digest}:{outcome}",
+        timeout=settings.NEWS_RESPONSE_CACHE_TTL,
+    )
+    if outcome == MISS:
+        _register_query(digest, prefix, query)
+
+
+def cache_stats() -> dict:
+    """Hit / stale / miss counters per list endpoint."""
+    keys = [
+        f"{STATS_PREFIX}:{prefix}:{outcome}"
+        for prefix in CACHED_VIEWS
+        for outcome in OUTCOMES
+    ]
+    values = cache.get_many(keys)
+    return {
+        prefix: {
+            outcome: values.get(f"{STATS_PREFIX}:{prefix}:{outcome}", 0)
+            for outcome in OUTCOMES
+        }
+        for prefix in CACHED_VIEWS
+    }
+
+
+def key_stats() -> list[dict]:
+    """
+    Hit / stale / miss counters of recently missed cache keys, most
+    requested first.
+    """
+    registry = cache.get(KEY_REGISTRY) or {}
+    counters = cache.get_many(
+        [
+            f"{STATS_PREFIX}:key:{digest}:{outcome}"
+            for digest in registry
+            for outcome in OUTCOMES
+        ]
+    )
+    rows = [
+        {
+            "endpoint": prefix,
+            "query": query,
+            **{
+                outcome: counters.get(f"{STATS_PREFIX}:key:{digest}:{outcome}", 0)
+                for outcome in OUTCOMES
+            },
+        }
+        for digest, (prefix, query) in registry.items()
+    ]
+    return sorted(rows, key=lambda row: -sum(row[o] for o in OUTCOMES))
+
+
+def _increment(key: str, timeout: Optional[int]) -> None:
+    cache.add(key, 0, timeout=timeout)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def _register_query(digest: str, prefix: str, query: str) -> None:
+    """Remember a key for key_stats (most recent N, best effort)."""
+    registry = cache.get(KEY_REGISTRY) or {}
+    registry.pop(digest, None)
+    registry[digest] = (prefix, query)
+    while len(registry) > settings.NEWS_RESPONSE_STATS_KEYS:
+        registry.pop(next(iter(registry)))
+    cache.set(KEY_REGISTRY, registry, timeout=settings.NEWS_RESPONSE_CACHE_TTL)
+
+
+def _digest(value: str) -> str:
+    return hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()
+
+
+class GenerationCacheMixin:
+    """
+    Cache the rendered response of a list view under generation keys.
+
+    Views set `cache_prefix` and may override `get_cache_generations`
+    to depend on narrower counters than the global one.
+
+    Entries are fresh for NEWS_RESPONSE_CACHE_SOFT_TTL seconds and kept
+    for NEWS_RESPONSE_CACHE_TTL. A stale entry is still served while the
+    one request holding the rebuild lock refreshes it, either through
+    the `rebuild_list_response` task or inline, depending on
+    NEWS_RESPONSE_REBUILD. Requests that miss while another one builds
+    the same key wait up to NEWS_RESPONSE_REBUILD_WAIT seconds for it
+    instead of running the same queries. Entries keep the compressed
+    variants of the body too (see compression.py).
+    """
+
+    cache_prefix = "list"
+
+    def get_cache_generations(self, request) -> list[str]:
+        return [generation_key(GLOBAL)]
+
+    def get_cache_query(self, request) -> str:
+        """
+        Query string identifying the response.
+
+        Views override this to map equivalent requests to one entry.
+        """
+        return urlencode(sorted(request.query_params.items()))
+
+    def get_generation_state(self, request) -> tuple[list[int], Optional[int]]:
+        """
+        Values of the counters the response depends on, and the latest
+        time one of them was bumped (None if never), in one get_many.
+        """
+        keys = [generation_key(EPOCH), *self.get_cache_generations(request)]
+        stamps = [modified_key(key) for key in keys]
+        values = cache.get_many(keys + stamps)
+        modified = [values[stamp] for stamp in stamps if stamp in values]
+        return [values.get(key, 0) for key in keys], max(modified, default=None)
+
+    def get_response_cache_key(self, request, versions=None) -> str:
+        if versions is None:
+            versions, _ = self.get_generation_state(request)
+        # Scheme and host are part of the next/previous links in the body
+        url = request.build_absolute_uri(request.path)
+        digest = _digest(f"{url}?{self.get_cache_query(request)}")
+        return (
+            f"news:response:{self.cache_prefix}:"
+            f"{request.accepted_renderer.format}:"
+            f"{'.'.join(map(str, versions))}:{digest}"
+        )
+
+    def get_prebuilt_response(self, request) -> Optional[HttpResponse]:
+        """A response that needs no cache entry (see snapshots.py)."""
+        return None
+
+    def get_throttles(self):
+        # Rebuilds and snapshots render in a worker, from a synthetic
+        # request that would otherwise spend 127.0.0.1's anon budget
+        if getattr(self.request, "news_rebuild_key", None) or getattr(
+            self.request, "news_skip_cache", False
+        ):
+            return []
+        return super().get_throttles()
+
+    def get(self, request, *args, **kwargs):
+        if getattr(request, "news_skip_cache", False):
+            return super().get(request, *args, **kwargs)
+        rebuild_key = getattr(request, "news_rebuild_key", None)
+        if rebuild_key:
+            return self._build(request, rebuild_key, *args, **kwargs)
+
+        # Validators come from the counters alone: the key names exactly
+        # the response body, so a repeated poll needs no query at all
+        versions, last_modified = self.get_generation_state(request)
+        key = self.get_response_cache_key(request, versions)
+        etag = quote_etag(_digest(key))
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        response = self.get_prebuilt_response(request)
+        if response is None:
+            response = self._cached_get(request, key, *args, **kwargs)
+        if response.status_code == 200:
+            if response.has_header("Content-Encoding"):
+                etag = coded_etag(etag, response["Content-Encoding"])
+            set_validators(response, etag, last_modified)
+        return response
+
+    def _cached_get(self, request, key, *args, **kwargs):
+        query = self.get_cache_query(request)
+        entry = cache.get(key)
+        if entry is not None:
+            if time.time() < entry["fresh_until"]:
+                record_outcome(self.cache_prefix, HIT, query)
+                return self._cached_response(request, entry, HIT)
+            record_outcome(self.cache_prefix, STALE, query)
+            if self._acquire(key):
+                if settings.NEWS_RESPONSE_REBUILD == "inline":
+                    return self._build(request, key, *args, **kwargs)
+                self._schedule_rebuild(request, key)
+            return self._cached_response(request, entry, STALE)
+
+        record_outcome(self.cache_prefix, MISS, query)
+        if not self._acquire(key):
+            entry = self._wait_for(key)
+            if entry is not None:
+                return self._cached_response(request, entry, MISS)
+        return self._build(request, key, *args, **kwargs)
+
+    def _build(self, request, key, *args, **kwargs):
+        """Run the view and store its rendered response under `key`."""
+        response = super().get(request, *args, **kwargs)
+        response["X-Cache"] = MISS.upper()
+        if response.status_code != 200:
+            cache.delete(_lock_key(key))
+            return response
+
+        def store(rendered):
+            entry = {
+                "content": rendered.content,
+                "encoded": encode_all(rendered.content),
+                "content_type": rendered["Content-Type"],
+                "fresh_until": time.time() + settings.NEWS_RESPONSE_CACHE_SOFT_TTL,
+            }
+            cache.set(key, entry, timeout=settings.NEWS_RESPONSE_CACHE_TTL)
+            cache.delete(_lock_key(key))
+            use_variant(request, rendered, entry["encoded"])
+
+        response.add_post_render_callback(store)
+        return response
+
+    @staticmethod
+    def _cached_response(request, entry: dict, outcome: str) -> HttpResponse:
+        response = HttpResponse(entry["content"], content_type=entry["content_type"])
+        use_variant(request, response, entry.get("encoded") or {})
+        response["X-Cache"] = outcome.upper()
+        return response
+
+    @staticmethod
+    def _acquire(key: str) -> bool:
+        """Take the single-flight rebuild lock for `key` (SET NX in Redis)."""
+        return cache.add(
+            _lock_key(key), 1, timeout=settings.NEWS_RESPONSE_REBUILD_LOCK_TIMEOUT
+        )
+
+    @staticmethod
+    def _wait_for(key: str) -> Optional[dict]:
+        """Poll for the entry another request is building."""
+        deadline = time.monotonic() + settings.NEWS_RESPONSE_REBUILD_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+        return None
+
+    @staticmethod
+    def _schedule_rebuild(request, key: str) -> None:
+        from .tasks import rebuild_list_response
+
+        try:
+            rebuild_list_response.delay(
+                request.get_full_path(), request.get_host(), request.is_secure(), key
+            )
+        except Exception as e:
+            logger.error("Error queueing rebuild of %s: %s", key, e)
+            cache.delete(_lock_key(key))
+
+
+def not_modified(request, etag: str, last_modified: Optional[int] = None):
+    """
+    A 304 response if the request's validators match, else None.
+
+    If-None-Match may carry the ETag of any content-coded variant of the
+    same response (see coded_etag).
+    """
+    for tag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        if tag == etag or tag.rsplit("-", 1)[0] + '"' == etag:
+            etag = tag
+            break
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag: str, last_modified: Optional[int]) -> None:
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:lock"
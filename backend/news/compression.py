@@ -0,0 +1,132 @@
+"""
+Content coding of JSON API responses.
+
+A JSON body of at least NEWS_COMPRESSION_MIN_BYTES is sent brotli- or
+gzip-compressed, whichever the request's Accept-Encoding prefers
+(brotli wins ties, and is only offered when the `brotli` package is
+installed). Smaller bodies are sent as they are: compressing them saves
+less than the headers cost.
+
+Cached list responses and snapshots store their compressed variants
+next to the plain body (see `encode_all`), so a cache hit is served
+without compressing anything. Everything else is compressed on the way
+out by CompressionMiddleware. HTML (the admin, the browsable API) is
+left alone: its CSRF tokens make it a BREACH target.
+"""
+
+import gzip
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only without it
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+# Quality 5 compresses about as fast as gzip -6, and smaller
+BROTLI_QUALITY = 5
+
+
+def codings() -> list[str]:
+    """Codings this server can produce, preferred first."""
+    return [BROTLI, GZIP] if brotli is not None else [GZIP]
+
+
+def negotiate(request, available: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    The coding to use for `request` among `available` (default: all
+    supported), or None to send the body uncompressed.
+    """
+    available = codings() if available is None else list(available)
+    weights = {}
+    for part in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def encode(content: bytes, coding: str) -> bytes:
+    if coding == BROTLI:
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, mtime=0)
+
+
+def encode_all(content: bytes) -> dict[str, bytes]:
+    """Every supported coding of `content`, or {} below the size threshold."""
+    if len(content) < settings.NEWS_COMPRESSION_MIN_BYTES:
+        return {}
+    return {coding: encode(content, coding) for coding in codings()}
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """ETag of a content-coded representation, e.g. "abc" -> "abc-gzip"."""
+    return f'{etag[:-1]}-{coding}"'
+
+
+def use_variant(request, response, variants: dict[str, bytes]) -> None:
+    """
+    Send the variant of `response`'s body (from encode_all) that the
+    request accepts, if any.
+    """
+    if not variants:
+        return
+    # The plain body is large enough to be compressed for other clients
+    patch_vary_headers(response, ["Accept-Encoding"])
+    coding = negotiate(request, variants)
+    if coding is not None:
+        _set_body(response, variants[coding], coding)
+
+
+def _compressible(response) -> bool:
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.has_header("Content-Encoding")
+        and response.get("Content-Type", "").startswith("application/json")
+        and len(response.content) >= settings.NEWS_COMPRESSION_MIN_BYTES
+    )
+
+
+def _set_body(response, content: bytes, coding: str) -> None:
+    response.content = content
+    response["Content-Encoding"] = coding
+    response["Content-Length"] = str(len(content))
+    if response.has_header("ETag"):
+        response["ETag"] = coded_etag(response["ETag"], coding)
+
+
+class CompressionMiddleware:
+    """Compress JSON responses that were not served precompressed."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if _compressible(response):
+            patch_vary_headers(response, ["Accept-Encoding"])
+            coding = negotiate(request)
+            if coding is not None:
+                _set_body(response, encode(response.content, coding), coding)
+        return response
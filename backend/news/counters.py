@@ -0,0 +1,113 @@
+"""
+Maintained article counts of categories and sources.
+
+Category.article_count and Source.article_count are kept in step with
+news_article by whatever writes it, so the category and source lists
+read them instead of running COUNT over news_article:
+
+    ingest (_store_rows, import_articles)   add the rows each batch created
+    Article saves and deletes (signals.py)  +1 / -1, and moves between
+                                            categories or sources
+    archive_old_articles() (migration 0007) subtracts the rows it moves
+
+Each batch applies its changes with one UPDATE per model, inside the
+transaction that wrote the articles. Anything that bypasses these
+paths (raw SQL, manual fixes in psql) is repaired by `reconcile`, which
+the `reconcile_article_counts` task runs every 6 hours (see
+CELERY_BEAT_SCHEDULE).
+"""
+
+import logging
+from collections import Counter
+from typing import Iterable, Optional
+
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+
+from .caching import GLOBAL, bump, generation_key
+from .models import Article, Category, Source
+
+logger = logging.getLogger("news")
+
+# Model -> the Article foreign key column counted into it
+COUNTED = ((Category, "category_id"), (Source, "source_id"))
+
+
+def add_articles(
+    rows: Iterable[tuple[Optional[int], Optional[int]]], sign: int = 1
+) -> None:
+    """
+    Count articles in (`sign` 1) or out (-1) of their category and source.
+
+    `rows` are (category_id, source_id) pairs, one per article.
+    """
+    categories, sources = Counter(), Counter()
+    for category_id, source_id in rows:
+        if category_id is not None:
+            categories[category_id] += sign
+        if source_id is not None:
+            sources[source_id] += sign
+    _apply(Category, categories)
+    _apply(Source, sources)
+
+
+def reconcile() -> int:
+    """
+    Recount every category and source whose counter has drifted.
+
+    Returns the number of rows corrected.
+    """
+    fixed = 0
+    for model, column in COUNTED:
+        drifted = list(
+            model.objects.annotate(actual=Count("articles"))
+            .exclude(article_count=F("actual"))
+            .values_list("pk", flat=True)
+        )
+        if not drifted:
+            continue
+        actual = (
+            Article.objects.filter(**{column: OuterRef("pk")})
+            .order_by()
+            .values(column)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        # Recounted in the UPDATE, not from the SELECT above, so rows an
+        # ingest batch commits in between are not lost
+        model.objects.filter(pk__in=drifted).update(
+            article_count=Coalesce(Subquery(actual), 0)
+        )
+        logger.warning(
+            "Reconciled article_count of %d %s rows",
+            len(drifted),
+            model._meta.model_name,
+        )
+        fixed += len(drifted)
+    if fixed:
+        # Category and source list responses follow the global counter
+        bump([generation_key(GLOBAL)])
+    return fixed
+
+
+def _apply(model, deltas: Counter) -> None:
+    """One UPDATE adding each delta to its row's counter."""
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    model.objects.filter(pk__in=deltas).update(
+        article_count=F("article_count")
+        + Case(
+            *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+            output_field=IntegerField(),
+        )
+    )
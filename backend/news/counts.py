@@ -0,0 +1,164 @@
+"""
+Total counts for paginated article lists.
+
+An exact COUNT(*) over a filtered news_article query (especially with
+`search`) can cost more than fetching the page itself. `count_queryset`
+picks the cheapest acceptable answer:
+
+1. A cached count for the same filters, if one exists. Counts are
+   cached per canonical filter set (ArticleListView.
+   get_canonical_filters) for NEWS_COUNT_CACHE_TTL seconds under the
+   epoch and global generations (see caching.py), so a batch that
+   creates rows, a delete or an admin edit retires them, and
+   `refresh_counts` recomputes them exactly after every run.
+2. Otherwise the planner's estimate: pg_class.reltuples for an
+   unfiltered list, or the row estimate of EXPLAIN for a filtered one.
+3. If the estimate is below NEWS_COUNT_EXACT_THRESHOLD (or there is no
+   planner to ask, e.g. SQLite), an exact COUNT(*) is cheap enough.
+
+Every result says whether it is exact, and the list response passes
+that on as `count_type`. A count can change while the list's own
+counters do not (an estimate refined by `refresh_counts`, a recount
+once the cached one expires), so each filter set has a counter of its
+own, `count_generation`, that is bumped whenever its count changes.
+The list responses depend on it, and their ETag changes with it.
+"""
+
+import hashlib
+import json
+import logging
+from typing import NamedTuple, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .caching import EPOCH, GLOBAL, bump, generation_key, get_generations
+
+logger = logging.getLogger("news")
+
+COUNT = "count"
+REGISTRY_KEY = "news:count:queries"
+
+
+class QueryCount(NamedTuple):
+    """A total row count and whether it is exact or a planner estimate."""
+
+    value: int
+    exact: bool
+
+
+def count_generation(filters: dict) -> str:
+    """Counter bumped when the count of `filters` changes (see above)."""
+    return generation_key(COUNT, _filters_digest(filters))
+
+
+def _filters_digest(filters: dict) -> str:
+    # Filters only: pages and field sets share a count
+    return hashlib.sha256(urlencode(sorted(filters.items())).encode()).hexdigest()
+
+
+def _count_key(filters: dict) -> str:
+    versions = get_generations([generation_key(EPOCH), generation_key(GLOBAL)])
+    return f"news:count:{'.'.join(map(str, versions))}:{_filters_digest(filters)}"
+
+
+def _last_count_key(filters: dict) -> str:
+    return f"news:count:last:{_filters_digest(filters)}"
+
+
+def count_queryset(queryset, filters: dict) -> QueryCount:
+    """
+    Total rows of `queryset`, the list of the canonical `filters`, exact
+    or estimated (see module docstring).
+    """
+    key = _count_key(filters)
+    cached = cache.get(key)
+    if cached is not None:
+        return QueryCount(*cached)
+
+    estimate = estimate_count(queryset)
+    if estimate is None or estimate < settings.NEWS_COUNT_EXACT_THRESHOLD:
+        result = QueryCount(queryset.count(), True)
+    else:
+        result = QueryCount(estimate, False)
+
+    _store(filters, key, result)
+    _register(filters)
+    return result
+
+
+def estimate_count(queryset) -> Optional[int]:
+    """
+    The planner's row estimate for `queryset`.
+
+    Returns None when the database has no usable estimate (not
+    PostgreSQL, or the table was never analyzed).
+    """
+    if connection.vendor != "postgresql":
+        return None
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+    # reltuples is -1 until the first VACUUM / ANALYZE
+    return estimate if estimate >= 0 else None
+
+
+def refresh_counts() -> int:
+    """
+    Recompute exact counts for recently requested queries.
+
+    Called after ingest runs so list responses keep serving cached,
+    exact totals instead of estimates. Returns the number refreshed.
+    """
+    from .views import ArticleListView
+
+    registry = cache.get(REGISTRY_KEY) or {}
+    for filters in registry.values():
+        queryset = ArticleListView.filtered_queryset(filters)
+        _store(filters, _count_key(filters), QueryCount(queryset.count(), True))
+    if registry:
+        logger.info("Refreshed %d cached article counts", len(registry))
+    return len(registry)
+
+
+def _store(filters: dict, key: str, result: QueryCount) -> None:
+    """Cache a count, and bump count_generation(filters) if it changed."""
+    last_key = _last_count_key(filters)
+    previous = cache.get(last_key)
+    cache.set(key, tuple(result), timeout=settings.NEWS_COUNT_CACHE_TTL)
+    # Outlives every response built while `key` was cached
+    cache.set(
+        last_key,
+        tuple(result),
+        timeout=settings.NEWS_COUNT_CACHE_TTL + settings.NEWS_RESPONSE_CACHE_TTL,
+    )
+    if previous is not None and tuple(previous) != tuple(result):
+        bump([count_generation(filters)])
+
+
+def _register(filters: dict) -> None:
+    """Remember a filter set for refresh_counts (most recent N, best effort)."""
+    digest = _filters_digest(filters)
+    registry = cache.get(REGISTRY_KEY) or {}
+    registry.pop(digest, None)
+    registry[digest] = filters
+    while len(registry) > settings.NEWS_COUNT_REFRESH_LIMIT:
+        registry.pop(next(iter(registry)))
+    cache.set(REGISTRY_KEY, registry, timeout=settings.NEWS_COUNT_CACHE_TTL)
@@ -0,0 +1,237 @@
+"""
+Near-duplicate story detection for the ingest pipeline.
+
+The same wire story is republished by many sources under different URLs
+with small edits to the headline or teaser. Every article gets a 64-bit
+SimHash of its title + description; two articles whose hashes differ in
+at most NEWS_DEDUP_MAX_DISTANCE bits are treated as the same story.
+
+`SimHashIndex` finds such matches in constant time per article: the hash
+is split into NEWS_DEDUP_MAX_DISTANCE + 1 bands, so any near-duplicate
+must match at least one band exactly (pigeonhole).
+Each band bucket keeps a bounded number of recent entries, and the whole
+index is bounded to the most recent NEWS_DEDUP_WINDOW articles, warmed
+from the table on first use.
+
+Every feed runs in its own worker process, each with its own index, so
+before each batch the index first reads the clustered rows other
+processes have committed since it last looked (`sync`). A copy of a
+story ingested under one feed is then matched by every other worker.
+
+A cluster is identified by the SimHash of its first article. Later
+copies carry that cluster_id and `is_duplicate=True`, so list endpoints
+can collapse a cluster to its first copy. Depending on NEWS_DEDUP_POLICY,
+later copies are stored ("cluster"), dropped ("skip") or not checked at
+all ("off").
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Article
+
+TOKEN_RE = re.compile(r"\w+")
+# Trailing " - Source Name" / " | Source Name" that publishers append
+SOURCE_SUFFIX_RE = re.compile(r"\s+[-|\u2013\u2014]\s+[^-|\u2013\u2014]{1,40}$")
+
+BUCKET_SIZE = 32
+# Ids re-read below the highest one seen by `sync`: a transaction that
+# took lower ids may commit after one that took higher ids
+SYNC_OVERLAP = 1000
+
+
+def simhash(text: str) -> int:
+    """
+    Return the 64-bit SimHash of `text` as a signed integer.
+
+    Features are lower-cased word unigrams and bigrams. The result is
+    signed so it fits a PostgreSQL BIGINT column.
+    """
+    words = TOKEN_RE.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+
+    weights = [0] * 64
+    for feature in features:
+        digest = int.from_bytes(
+            hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big"
+        )
+        for bit in range(64):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+
+    value = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def story_simhash(title: str, description: str) -> int:
+    """SimHash of an article's title (minus any source suffix) + description."""
+    title = SOURCE_SUFFIX_RE.sub("", title or "")
+    return simhash(f"{title} {description or ''}")
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two 64-bit hashes."""
+    return bin((a ^ b) & 0xFFFFFFFFFFFFFFFF).count("1")
+
+
+class SimHashIndex:
+    """
+    Bounded LSH index of recent (simhash, cluster_id) pairs.
+
+    Args:
+        max_distance: Max differing bits for two hashes to match.
+        window: Max number of entries kept in memory.
+    """
+
+    def __init__(self, max_distance: int, window: int):
+        self.max_distance = max_distance
+        self.window = window
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self._buckets: dict[tuple[int, int], deque] = {}
+        self._entries: OrderedDict[int, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmed = False
+        self._last_id = 0
+
+    def find(self, value: int) -> Optional[int]:
+        """Return the cluster_id of a near-duplicate of `value`, if any."""
+        if not self._warmed:
+            self.warm()
+        with self._lock:
+            for band in self._bands(value):
+                for other, cluster_id in self._buckets.get(band, ()):
+                    if hamming(value, other) <= self.max_distance:
+                        return cluster_id
+        return None
+
+    def add(self, value: int, cluster_id: int) -> None:
+        """Remember a hash; the oldest entry is evicted past the window."""
+        with self._lock:
+            self._add(value, cluster_id)
+
+    def assign_clusters(self, articles: list[Article]) -> list[Article]:
+        """
+        Set `cluster_id` on new articles and apply NEWS_DEDUP_POLICY.
+
+        Returns the articles that should be stored. Near-duplicates within
+        the same batch are detected as well. Index entries are only kept
+        once the surrounding transaction commits.
+        """
+        policy = settings.NEWS_DEDUP_POLICY
+        if policy == "off":
+            return articles
+
+        self.sync()
+        kept = []
+        # Catches copies of the same story within this batch
+        batch = SimHashIndex(self.max_distance, window=max(len(articles), 1))
+        batch._warmed = True
+        for article in articles:
+            if not article.simhash:
+                # No words to compare (empty title and description)
+                kept.append(article)
+                continue
+            cluster_id = self.find(article.simhash)
+            if cluster_id is None:
+                cluster_id = batch.find(article.simhash)
+            if cluster_id is not None and policy == "skip":
+                continue
+            article.is_duplicate = cluster_id is not None
+            article.cluster_id = article.simhash if cluster_id is None else cluster_id
+            batch.add(article.simhash, article.cluster_id)
+            kept.append(article)
+
+        transaction.on_commit(lambda: self._add_many(batch._entries))
+        return kept
+
+    def warm(self) -> None:
+        """Load the most recent clustered articles from the table."""
+        rows = self._recent(Article.objects.all())
+        with self._lock:
+            self._buckets.clear()
+            self._entries.clear()
+            self._load(rows)
+            self._warmed = True
+
+    def sync(self) -> None:
+        """
+        Load the clustered articles committed since the last warm / sync,
+        by this or any other process.
+        """
+        if not self._warmed:
+            self.warm()
+            return
+        rows = self._recent(
+            Article.objects.filter(id__gt=self._last_id - SYNC_OVERLAP)
+        )
+        with self._lock:
+            self._load(rows)
+
+    def _recent(self, queryset) -> list[tuple[int, int, int]]:
+        """(id, simhash, cluster_id) of the newest clustered rows, oldest first."""
+        rows = (
+            queryset.exclude(cluster_id__isnull=True)
+            .order_by("-id")
+            .values_list("id", "simhash", "cluster_id")[: self.window]
+        )
+        return list(reversed(rows))
+
+    def _load(self, rows: list[tuple[int, int, int]]) -> None:
+        for pk, value, cluster_id in rows:
+            self._add(value, cluster_id)
+            self._last_id = max(self._last_id, pk)
+
+    def _bands(self, value: int) -> list[tuple[int, int]]:
+        unsigned = value & 0xFFFFFFFFFFFFFFFF
+        mask = (1 << self.band_bits) - 1
+        return [
+            (band, unsigned >> (band * self.band_bits) & mask)
+            for band in range(self.bands)
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._entries.clear()
+            self._warmed = False
+            self._last_id = 0
+
+    def _add_many(self, mapping: dict[int, int]) -> None:
+        with self._lock:
+            for value, cluster_id in mapping.items():
+                self._add(value, cluster_id)
+
+    def _add(self, value: int, cluster_id: int) -> None:
+        if value in self._entries:
+            return
+        self._entries[value] = cluster_id
+        for band in self._bands(value):
+            self._buckets.setdefault(band, deque(maxlen=BUCKET_SIZE)).append(
+                (value, cluster_id)
+            )
+        while len(self._entries) > self.window:
+            old_value, old_cluster = self._entries.popitem(last=False)
+            for band in self._bands(old_value):
+                bucket = self._buckets.get(band)
+                if bucket is None:
+                    continue
+                try:
+                    bucket.remove((old_value, old_cluster))
+                except ValueError:
+                    pass
+                if not bucket:
+                    del self._buckets[band]
+
+
+dedup_index = SimHashIndex(
+    max_distance=settings.NEWS_DEDUP_MAX_DISTANCE,
+    window=settings.NEWS_DEDUP_WINDOW,
+)
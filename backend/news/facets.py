@@ -0,0 +1,133 @@
+"""
+Grouped article counts for the dashboard filters.
+
+`facet_counts` counts the articles of a filtered queryset per category,
+source and country, and in total, with one aggregate query. On
+PostgreSQL that is a single scan grouped by
+
+    GROUPING SETS ((category_id), (source_id), (country), ())
+
+with the top NEWS_FACET_LIMIT values of each facet picked by a window
+function in the same statement. Other databases group by all three
+columns at once and the facets are rolled up in Python.
+
+Facet values are returned as the filter values ArticleListView takes
+(category slug, source_id, lower-case country code), with names for
+categories and sources. Articles without a category, source or country
+are in the total but not in a facet.
+"""
+
+from collections import Counter
+from typing import Optional
+
+from django.db import connection
+from django.db.models import Count
+
+from .models import Category, Source
+
+COLUMNS = ("category_id", "source_id", "country")
+FACETS = ("category", "source", "country")
+# GROUPING(category_id, source_id, country) of each grouping set: a set
+# bit means the column is rolled up in that row
+GROUPINGS = {0b011: "category", 0b101: "source", 0b110: "country", 0b111: None}
+
+FACET_SQL = """
+    SELECT grouping_id, category_id, source_id, country, total FROM (
+        SELECT
+            GROUPING(category_id, source_id, country) AS grouping_id,
+            category_id, source_id, country,
+            COUNT(*) AS total,
+            ROW_NUMBER() OVER (
+                PARTITION BY GROUPING(category_id, source_id, country)
+                ORDER BY COUNT(*) DESC, category_id, source_id, country
+            ) AS position
+        FROM ({filtered}) AS filtered
+        GROUP BY GROUPING SETS ((category_id), (source_id), (country), ())
+    ) AS ranked
+    WHERE position <= %s
+"""
+
+
+def facet_counts(queryset, limit: int) -> dict:
+    """
+    Total and top-`limit` facet values of an article queryset:
+
+        {"total": 120,
+         "category": [{"value": "sports", "name": "Sports", "count": 80}],
+         "source": [{"value": "bbc-news", "name": "BBC News", "count": 30}],
+         "country": [{"value": "gb", "count": 45}]}
+    """
+    queryset = queryset.order_by().values_list(*COLUMNS)
+    if connection.vendor == "postgresql":
+        total, counts = _grouping_sets(queryset, limit)
+    else:
+        total, counts = _rolled_up(queryset)
+
+    # Unset values take at most one slot per facet; drop them, then cap
+    top = {
+        facet: [
+            (value, count)
+            for value, count in sorted(
+                counts[facet].items(), key=lambda item: (-item[1], str(item[0]))
+            )
+            if value not in (None, "")
+        ][:limit]
+        for facet in FACETS
+    }
+    categories = _labels(Category, "slug", [value for value, _ in top["category"]])
+    sources = _labels(Source, "source_id", [value for value, _ in top["source"]])
+    return {
+        "total": total,
+        "category": [
+            {"value": categories[pk][0], "name": categories[pk][1], "count": count}
+            for pk, count in top["category"]
+            if pk in categories
+        ],
+        "source": [
+            {"value": sources[pk][0], "name": sources[pk][1], "count": count}
+            for pk, count in top["source"]
+            if pk in sources
+        ],
+        "country": [
+            {"value": value, "count": count} for value, count in top["country"]
+        ],
+    }
+
+
+def _grouping_sets(queryset, limit: int) -> tuple[int, dict[str, Counter]]:
+    sql, params = queryset.query.sql_with_params()
+    counts = {facet: Counter() for facet in FACETS}
+    total = 0
+    with connection.cursor() as cursor:
+        # One extra row per facet in case an unset value is in the top
+        cursor.execute(FACET_SQL.format(filtered=sql), [*params, limit + 1])
+        for grouping_id, category_id, source_id, country, count in cursor:
+            facet = GROUPINGS[grouping_id]
+            if facet is None:
+                total = count
+            else:
+                value = dict(zip(FACETS, (category_id, source_id, country)))[facet]
+                counts[facet][value] = count
+    return total, counts
+
+
+def _rolled_up(queryset) -> tuple[int, dict[str, Counter]]:
+    counts = {facet: Counter() for facet in FACETS}
+    total = 0
+    for *values, count in queryset.annotate(total=Count("pk")):
+        total += count
+        for facet, value in zip(FACETS, values):
+            counts[facet][value] += count
+    return total, counts
+
+
+def _labels(model, value_field: str, pks: list[Optional[int]]) -> dict:
+    """pk -> (filter value, name) of the given rows."""
+    if not pks:
+        return {}
+    return {
+        pk: (value, name)
+        for pk, value, name in model.objects.filter(pk__in=pks).values_list(
+            "pk", value_field, "name"
+        )
+    }
@@ -0,0 +1,114 @@
+"""
+Fetch job records for asynchronous manual fetches.
+
+POST /api/news/fetch/ no longer calls the News API inside the request:
+it creates a job record here, enqueues the `run_fetch_job` Celery task
+and returns the job id. The task updates the record as each feed
+finishes, and GET /api/news/fetch/<job_id>/ reads it back.
+
+Records live in the Django cache (Redis) for NEWS_FETCH_JOB_TTL seconds.
+Requests for the same set of feeds share one in-flight job: the first
+request saves its record, then claims the feed set with cache.add(),
+and later ones get its id until the job finishes and releases the claim. The claim expires after
+NEWS_FETCH_JOB_TIMEOUT seconds in case a worker dies mid-job.
+"""
+
+import hashlib
+import json
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .services import Feed
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+def _job_key(job_id: str) -> str:
+    return f"news:fetch-job:{job_id}"
+
+
+def _inflight_key(feeds: list[Feed]) -> str:
+    canonical = sorted(json.dumps(feed) for feed in feeds)
+    digest = hashlib.sha256("|".join(canonical).encode()).hexdigest()
+    return f"news:fetch-job:inflight:{digest}"
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Return the job record, or None if unknown or expired."""
+    return cache.get(_job_key(job_id))
+
+
+def save_job(job: dict) -> None:
+    cache.set(_job_key(job["id"]), job, timeout=settings.NEWS_FETCH_JOB_TTL)
+
+
+def create_job(feeds: list[Feed]) -> tuple[dict, bool]:
+    """
+    Create a queued job for `feeds`, or return the in-flight one.
+
+    Returns:
+        (job, created) where created is False for a coalesced request.
+    """
+    inflight_key = _inflight_key(feeds)
+    job_id = uuid.uuid4().hex
+    job = {
+        "id": job_id,
+        "state": QUEUED,
+        "feeds": [
+            {
+                "feed": feed._asdict(),
+                "created": None,
+                "error": None,
+                "seconds": None,
+                "stats": None,
+            }
+            for feed in feeds
+        ],
+        "total": 0,
+        "created_at": timezone.now().isoformat(),
+        "started_at": None,
+        "finished_at": None,
+    }
+
+    job["inflight_key"] = inflight_key
+    # Saved before claiming, so a request that finds the claim finds its job
+    save_job(job)
+
+    claim_timeout = settings.NEWS_FETCH_JOB_TIMEOUT
+    if cache.add(inflight_key, job_id, timeout=claim_timeout):
+        return job, True
+
+    claimed = cache.get(inflight_key)
+    existing = get_job(claimed) if claimed else None
+    if claimed and (existing is None or existing["state"] not in FINISHED_STATES):
+        # In flight. A record lost to cache eviction counts as in flight
+        # too: its claim still expires after NEWS_FETCH_JOB_TIMEOUT.
+        cache.delete(_job_key(job_id))
+        return existing or {"id": claimed, "state": QUEUED}, False
+
+    # Claim released, or left behind by a finished job: take it over
+    cache.set(inflight_key, job_id, timeout=claim_timeout)
+    return job, True
+
+
+def finish_job(job: dict, state: str) -> None:
+    """Mark a job finished and release its in-flight claim."""
+    job["state"] = state
+    job["finished_at"] = timezone.now().isoformat()
+    save_job(job)
+    if cache.get(job["inflight_key"]) == job["id"]:
+        cache.delete(job["inflight_key"])
+
+
+def public_job(job: dict) -> dict:
+    """The job record as returned by the status endpoint."""
+    return {key: value for key, value in job.items() if key != "inflight_key"}
@@ -0,0 +1,146 @@
+"""
+Management command to benchmark the article ingest path.
+
+Compares the legacy per-article get_or_create loop with the set-based
+bulk upsert in NewsAPIService._store_articles on synthetic pages.
+Every run happens inside a transaction that is rolled back, so the
+database is left untouched.
+
+Usage:
+    python manage.py benchmark_ingest
+    python manage.py benchmark_ingest --sizes 100 1000 10000 --repeat 3
+"""
+
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.text import slugify
+
+from news.models import Article, Category, Source
+from news.services import NewsAPIService
+
+
+def make_raw_articles(count: int, sources: int = 25) -> list[dict]:
+    """Build `count` unique NewsAPI-shaped article dicts."""
+    run_id = uuid.uuid4().hex[:8]
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "source": {"id": f"bench-{i % sources}", "name": f"Bench {i % sources}"},
+            "author": "Benchmark",
+            "title": f"Benchmark article {i}",
+            "description": "Synthetic article used for ingest benchmarks.",
+            "url": f"https://bench.example.com/{run_id}/{i}",
+            "urlToImage": "",
+            "publishedAt": (base + timedelta(seconds=i)).isoformat(),
+            "content": "Lorem ipsum " * 20,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_store_articles(service, articles, category=None, country=None):
+    """The original per-article ingest loop, kept for comparison."""
+    created_count = 0
+    category_obj = None
+    if category:
+        category_obj, _ = Category.objects.get_or_create(
+            slug=slugify(category),
+            defaults={"name": category.title()},
+        )
+
+    for raw in articles:
+        article_url = raw.get("url")
+        if not article_url:
+            continue
+        source_info = raw.get("source", {})
+        source_obj, _ = Source.objects.get_or_create(
+            source_id=service._source_key(source_info),
+            defaults={
+                "name": source_info.get("name", "Unknown"),
+                "country": country or "",
+            },
+        )
+        published_at = service._parse_date(raw.get("publishedAt"))
+        if not published_at:
+            continue
+        _, created = Article.objects.get_or_create(
+            url=article_url,
+            defaults={
+                "source": source_obj,
+                "category": category_obj,
+                "source_name": source_info.get("name", ""),
+                "author": (raw.get("author") or "")[:500],
+                "title": (raw.get("title") or "")[:1000],
+                "description": raw.get("description") or "",
+                "url_to_image": raw.get("urlToImage") or "",
+                "published_at": published_at,
+                "content": raw.get("content") or "",
+                "country": country or "",
+            },
+        )
+        if created:
+            created_count += 1
+    return created_count
+
+
+class Command(BaseCommand):
+    help = "Benchmark legacy vs bulk article ingestion (changes are rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[100, 1000, 10000],
+            help="Articles per _store_articles call.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Runs per size and path; the best time is reported.",
+        )
+
+    def handle(self, *args, **options):
+        service = NewsAPIService()
+        paths = {
+            "legacy": lambda articles: legacy_store_articles(
+                service, articles, category="benchmark", country="us"
+            ),
+            "bulk": lambda articles: service._store_articles(
+                articles, category="benchmark", country="us"
+            ),
+        }
+
+        self.stdout.write(
+            f"{'size':>7}  {'path':<7} {'created':>8} {'queries':>8} "
+            f"{'seconds':>9} {'rows/s':>10}"
+        )
+        for size in options["sizes"]:
+            for name, store in paths.items():
+                best = None
+                for _ in range(options["repeat"]):
+                    result = self._run(store, make_raw_articles(size))
+                    if best is None or result[2] < best[2]:
+                        best = result
+                created, queries, elapsed = best
+                self.stdout.write(
+                    f"{size:>7}  {name:<7} {created:>8} {queries:>8} "
+                    f"{elapsed:>9.3f} {size / elapsed:>10.0f}"
+                )
+
+    @staticmethod
+    def _run(store, articles):
+        """Run one ingest call in a rolled-back transaction."""
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                created = store(articles)
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        return created, len(ctx.captured_queries), elapsed
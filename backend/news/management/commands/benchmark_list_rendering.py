@@ -0,0 +1,127 @@
+"""
+Management command to benchmark article list serialization.
+
+Compares the two ways of producing a 50-row article list page:
+
+    drf   model instances (select_related + defer) -> ArticleListSerializer
+          -> JSONRenderer
+    fast  values_list() named rows -> article_list_data -> FastJSONRenderer
+          (the path ArticleListView uses)
+
+Each page is produced both ways and the bytes are compared, so the run
+also checks that the fast path is byte-compatible. Seeded articles are
+rolled back afterwards.
+
+Usage:
+    python manage.py benchmark_list_rendering
+    python manage.py benchmark_list_rendering --rows 20000 --pages 50
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from news.management.commands.benchmark_search import make_articles
+from news.models import Article, Category
+from news.renderers import FastJSONRenderer
+from news.serializers import (
+    ArticleListSerializer,
+    article_list_data,
+    article_list_rows,
+)
+
+PAGE_SIZE = 50
+
+
+class Command(BaseCommand):
+    help = "Benchmark serializer-free article list rendering (rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help="Synthetic articles to seed.",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=20,
+            help="List pages rendered per run.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per path; the best time is reported.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['rows']} articles ...")
+            category, _ = Category.objects.get_or_create(
+                slug="benchmark", defaults={"name": "Benchmark"}
+            )
+            articles = make_articles(options["rows"])
+            for article in articles[::2]:
+                article.category = category
+            Article.objects.bulk_create(articles, batch_size=5000)
+
+            queryset = (
+                Article.objects.select_related("category", "source")
+                .defer("content")
+                .order_by("-published_at")
+            )
+            pages = [
+                (offset, offset + PAGE_SIZE)
+                for offset in range(0, options["pages"] * PAGE_SIZE, PAGE_SIZE)
+            ]
+            for bottom, top in pages:
+                if self._drf(queryset, bottom, top) != self._fast(
+                    queryset, bottom, top
+                ):
+                    raise CommandError(
+                        f"Output differs between paths for rows {bottom}-{top}."
+                    )
+
+            self.stdout.write(f"\n{'path':<6} {'rows':>7} {'ms':>9} {'rows/s':>10}")
+            results = {}
+            for name, render in (("drf", self._drf), ("fast", self._fast)):
+                rows, elapsed = self._time(render, queryset, pages, options["repeat"])
+                results[name] = rows / elapsed
+                self.stdout.write(
+                    f"{name:<6} {rows:>7} {elapsed * 1000:>9.1f} "
+                    f"{results[name]:>10.0f}"
+                )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"\nfast path: {results['fast'] / results['drf']:.1f}x, "
+                    "output identical"
+                )
+            )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _drf(queryset, bottom: int, top: int) -> bytes:
+        page = list(queryset[bottom:top])
+        return JSONRenderer().render(ArticleListSerializer(page, many=True).data)
+
+    @staticmethod
+    def _fast(queryset, bottom: int, top: int) -> bytes:
+        page = article_list_rows(queryset)[bottom:top]
+        return FastJSONRenderer().render(article_list_data(page))
+
+    @staticmethod
+    def _time(render, queryset, pages, repeat: int) -> tuple[int, float]:
+        """Rows rendered and the best time to render every page once."""
+        rows = min(len(pages) * PAGE_SIZE, queryset.count())
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for bottom, top in pages:
+                render(queryset, bottom, top)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return rows, best
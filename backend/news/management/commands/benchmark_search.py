@@ -0,0 +1,119 @@
+"""
+Management command to benchmark article search.
+
+Seeds synthetic articles drawn from a small vocabulary (so some words
+are common and some rare), then times the article list's search query
+in full-text mode (stored tsvector + websearch_to_tsquery + ts_rank) and
+substring mode (ICONTAINS over the trigram indexes) for a set of terms.
+Everything runs inside a transaction that is rolled back, so the
+database is left untouched.
+
+Usage:
+    python manage.py benchmark_search
+    python manage.py benchmark_search --rows 200000 --terms economy "climate change"
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from news.models import Article
+from news.search import SEARCH_MODES, search_articles
+
+# Roughly Zipf-weighted: early words appear in many articles
+VOCABULARY = (
+    "market economy election government climate change energy health "
+    "technology football court police storm inflation vaccine startup "
+    "satellite tariff wildfire earthquake semiconductor referendum glacier"
+).split()
+DEFAULT_TERMS = ["market", "climate change", "semiconductor", "glacier -storm"]
+
+
+def make_articles(count: int, seed: int = 0) -> list[Article]:
+    """Build `count` unsaved articles with titles drawn from VOCABULARY."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    run_id = uuid.uuid4().hex[:8]
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    articles = []
+    for i in range(count):
+        words = rng.choices(VOCABULARY, weights, k=12)
+        articles.append(
+            Article(
+                title=" ".join(words[:6]).capitalize(),
+                description=" ".join(words[6:]),
+                source_name=f"Bench {i % 25}",
+                url=f"https://bench.example.com/{run_id}/{i}",
+                published_at=base + timedelta(seconds=i),
+            )
+        )
+    return articles
+
+
+class Command(BaseCommand):
+    help = "Benchmark full-text vs substring article search (rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100000,
+            help="Synthetic articles to seed.",
+        )
+        parser.add_argument(
+            "--terms",
+            nargs="+",
+            default=DEFAULT_TERMS,
+            help="Search strings to time.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per term and mode; the best time is reported.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("benchmark_search requires a PostgreSQL database.")
+
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['rows']} articles ...")
+            Article.objects.bulk_create(
+                make_articles(options["rows"]), batch_size=5000
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Article._meta.db_table}")
+
+            self.stdout.write(
+                f"\n{'term':<20} {'mode':<10} {'matches':>8} {'page ms':>9}"
+            )
+            for term in options["terms"]:
+                for mode in SEARCH_MODES:
+                    matches, elapsed = self._time(term, mode, options["repeat"])
+                    self.stdout.write(
+                        f"{term:<20} {mode:<10} {matches:>8} {elapsed * 1000:>9.1f}"
+                    )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _time(term: str, mode: str, repeat: int) -> tuple[int, float]:
+        """Best time to fetch the first page of results (the view's query)."""
+        queryset = search_articles(
+            Article.objects.select_related("category", "source")
+            .defer("content")
+            .order_by("-published_at"),
+            term,
+            mode,
+        )
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset[:50])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return queryset.count(), best
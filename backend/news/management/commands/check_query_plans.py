@@ -0,0 +1,132 @@
+"""
+Management command to check article list query plans for regressions.
+
+Seeds a skewed dataset, requests the article list for every combination
+of category, source, country, search, ordering and page depth, and
+runs each article query through EXPLAIN (ANALYZE, BUFFERS) (see
+news/plans.py). The list has no `ordering` parameter, so the ordering
+dimension is the order the view reads in: newest first by page number
+or cursor, or oldest first along a cursor `previous` link. Fails when
+a query scans news_article sequentially, misses its expected index or
+exceeds the buffer / time bounds.
+
+With --output, one plan file per case (shape only, no numbers) plus a
+summary.tsv with buffers and timings are written, so two runs can be
+compared with `diff -r`.
+
+Everything runs inside a transaction that is rolled back.
+
+Usage:
+    python manage.py check_query_plans
+    python manage.py check_query_plans --rows 200000 --output plans/
+    python manage.py check_query_plans --max-buffers 2000 --max-ms 50
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from news.plans import build_cases, check_case, render_plan, run_case, seed_dataset
+from news.resolvers import category_resolver, source_resolver
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN every article list filter combination and check index usage."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100000,
+            help="Synthetic articles to seed.",
+        )
+        parser.add_argument(
+            "--depths",
+            type=int,
+            nargs="+",
+            default=[1, 20],
+            help=(
+                "Page depths to request in each ordering (page-number and "
+                "cursor newest first, cursor oldest first)."
+            ),
+        )
+        parser.add_argument(
+            "--max-buffers",
+            type=int,
+            default=5000,
+            help="Upper bound on shared buffers per query.",
+        )
+        parser.add_argument(
+            "--max-ms",
+            type=float,
+            default=250.0,
+            help="Upper bound on execution time per query, in milliseconds.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Directory for per-case plan files and summary.tsv.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("check_query_plans requires a PostgreSQL database.")
+
+        output = options["output"]
+        if output:
+            os.makedirs(output, exist_ok=True)
+
+        failures = 0
+        summary = ["case\tquery\tindexes\tbuffers\tms\tproblems"]
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['rows']} articles ...")
+            seed_dataset(options["rows"])
+            # The resolvers must not keep keys of the rolled-back seed
+            self._reset_resolvers()
+
+            for case in build_cases(tuple(options["depths"])):
+                plans = run_case(case)
+                problems = check_case(
+                    case, plans, options["max_buffers"], options["max_ms"]
+                )
+                failures += bool(problems)
+                status = self.style.ERROR("FAIL") if problems else "ok"
+                self.stdout.write(f"{status:<4} {case.name}")
+                for problem in problems:
+                    self.stdout.write(f"       {problem}")
+
+                for number, plan in enumerate(plans, start=1):
+                    summary.append(
+                        f"{case.name}\t{number}\t{','.join(sorted(plan.indexes))}\t"
+                        f"{plan.buffers}\t{plan.milliseconds:.2f}\t"
+                        f"{'; '.join(problems)}"
+                    )
+                if output:
+                    self._write_case(output, case, plans)
+
+            transaction.set_rollback(True)
+        self._reset_resolvers()
+
+        if output:
+            with open(os.path.join(output, "summary.tsv"), "w") as handle:
+                handle.write("\n".join(summary) + "\n")
+            self.stdout.write(f"\nPlans written to {output}")
+
+        if failures:
+            raise CommandError(f"{failures} case(s) failed the plan checks.")
+        self.stdout.write(self.style.SUCCESS("\nAll query plans passed."))
+
+    @staticmethod
+    def _write_case(output: str, case, plans) -> None:
+        sections = [f"-- {case.name}\n-- expected: {', '.join(sorted(case.expected))}"]
+        for plan in plans:
+            sections.append(f"{plan.sql}\n\n{render_plan(plan.root)}")
+        with open(os.path.join(output, f"{case.slug}.txt"), "w") as handle:
+            handle.write("\n\n".join(sections) + "\n")
+
+    @staticmethod
+    def _reset_resolvers() -> None:
+        category_resolver.clear()
+        source_resolver.clear()
@@ -5,13 +5,24 @@ Usage:
     python manage.py fetch_news
     python manage.py fetch_news --category technology --country gb
     python manage.py fetch_news --query "artificial intelligence"
+    python manage.py fetch_news --query "climate" --max-pages 20
     python manage.py fetch_news --all-categories
+    python manage.py fetch_news --all-categories --concurrency 4
+    python manage.py fetch_news --all-categories --full
+
+Finishes with a per-feed summary of article counts, download size,
+throughput and time spent in each ingest stage (see news/metrics.py).
 """
 
+import time
+
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
-from news.services import NEWS_API_CATEGORIES, NewsAPIService
+from news.counts import refresh_counts
+from news.metrics import STAGES, IngestStats
+from news.services import NEWS_API_CATEGORIES, Feed, NewsAPIService
+from news.snapshots import publish
 
 
 class Command(BaseCommand):
@@ -37,11 +48,29 @@ class Command(BaseCommand):
             default=None,
             help="Search keyword for the /everything endpoint.",
         )
+        parser.add_argument(
+            "--max-pages",
+            type=int,
+            default=1,
+            help="Result pages to stream for --query (100 articles each).",
+        )
         parser.add_argument(
             "--all-categories",
             action="store_true",
             help="Fetch news for all supported categories.",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore feed high-water marks and re-process every article.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Parallel requests for --all-categories "
+            "(default: NEWS_API_CONCURRENCY).",
+        )
 
     def handle(self, *args, **options):
         if settings.NEWS_API_KEY == "YOUR_NEWS_API_KEY_HERE":
@@ -50,22 +79,31 @@ class Command(BaseCommand):
                 "  export NEWS_API_KEY=your_api_key_here"
             )
 
-        service = NewsAPIService()
+        service = NewsAPIService(
+            incremental=not options["full"], priority="manual"
+        )
+        started = time.monotonic()
         total = 0
 
         if options["all_categories"]:
-            for cat in NEWS_API_CATEGORIES:
-                self.stdout.write(f"Fetching category: {cat} ...")
-                try:
-                    count = service.fetch_top_headlines(
-                        category=cat, country=options["country"]
-                    )
-                    total += count
+            self.stdout.write(
+                f"Fetching {len(NEWS_API_CATEGORIES)} categories in parallel ..."
+            )
+            feeds = [
+                Feed.top_headlines(cat, options["country"])
+                for cat in NEWS_API_CATEGORIES
+            ]
+            for result in service.fetch_feeds(
+                feeds, concurrency=options["concurrency"]
+            ):
+                self.stdout.write(f"Category: {result.feed.category}")
+                if result.error:
+                    self.stderr.write(self.style.ERROR(f"  → Error: {result.error}"))
+                else:
+                    total += result.created
                     self.stdout.write(
-                        self.style.SUCCESS(f"  → {count} articles stored.")
+                        self.style.SUCCESS(f"  → {result.created} articles stored.")
                     )
-                except Exception as e:
-                    self.stderr.write(self.style.ERROR(f"  → Error: {e}"))
         else:
             self.stdout.write(f"Fetching category: {options['category']} ...")
             try:
@@ -84,7 +122,9 @@ class Command(BaseCommand):
                 f"Fetching everything for query: {options['query']} ..."
             )
             try:
-                count = service.fetch_everything(query=options["query"])
+                count = service.fetch_everything(
+                    query=options["query"], max_pages=options["max_pages"]
+                )
                 total += count
                 self.stdout.write(
                     self.style.SUCCESS(f"  → {count} articles stored.")
@@ -92,6 +132,43 @@ class Command(BaseCommand):
             except Exception as e:
                 self.stderr.write(self.style.ERROR(f"  → Error: {e}"))
 
+        self._write_summary(service.stats, time.monotonic() - started)
+        service.stats.log()
+        if total:
+            refresh_counts()
+            publish()
         self.stdout.write(
             self.style.SUCCESS(f"\nDone! Total new articles: {total}")
         )
+
+    def _write_summary(self, stats: IngestStats, elapsed: float) -> None:
+        """Print one row per feed plus a total, then the stage breakdown."""
+        if not stats.feeds:
+            return
+        total = stats.total()
+        rows = [*stats.feeds.values(), total]
+        width = max(len(row.feed) for row in rows)
+
+        self.stdout.write(
+            f"\n{'Feed':<{width}}  {'seen':>6} {'filtered':>8} {'skipped':>7} "
+            f"{'dup':>6} {'new':>6} {'KiB':>8} {'rows/s':>8} {'secs':>7}"
+        )
+        for row in rows:
+            counts = row.counts
+            self.stdout.write(
+                f"{row.feed:<{width}}  {counts['seen']:>6} "
+                f"{counts['filtered']:>8} {row.skipped:>7} "
+                f"{counts['duplicate']:>6} {counts['created']:>6} "
+                f"{counts['bytes'] / 1024:>8.1f} {row.rows_per_second:>8.0f} "
+                f"{row.seconds:>7.2f}"
+            )
+
+        self.stdout.write(f"\n{'Stage':<10} {'secs':>8} {'share':>6}")
+        for stage in STAGES:
+            seconds = total.timings[stage]
+            share = seconds / total.seconds if total.seconds else 0.0
+            self.stdout.write(f"{stage:<10} {seconds:>8.3f} {share:>6.0%}")
+        self.stdout.write(
+            f"Wall time {elapsed:.2f}s, "
+            f"{total.counts['seen'] / max(elapsed, 1e-9):.0f} rows/s"
+        )
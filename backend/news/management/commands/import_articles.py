@@ -0,0 +1,263 @@
+"""
+Management command to bulk-import archived NewsAPI articles.
+
+Streams one or more NDJSON files (optionally gzipped), one NewsAPI-shaped
+article per line, normalizes them with the same rules as the fetch
+pipeline (NewsAPIService._normalize_articles), clusters near-duplicate
+stories like live ingest does (dedup_index.assign_clusters, under
+NEWS_DEDUP_POLICY) and loads each batch with PostgreSQL COPY into a
+temporary staging table, which is then merged into news_article with
+INSERT ... ON CONFLICT (url) DO NOTHING.
+
+Each batch is committed on its own. The record offset printed with every
+progress line can be passed back with --offset to resume an interrupted
+import.
+
+Usage:
+    python manage.py import_articles archive-2025.ndjson.gz
+    python manage.py import_articles a.ndjson.gz b.ndjson.gz --category business
+    python manage.py import_articles archive.ndjson.gz --offset 1500000
+"""
+
+import csv
+import gzip
+import io
+import json
+import time
+from typing import Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from news.caching import bump_ingest_generations
+from news.counters import add_articles
+from news.dedup import dedup_index
+from news.models import Article
+from news.resolvers import category_resolver, source_resolver
+from news.services import NewsAPIService
+
+STAGING_TABLE = "news_article_import"
+
+# Columns written through COPY; the remaining NOT NULL columns are set on merge
+COPY_COLUMNS = [
+    "url",
+    "source_id",
+    "category_id",
+    "source_name",
+    "author",
+    "title",
+    "description",
+    "url_to_image",
+    "published_at",
+    "content",
+    "country",
+    "simhash",
+    "cluster_id",
+    "is_duplicate",
+]
+
+
+def iter_records(paths: list[str], offset: int = 0) -> Iterator[tuple[int, dict]]:
+    """
+    Yield (offset, article) for every record across `paths`.
+
+    The offset counts lines over all files in order, so it stays stable
+    between runs. Lines before `offset` are skipped without parsing, and
+    lines that are not valid JSON objects yield an empty dict.
+    """
+    position = 0
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                position += 1
+                if position <= offset:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = {}
+                yield position, record if isinstance(record, dict) else {}
+
+
+class Command(BaseCommand):
+    help = "Bulk-import NDJSON(.gz) article archives using PostgreSQL COPY."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="NDJSON or NDJSON.gz files.")
+        parser.add_argument(
+            "--category",
+            type=str,
+            default=None,
+            help="Category slug assigned to every imported article.",
+        )
+        parser.add_argument(
+            "--country",
+            type=str,
+            default=None,
+            help="Country code assigned to every imported article.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20000,
+            help="Records per COPY / merge transaction.",
+        )
+        parser.add_argument(
+            "--offset",
+            type=int,
+            default=0,
+            help="Skip this many records (resume a previous import).",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("import_articles requires a PostgreSQL database.")
+
+        self.service = NewsAPIService()
+        self.category = options["category"]
+        self.country = options["country"]
+        self.stats = {"read": 0, "skipped": 0, "created": 0, "duplicates": 0}
+        self.started = time.monotonic()
+
+        batch = []
+        offset = self.committed_offset = options["offset"]
+        try:
+            for offset, record in iter_records(options["paths"], offset):
+                batch.append(record)
+                if len(batch) >= options["batch_size"]:
+                    self._load_batch(batch, offset)
+                    batch = []
+            if batch:
+                self._load_batch(batch, offset)
+        except (Exception, KeyboardInterrupt) as exc:
+            raise CommandError(
+                f"Import stopped ({exc!r}). "
+                f"Resume with --offset {self.committed_offset}"
+            ) from exc
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nDone! read={self.stats['read']} "
+                f"created={self.stats['created']} "
+                f"duplicates={self.stats['duplicates']} "
+                f"skipped={self.stats['skipped']} "
+                f"in {elapsed:.1f}s "
+                f"({self.stats['read'] / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+        )
+
+    def _load_batch(self, records: list[dict], offset: int) -> None:
+        """Normalize, COPY and merge one batch, then report progress."""
+        rows = self.service._normalize_articles(records, self.country)
+        self.stats["read"] += len(records)
+        self.stats["skipped"] += len(records) - len(rows)
+
+        with transaction.atomic():
+            created = self._copy_and_merge(rows)
+        self.committed_offset = offset
+
+        self.stats["created"] += created
+        self.stats["duplicates"] += len(rows) - created
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            f"offset={offset} read={self.stats['read']} "
+            f"created={self.stats['created']} "
+            f"duplicates={self.stats['duplicates']} "
+            f"skipped={self.stats['skipped']} "
+            f"({self.stats['read'] / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+
+    def _copy_and_merge(self, rows: list[dict]) -> int:
+        """COPY rows into the staging table and merge new URLs into articles."""
+        if not rows:
+            return 0
+
+        category_id = None
+        if self.category:
+            category_id = category_resolver.resolve(
+                slugify(self.category), {"name": self.category.title()}
+            )
+        source_ids = source_resolver.resolve_many(
+            {
+                self.service._source_key(row["source_info"]): {
+                    "name": row["source_info"].get("name") or "Unknown",
+                    "country": self.country or "",
+                }
+                for row in rows
+            }
+        )
+
+        # Cluster only URLs not stored yet, as _store_rows does, so that
+        # imported history is matched and collapsed like live ingest
+        existing = set(
+            Article.objects.filter(url__in=[row["url"] for row in rows]).values_list(
+                "url", flat=True
+            )
+        )
+        articles = dedup_index.assign_clusters(
+            [Article(**row["fields"]) for row in rows if row["url"] not in existing]
+        )
+
+        by_url = {row["url"]: row for row in rows}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        for article in articles:
+            row = by_url[article.url]
+            source_key = self.service._source_key(row["source_info"])
+            fields = dict(
+                row["fields"],
+                source_id=source_ids.get(source_key),
+                category_id=category_id,
+                cluster_id=article.cluster_id,
+                is_duplicate=article.is_duplicate,
+            )
+            writer.writerow([fields[column] for column in COPY_COLUMNS])
+        buffer.seek(0)
+
+        table = Article._meta.db_table
+        columns = ", ".join(COPY_COLUMNS)
+        with connection.cursor() as cursor:
+            # Same column types as news_article, but no constraints or defaults
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+                f"ON COMMIT DELETE ROWS AS SELECT {columns} FROM {table} "
+                "WITH NO DATA"
+            )
+            self._copy(
+                cursor,
+                f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH "
+                "(FORMAT csv, FORCE_NULL (source_id, category_id, cluster_id))",
+                buffer,
+            )
+            cursor.execute(
+                f"INSERT INTO {table} "
+                f"({columns}, created_at, updated_at) "
+                f"SELECT DISTINCT ON (url) {columns}, NOW(), NOW() "
+                f"FROM {STAGING_TABLE} ORDER BY url "
+                "ON CONFLICT (url) DO NOTHING "
+                "RETURNING category_id, source_id"
+            )
+            inserted = cursor.fetchall()
+        created = len(inserted)
+        add_articles(inserted)
+
+        if created:
+            bump_ingest_generations(
+                category=slugify(self.category) if self.category else None,
+                sources=source_ids,
+                countries=[row["fields"]["country"] for row in rows],
+            )
+        return created
+
+    @staticmethod
+    def _copy(cursor, sql: str, buffer: io.StringIO) -> None:
+        """Run COPY FROM STDIN on either psycopg2 or psycopg 3."""
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):
+            raw.copy_expert(sql, buffer)
+        else:
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
@@ -6,6 +6,8 @@ Usage:
     python manage.py warmup_cache
 """
 
+import json
+
 from django.core.management.base import BaseCommand
 from django.test.client import RequestFactory
 from news.views import ArticleListView, CategoryListView, SourceListView
@@ -22,9 +24,9 @@ class Command(BaseCommand):
         self.stdout.write("  - Caching categories...")
         request = factory.get("/api/news/categories/", HTTP_HOST="localhost:8000")
         view = CategoryListView.as_view()
-        response = view(request)
+        response = view(request).render()
         if response.status_code == 200:
-            self.stdout.write(self.style.SUCCESS(f"    ✓ Cached {len(response.data)} categories"))
+            self.stdout.write(self.style.SUCCESS(f"    ✓ Cached {len(json.loads(response.content))} categories"))
         else:
             self.stdout.write(self.style.ERROR(f"    ✗ Failed: {response.status_code}"))
 
@@ -32,9 +34,9 @@ class Command(BaseCommand):
         self.stdout.write("  - Caching sources...")
         request = factory.get("/api/news/sources/", HTTP_HOST="localhost:8000")
         view = SourceListView.as_view()
-        response = view(request)
+        response = view(request).render()
         if response.status_code == 200:
-            self.stdout.write(self.style.SUCCESS(f"    ✓ Cached {len(response.data)} sources"))
+            self.stdout.write(self.style.SUCCESS(f"    ✓ Cached first page of {json.loads(response.content)['count']} sources"))
         else:
             self.stdout.write(self.style.ERROR(f"    ✗ Failed: {response.status_code}"))
 
@@ -42,11 +44,11 @@ class Command(BaseCommand):
         self.stdout.write("  - Caching first page of articles...")
         request = factory.get("/api/news/articles/?page=1", HTTP_HOST="localhost:8000")
         view = ArticleListView.as_view()
-        response = view(request)
+        response = view(request).render()
         if response.status_code == 200:
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"    ✓ Cached {len(response.data['results'])} articles (page 1)"
+                    f"    ✓ Cached {len(json.loads(response.content)['results'])} articles (page 1)"
                 )
             )
         else:
@@ -0,0 +1,185 @@
+"""
+Stage timings and counters for the ingest pipeline.
+
+Every NewsAPIService keeps one IngestStats for its run, holding a
+FeedStats per feed that is filled in as the feed moves through the
+pipeline stages:
+
+    quota      waiting for a request token (see quota.py)
+    http       the News API request, body included
+    decode     JSON decoding
+    dates      parsing publishedAt
+    normalize  validating and cleaning rows, SimHash
+    resolve    source / category primary keys (see resolvers.py)
+    lookup     the existing-URL SELECT
+    dedup      near-duplicate matching (see dedup.py)
+    write      INSERT ... ON CONFLICT and the created-count readback
+
+and counted with:
+
+    requests, bytes   News API requests made and body bytes downloaded
+    seen              raw articles returned by the API
+    filtered          dropped by the feed watermark / unchanged response
+    skipped_*         no URL, unparseable date or otherwise invalid
+    duplicate         already stored, repeated in the page or dropped
+                      as a near-duplicate
+    created           new rows written
+
+so that seen = filtered + skipped_* + duplicate + created.
+
+A finished feed and a finished run are each logged to the "news.ingest"
+logger as one record; its `ingest` attribute carries the data for
+structured (e.g. JSON) formatters and the message repeats it as
+key=value pairs.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger("news.ingest")
+
+STAGES = (
+    "quota",
+    "http",
+    "decode",
+    "dates",
+    "normalize",
+    "resolve",
+    "lookup",
+    "dedup",
+    "write",
+)
+COUNTERS = (
+    "requests",
+    "bytes",
+    "seen",
+    "filtered",
+    "skipped_no_url",
+    "skipped_bad_date",
+    "skipped_invalid",
+    "duplicate",
+    "created",
+)
+
+
+class FeedStats:
+    """
+    Stage timings and counters of one feed (or a total over feeds).
+
+    Args:
+        feed: Label used in logs and summaries.
+    """
+
+    def __init__(self, feed: str = ""):
+        self.feed = feed
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Add the wall time of the `with` block to `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[stage] += elapsed
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                self.counts[name] += value
+
+    def merge(self, other: "FeedStats") -> None:
+        with self._lock:
+            for stage, seconds in other.timings.items():
+                self.timings[stage] += seconds
+            for name, value in other.counts.items():
+                self.counts[name] += value
+
+    @property
+    def skipped(self) -> int:
+        return sum(
+            self.counts[name] for name in COUNTERS if name.startswith("skipped_")
+        )
+
+    @property
+    def seconds(self) -> float:
+        """Time spent in the pipeline stages."""
+        return sum(self.timings.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        """Raw articles processed per second of stage time."""
+        return self.counts["seen"] / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "feed": self.feed,
+            **self.counts,
+            "seconds": round(self.seconds, 4),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "stages": {
+                stage: round(seconds, 4) for stage, seconds in self.timings.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeedStats":
+        """Rebuild stats from as_dict() output (e.g. a Celery result)."""
+        stats = cls(data.get("feed", ""))
+        stats.timings.update(data.get("stages", {}))
+        stats.counts.update(
+            {name: data[name] for name in COUNTERS if name in data}
+        )
+        return stats
+
+    def log(self, message: str = "Ingested feed") -> None:
+        data = self.as_dict()
+        fields = " ".join(
+            f"{name}={value}"
+            for name, value in data.items()
+            if name not in ("feed", "stages")
+        )
+        stages = " ".join(
+            f"{stage}={seconds:.3f}s" for stage, seconds in data["stages"].items()
+        )
+        logger.info(
+            "%s %s: %s %s", message, self.feed, fields, stages, extra={"ingest": data}
+        )
+
+
+class IngestStats:
+    """Per-feed stats of one ingest run, plus their total."""
+
+    def __init__(self):
+        self.feeds: dict[str, FeedStats] = {}
+        self._lock = threading.Lock()
+
+    def feed(self, feed) -> FeedStats:
+        """The stats of `feed` (a Feed or label), created on first use."""
+        key = str(feed)
+        with self._lock:
+            if key not in self.feeds:
+                self.feeds[key] = FeedStats(key)
+            return self.feeds[key]
+
+    def total(self) -> FeedStats:
+        total = FeedStats("total")
+        for stats in list(self.feeds.values()):
+            total.merge(stats)
+        return total
+
+    def as_dict(self) -> dict:
+        return {
+            "feeds": [stats.as_dict() for stats in self.feeds.values()],
+            "total": self.total().as_dict(),
+        }
+
+    def log(self) -> None:
+        self.total().log(f"Ingest run over {len(self.feeds)} feeds,")
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_database_optimization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=50)),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('country', models.CharField(blank=True, default='', max_length=10)),
+                ('query', models.CharField(blank=True, default='', max_length=500)),
+                ('last_published_at', models.DateTimeField(blank=True, null=True)),
+                ('response_hash', models.CharField(blank=True, default='', help_text='SHA-256 of the last response body.', max_length=64)),
+                ('recent_urls', models.JSONField(blank=True, default=list, help_text='Article URLs returned by the last response.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('endpoint', 'category', 'country', 'query'), name='uniq_feed_state')],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+# news_article gains columns the archive table does not have, so
+# archive_old_articles() has to list the ones it moves
+ARCHIVE_COLUMNS = (
+    "id, source_id, category_id, source_name, author, title, description, "
+    "url, url_to_image, published_at, content, country, created_at, updated_at"
+)
+
+ARCHIVE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION archive_old_articles()
+    RETURNS INTEGER AS $$
+    DECLARE
+        moved_count INTEGER;
+    BEGIN
+        WITH moved AS (
+            DELETE FROM news_article
+            WHERE published_at < NOW() - INTERVAL '90 days'
+            RETURNING {columns}
+        )
+        INSERT INTO news_article_archive {target}
+        SELECT {columns} FROM moved;
+
+        GET DIAGNOSTICS moved_count = ROW_COUNT;
+        RETURN moved_count;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_feed_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='cluster_id',
+            field=models.BigIntegerField(blank=True, db_index=True, help_text='SimHash of the first article of this story cluster.', null=True),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='is_duplicate',
+            field=models.BooleanField(default=False, help_text='A later copy of a story already stored under cluster_id.'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, db_index=True, help_text='64-bit SimHash of title + description.', null=True),
+        ),
+        migrations.RunSQL(
+            sql=ARCHIVE_FUNCTION.format(
+                columns=ARCHIVE_COLUMNS, target=f"({ARCHIVE_COLUMNS})"
+            ),
+            # The 0002 definition, for the 14-column table it is reverted to
+            reverse_sql=ARCHIVE_FUNCTION.format(columns="*", target=""),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_article_dedup'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='article',
+            name='idx_source_pub',
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['source', '-published_at'], name='idx_source_pub'),
+        ),
+        # The country filter is an exact match so it can use idx_country_pub
+        migrations.RunSQL(
+            sql="UPDATE news_article SET country = LOWER(country) WHERE country <> LOWER(country);",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""
+Stored full-text search vector for articles (see news/search.py).
+
+1. A generated tsvector column over title (A), description (B) and
+   source name (C), kept up to date by PostgreSQL on every write.
+2. A GIN index on it for websearch_to_tsquery matches.
+3. archive_old_articles() with its columns listed, as in 0004, for
+   databases that applied 0004 before it redefined the function.
+
+Note: adding a stored generated column rewrites news_article.
+"""
+
+from django.db import migrations
+
+ARCHIVE_COLUMNS = (
+    "id, source_id, category_id, source_name, author, title, description, "
+    "url, url_to_image, published_at, content, country, created_at, updated_at"
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0005_keyset_pagination"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE news_article
+                ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+                    || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')
+                    || setweight(to_tsvector('english'::regconfig, coalesce(source_name, '')), 'C')
+                ) STORED;
+            """,
+            reverse_sql="ALTER TABLE news_article DROP COLUMN IF EXISTS search_vector;",
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS idx_article_search
+                ON news_article
+                USING gin (search_vector);
+            """,
+            reverse_sql="DROP INDEX IF EXISTS idx_article_search;",
+        ),
+        migrations.RunSQL(
+            sql=f"""
+                CREATE OR REPLACE FUNCTION archive_old_articles()
+                RETURNS INTEGER AS $$
+                DECLARE
+                    moved_count INTEGER;
+                BEGIN
+                    WITH moved AS (
+                        DELETE FROM news_article
+                        WHERE published_at < NOW() - INTERVAL '90 days'
+                        RETURNING {ARCHIVE_COLUMNS}
+                    )
+                    INSERT INTO news_article_archive ({ARCHIVE_COLUMNS})
+                    SELECT {ARCHIVE_COLUMNS} FROM moved;
+
+                    GET DIAGNOSTICS moved_count = ROW_COUNT;
+                    RETURN moved_count;
+                END;
+                $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql="ANALYZE news_article;",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,97 @@
+"""
+Maintained article counts on categories and sources (see news/counters.py).
+
+1. article_count columns on news_category and news_source, backfilled
+   from news_article.
+2. archive_old_articles() subtracts the rows it moves from the counts,
+   in the same statement.
+"""
+
+from django.db import migrations, models
+
+ARCHIVE_COLUMNS = (
+    "id, source_id, category_id, source_name, author, title, description, "
+    "url, url_to_image, published_at, content, country, created_at, updated_at"
+)
+
+
+def archive_function(counters: bool) -> str:
+    decrement = """
+        ,
+        categories AS (
+            UPDATE news_category SET article_count = article_count - moved_count.n
+            FROM (
+                SELECT category_id, COUNT(*) AS n FROM moved GROUP BY category_id
+            ) AS moved_count
+            WHERE news_category.id = moved_count.category_id
+        ),
+        sources AS (
+            UPDATE news_source SET article_count = article_count - moved_count.n
+            FROM (
+                SELECT source_id, COUNT(*) AS n FROM moved GROUP BY source_id
+            ) AS moved_count
+            WHERE news_source.id = moved_count.source_id
+        )
+    """
+    return f"""
+        CREATE OR REPLACE FUNCTION archive_old_articles()
+        RETURNS INTEGER AS $$
+        DECLARE
+            moved_count INTEGER;
+        BEGIN
+            WITH moved AS (
+                DELETE FROM news_article
+                WHERE published_at < NOW() - INTERVAL '90 days'
+                RETURNING {ARCHIVE_COLUMNS}
+            ),
+            archived AS (
+                INSERT INTO news_article_archive ({ARCHIVE_COLUMNS})
+                SELECT {ARCHIVE_COLUMNS} FROM moved
+            ){decrement if counters else ""}
+            SELECT COUNT(*) INTO moved_count FROM moved;
+
+            RETURN moved_count;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0006_article_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="article_count",
+            field=models.IntegerField(
+                default=0, editable=False, help_text="Articles in this category."
+            ),
+        ),
+        migrations.AddField(
+            model_name="source",
+            name="article_count",
+            field=models.IntegerField(
+                default=0, editable=False, help_text="Articles from this source."
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE news_category SET article_count = (
+                    SELECT COUNT(*) FROM news_article
+                    WHERE news_article.category_id = news_category.id
+                );
+                UPDATE news_source SET article_count = (
+                    SELECT COUNT(*) FROM news_article
+                    WHERE news_article.source_id = news_source.id
+                );
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=archive_function(counters=True),
+            reverse_sql=archive_function(counters=False),
+        ),
+    ]
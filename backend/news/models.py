@@ -7,6 +7,8 @@ Database Optimization Notes:
 - GIN index on title/description for full-text search (added via raw SQL migration).
 - Index on published_at DESC for default ordering.
 - Table partitioning by published_at month is handled via a custom migration.
+- Category and Source carry maintained article counts (see counters.py),
+  so their lists never aggregate over news_article.
 """
 
 from django.db import models
@@ -20,6 +22,12 @@ class Category(models.Model):
 
     name = models.CharField(max_length=100, unique=True, db_index=True)
     slug = models.SlugField(max_length=100, unique=True, db_index=True)
+    # Maintained by the ingest pipeline and signals (see counters.py)
+    article_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="Articles in this category.",
+    )
 
     class Meta:
         verbose_name_plural = "categories"
@@ -47,6 +55,12 @@ class Source(models.Model):
     url = models.URLField(blank=True, default="")
     country = models.CharField(max_length=10, blank=True, default="", db_index=True)
     language = models.CharField(max_length=10, blank=True, default="")
+    # Maintained by the ingest pipeline and signals (see counters.py)
+    article_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="Articles from this source.",
+    )
 
     class Meta:
         ordering = ["name"]
@@ -93,6 +107,24 @@ class Article(models.Model):
     content = models.TextField(blank=True, default="")
     country = models.CharField(max_length=10, blank=True, default="", db_index=True)
 
+    # Near-duplicate detection (see dedup.py)
+    simhash = models.BigIntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="64-bit SimHash of title + description.",
+    )
+    cluster_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="SimHash of the first article of this story cluster.",
+    )
+    is_duplicate = models.BooleanField(
+        default=False,
+        help_text="A later copy of a story already stored under cluster_id.",
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -105,9 +137,7 @@ class Article(models.Model):
                 fields=["category", "-published_at"], name="idx_category_pub"
             ),
             # Composite index: filter by source + order by published_at
-            models.Index(
-                fields=["source_name", "-published_at"], name="idx_source_pub"
-            ),
+            models.Index(fields=["source", "-published_at"], name="idx_source_pub"),
             # Composite index: filter by country + order by published_at
             models.Index(
                 fields=["country", "-published_at"], name="idx_country_pub"
@@ -120,3 +150,44 @@ class Article(models.Model):
 
     def __str__(self):
         return self.title[:80]
+
+
+class FeedState(models.Model):
+    """
+    Ingest high-water mark for one News API feed.
+
+    A feed is an (endpoint, category, country, query) combination. The
+    fetch pipeline compares each response against this row so unchanged
+    responses skip the write path, and changed responses only store
+    articles newer than `last_published_at` or absent from `recent_urls`.
+    """
+
+    endpoint = models.CharField(max_length=50)
+    category = models.CharField(max_length=100, blank=True, default="")
+    country = models.CharField(max_length=10, blank=True, default="")
+    query = models.CharField(max_length=500, blank=True, default="")
+    last_published_at = models.DateTimeField(null=True, blank=True)
+    response_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of the last response body.",
+    )
+    recent_urls = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Article URLs returned by the last response.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["endpoint", "category", "country", "query"],
+                name="uniq_feed_state",
+            )
+        ]
+
+    def __str__(self):
+        parts = [self.endpoint, self.category, self.country, self.query]
+        return " / ".join(part for part in parts if part)
@@ -0,0 +1,264 @@
+"""
+Pagination for the article and source lists.
+
+ArticlePagination is the default page-number pagination, with totals
+from counts.py so that large filtered lists report a planner estimate
+instead of running an exact COUNT(*); `count_type` says which one the
+response carries.
+
+KeysetPagination is the opt-in cursor mode. SourcePagination is plain
+page-number pagination for the source list.
+
+PageNumberPagination turns page N into OFFSET 50*N plus a COUNT(*), so
+deep pages get slower as the table grows. KeysetPagination instead
+orders by (published_at, id) and continues after the last row seen:
+
+    WHERE published_at <= :p AND (published_at < :p OR id < :id)
+    ORDER BY published_at DESC, id DESC
+    LIMIT 51
+
+The redundant `published_at <= :p` bound is what lets PostgreSQL start
+the scan of idx_published_desc (or idx_category_pub, idx_source_pub,
+idx_country_pub) at the cursor, so every page costs the same no matter
+how deep the client has scrolled. No count is returned.
+
+Cursors are opaque base64 tokens carrying the boundary row and the
+direction; clients follow the `next` / `previous` links.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counts import QueryCount, count_queryset
+
+
+class EstimatedPage(Page):
+    """A page whose `has_next` comes from the rows fetched, not the count."""
+
+    def __init__(self, object_list, number, paginator, has_more: bool):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator whose count comes from counts.count_queryset, for the list
+    of the canonical `filters`.
+
+    With an estimated count the last page number is not known, so pages
+    are not bounded by it: each page fetches one extra row to tell if
+    another page follows, and only an empty page is out of range.
+    """
+
+    def __init__(self, object_list, per_page, filters: dict):
+        super().__init__(object_list, per_page)
+        self.filters = filters
+
+    @cached_property
+    def total(self) -> QueryCount:
+        return count_queryset(self.object_list, self.filters)
+
+    @cached_property
+    def count(self):
+        return self.total.value
+
+    def page(self, number):
+        if self.total.exact:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return EstimatedPage(
+            rows[: self.per_page], number, self, len(rows) > self.per_page
+        )
+
+    def validate_number(self, number):
+        if self.total.exact:
+            return super().validate_number(number)
+        # Same checks as Paginator, minus the upper bound
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+
+class ArticlePagination(PageNumberPagination):
+    """Page-number pagination reporting exact or estimated totals."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.filters = view.get_canonical_filters(request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        return CountStrategyPaginator(object_list, per_page, self.filters)
+
+    def get_paginated_response(self, data):
+        paginator = self.page.paginator
+        return Response(
+            {
+                "count": paginator.count,
+                "count_type": "exact" if paginator.total.exact else "estimated",
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response["properties"]["count_type"] = {
+            "type": "string",
+            "enum": ["exact", "estimated"],
+        }
+        return response
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in cursor pagination on (published_at, id), newest first.
+
+    Selected with ?pagination=cursor for the first page; the `next` and
+    `previous` links carry a ?cursor= token.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def requested(cls, request) -> bool:
+        """Whether the request asks for cursor pagination."""
+        params = request.query_params
+        return (
+            cls.cursor_query_param in params
+            or params.get(cls.mode_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["reverse"])
+
+        if reverse:
+            # Walk backwards from the first row of the current page
+            queryset = (
+                queryset.order_by("published_at", "id")
+                .filter(published_at__gte=cursor["published_at"])
+                .filter(
+                    Q(published_at__gt=cursor["published_at"])
+                    | Q(published_at=cursor["published_at"], id__gt=cursor["id"])
+                )
+            )
+        else:
+            queryset = queryset.order_by("-published_at", "-id")
+            if cursor:
+                queryset = queryset.filter(
+                    published_at__lte=cursor["published_at"]
+                ).filter(
+                    Q(published_at__lt=cursor["published_at"])
+                    | Q(published_at=cursor["published_at"], id__lt=cursor["id"])
+                )
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        link = {"type": "string", "nullable": True, "format": "uri"}
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {"next": link, "previous": link, "results": schema},
+        }
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+
+    def decode_cursor(self, request) -> Optional[dict]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode()))
+            return {
+                "published_at": datetime.fromisoformat(data["p"]),
+                "id": int(data["i"]),
+                "reverse": bool(data.get("r")),
+            }
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_cursor(published_at: datetime, pk: int, reverse: bool) -> str:
+        data = {"p": published_at.isoformat(), "i": pk}
+        if reverse:
+            data["r"] = 1
+        return base64.urlsafe_b64encode(
+            json.dumps(data, separators=(",", ":")).encode()
+        ).decode()
+
+    def _link(self, row, reverse: bool) -> str:
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+        url = remove_query_param(url, self.mode_query_param)
+        token = self.encode_cursor(row.published_at, row.id, reverse)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+
+class SourcePagination(PageNumberPagination):
+    """Pages of sources; clients may ask for up to 500 with ?page_size=."""
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
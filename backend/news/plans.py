@@ -0,0 +1,359 @@
+"""
+Query-plan regression harness for the article list.
+
+Filters can quietly stop using their index, e.g. `country__iexact`
+compiles to UPPER(country) and cannot use idx_country_pub, and
+filtering on `source__source_id` adds a join in front of
+idx_source_pub. This module seeds a skewed dataset, requests
+ArticleListView for every combination of
+
+    category x source x country x search x ordering x page depth
+
+captures the SQL the view runs against news_article and runs each query
+through EXPLAIN (ANALYZE, BUFFERS). Every case is then checked:
+
+- no sequential scan of news_article;
+- the page query uses one of the indexes expected for its filters;
+- shared buffers and execution time stay under the given bounds.
+
+The list has no `ordering` parameter: it is always newest first, read
+either by page number or by cursor. The ordering dimension covers the
+orders the view actually runs, as (pagination mode, direction) pairs
+from ORDERINGS: page-number and cursor pages newest first, and the
+oldest-first walk a cursor `previous` link makes, which scans the
+published_at indexes backwards.
+
+Plans are rendered without costs, row counts or timings, so the text
+written per case only changes when the plan shape does and can be
+diffed between runs. Numbers go into a separate summary.
+
+Used by the `check_query_plans` command and the PostgreSQL-only tests.
+"""
+
+import itertools
+import json
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .models import Article, Category, Source
+from .pagination import KeysetPagination
+
+PAGE_SIZE = 50
+ARTICLE_TABLE = Article._meta.db_table
+
+# Seeded values used as filters: rare enough to be selective
+RARE_CATEGORY = "science"
+RARE_SOURCE = "plan-source-49"
+RARE_COUNTRY = "nz"
+SEARCH_TERM = "glacier"
+
+CATEGORIES = [
+    ("general", 40),
+    ("business", 20),
+    ("technology", 15),
+    ("sports", 12),
+    ("entertainment", 8),
+    ("health", 4),
+    (RARE_CATEGORY, 1),
+]
+COUNTRIES = [("us", 60), ("gb", 25), ("de", 10), ("in", 4), (RARE_COUNTRY, 1)]
+VOCABULARY = (
+    "market economy election government climate energy health technology "
+    "football court police storm inflation vaccine startup satellite tariff "
+    "wildfire earthquake semiconductor referendum"
+).split()
+SEARCH_TERM_SHARE = 0.005
+
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+# (pagination mode, direction) of every order the list is read in
+NEWEST, OLDEST = "newest", "oldest"
+ORDERINGS = [("page", NEWEST), ("cursor", NEWEST), ("cursor", OLDEST)]
+
+
+class PlanCase(NamedTuple):
+    """One request to the article list and the indexes it should use."""
+
+    params: dict
+    mode: str
+    depth: int
+    expected: frozenset
+    direction: str = NEWEST
+
+    @property
+    def name(self) -> str:
+        filters = ",".join(f"{key}={value}" for key, value in self.params.items())
+        return f"{filters or 'all'};{self.mode};{self.direction};depth={self.depth}"
+
+    @property
+    def slug(self) -> str:
+        return re.sub(r"[^a-z0-9]+", "-", self.name.lower()).strip("-")
+
+
+class QueryPlan(NamedTuple):
+    """EXPLAIN (ANALYZE, BUFFERS) result of one captured query."""
+
+    sql: str
+    plan: dict
+
+    @property
+    def root(self) -> dict:
+        return self.plan["Plan"]
+
+    @property
+    def buffers(self) -> int:
+        return self.root.get("Shared Hit Blocks", 0) + self.root.get(
+            "Shared Read Blocks", 0
+        )
+
+    @property
+    def milliseconds(self) -> float:
+        return self.plan.get("Execution Time", 0.0)
+
+    @property
+    def indexes(self) -> set[str]:
+        return {node["Index Name"] for node in walk(self.root) if "Index Name" in node}
+
+    @property
+    def seq_scans(self) -> list[str]:
+        return [
+            node["Relation Name"]
+            for node in walk(self.root)
+            if node["Node Type"] == "Seq Scan"
+        ]
+
+    @property
+    def is_count(self) -> bool:
+        return self.sql.lstrip().upper().startswith("SELECT COUNT(")
+
+
+def walk(node: dict):
+    """Yield a plan node and all of its descendants."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def render_plan(node: dict, indent: int = 0) -> str:
+    """Plan tree as stable text: node types, relations, indexes, conditions."""
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    lines = ["  " * indent + label]
+    for key in ("Index Cond", "Recheck Cond", "Filter", "Sort Key", "Join Filter"):
+        if key in node:
+            value = node[key]
+            if isinstance(value, list):
+                value = ", ".join(value)
+            lines.append("  " * indent + f"  {key}: {value}")
+    for child in node.get("Plans", []):
+        lines.append(render_plan(child, indent + 1))
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Dataset and cases
+# ----------------------------------------------------------------------
+
+
+def seed_dataset(rows: int, seed: int = 0) -> None:
+    """
+    Insert `rows` articles with skewed category, source and country
+    distributions, then ANALYZE. Callers roll the data back.
+    """
+    rng = random.Random(seed)
+    Category.objects.bulk_create(
+        [Category(name=slug.title(), slug=slug) for slug, _ in CATEGORIES],
+        ignore_conflicts=True,
+    )
+    categories = list(
+        Category.objects.filter(slug__in=[slug for slug, _ in CATEGORIES])
+    )
+    category_weights = dict(CATEGORIES)
+    Source.objects.bulk_create(
+        [
+            Source(source_id=f"plan-source-{i}", name=f"Plan Source {i}")
+            for i in range(50)
+        ],
+        ignore_conflicts=True,
+    )
+    sources = list(Source.objects.filter(source_id__startswith="plan-source-"))
+    # Source i gets weight 50 - i, so plan-source-49 is the rarest
+    source_weights = [50 - int(s.source_id.rsplit("-", 1)[1]) for s in sources]
+
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for i in range(rows):
+        category = rng.choices(
+            categories, [category_weights[c.slug] for c in categories]
+        )[0]
+        source = rng.choices(sources, source_weights)[0]
+        country = rng.choices(*zip(*COUNTRIES))[0]
+        words = rng.choices(VOCABULARY, k=14)
+        if rng.random() < SEARCH_TERM_SHARE:
+            words[rng.randrange(len(words))] = SEARCH_TERM
+        batch.append(
+            Article(
+                category=category,
+                source=source,
+                source_name=source.name,
+                country=country,
+                title=" ".join(words[:7]).capitalize(),
+                description=" ".join(words[7:]),
+                url=f"https://plans.example.com/{seed}/{i}",
+                published_at=base + timedelta(minutes=i),
+            )
+        )
+        if len(batch) == 5000:
+            Article.objects.bulk_create(batch)
+            batch = []
+    Article.objects.bulk_create(batch)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {ARTICLE_TABLE}")
+
+
+def build_cases(depths: tuple[int, ...] = (1, 20)) -> list[PlanCase]:
+    """Every combination of the list filters, orderings and depths."""
+    dimensions = [
+        ("category", RARE_CATEGORY, "idx_category_pub"),
+        ("source", RARE_SOURCE, "idx_source_pub"),
+        ("country", RARE_COUNTRY, "idx_country_pub"),
+        ("search", SEARCH_TERM, "idx_article_search"),
+    ]
+    cases = []
+    for active in itertools.product((False, True), repeat=len(dimensions)):
+        params = {}
+        expected = set()
+        for on, (name, value, index) in zip(active, dimensions):
+            if on:
+                params[name] = value
+                expected.add(index)
+        for (mode, direction), depth in itertools.product(ORDERINGS, depths):
+            cases.append(
+                PlanCase(
+                    params,
+                    mode,
+                    depth,
+                    frozenset(expected or {"idx_published_desc"}),
+                    direction,
+                )
+            )
+    return cases
+
+
+# ----------------------------------------------------------------------
+# Running and checking
+# ----------------------------------------------------------------------
+
+
+def run_case(case: PlanCase) -> list[QueryPlan]:
+    """Request the article list for `case` and explain its article queries."""
+    from .views import ArticleListView
+
+    params = dict(case.params)
+    depth = _reachable_depth(case)
+    if case.mode == "cursor":
+        params["pagination"] = "cursor"
+        cursor = _cursor_at(case, depth)
+        if cursor:
+            params["cursor"] = cursor
+    elif depth > 1:
+        params["page"] = depth
+
+    request = RequestFactory().get("/api/news/articles/", params)
+    with override_settings(CACHES=NO_CACHE, ALLOWED_HOSTS=["testserver"]):
+        with CaptureQueriesContext(connection) as ctx:
+            ArticleListView.as_view()(request).render()
+
+    plans = []
+    for query in ctx.captured_queries:
+        sql = query["sql"]
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        if f'FROM "{ARTICLE_TABLE}"' not in sql:
+            continue
+        plans.append(QueryPlan(sql, explain(sql)))
+    return plans
+
+
+def explain(sql: str) -> dict:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def check_case(
+    case: PlanCase, plans: list[QueryPlan], max_buffers: int, max_ms: float
+) -> list[str]:
+    """Problems found in the plans of one case (empty when it passes)."""
+    problems = []
+    pages = [plan for plan in plans if not plan.is_count]
+    if not pages:
+        problems.append("no article query captured")
+    for plan in plans:
+        if ARTICLE_TABLE in plan.seq_scans:
+            problems.append(f"sequential scan on {ARTICLE_TABLE}")
+        if plan.buffers > max_buffers:
+            problems.append(f"{plan.buffers} buffers > {max_buffers}")
+        if plan.milliseconds > max_ms:
+            problems.append(f"{plan.milliseconds:.1f} ms > {max_ms} ms")
+    for plan in pages:
+        if not plan.indexes & case.expected:
+            problems.append(
+                f"uses {sorted(plan.indexes) or 'no index'}, "
+                f"expected one of {sorted(case.expected)}"
+            )
+    return problems
+
+
+def _queryset(case: PlanCase):
+    """The view's filtered queryset for a case."""
+    from .views import ArticleListView
+
+    view = ArticleListView()
+    view.request = view.initialize_request(
+        RequestFactory().get("/api/news/articles/", case.params)
+    )
+    return view.get_queryset()
+
+
+def _reachable_depth(case: PlanCase) -> int:
+    """
+    The requested depth, or the deepest page with fewer results. Walking
+    oldest first needs the page after it, to start from.
+    """
+    if case.depth <= 1 and case.direction == NEWEST:
+        return 1
+    pages = -(-_queryset(case).count() // PAGE_SIZE)
+    if case.direction == OLDEST:
+        pages -= 1
+    return max(1, min(case.depth, pages))
+
+
+def _cursor_at(case: PlanCase, depth: int) -> Optional[str]:
+    """
+    Cursor of page `depth`: after the last row of page `depth - 1`, or
+    walking oldest first, before the first row of page `depth + 1`.
+    """
+    reverse = case.direction == OLDEST
+    offset = depth * PAGE_SIZE if reverse else (depth - 1) * PAGE_SIZE - 1
+    if offset < 0:
+        return None
+    rows = list(
+        _queryset(case)
+        .order_by("-published_at", "-id")
+        .values_list("published_at", "id")[offset : offset + 1]
+    )
+    return KeysetPagination.encode_cursor(*rows[0], reverse=reverse) if rows else None
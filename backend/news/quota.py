@@ -0,0 +1,197 @@
+"""
+Shared request budget for the News API key.
+
+Every NewsAPIService request, whether it comes from a Celery worker, the
+fetch_news command or FetchNewsView, takes a token from one bucket that
+refills at NEWS_API_QUOTA_REQUESTS per NEWS_API_QUOTA_WINDOW seconds.
+The bucket lives in Redis and is updated atomically by a Lua script, so
+all processes share it.
+
+Priority classes:
+- Each class may only take a token while more than its reserved share of
+  the bucket (NEWS_API_QUOTA_RESERVE) would remain, so manual fetches
+  cannot starve the scheduled ingest.
+- Each class either waits up to NEWS_API_QUOTA_MAX_WAIT seconds for a
+  token or is rejected straight away with QuotaExceeded.
+
+When the cache backend is not Redis (e.g. tests), a process-local bucket
+with the same semantics is used instead.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger("news")
+
+# KEYS[1] = bucket key
+# ARGV = capacity, refill rate (tokens/s), cost, floor (tokens to keep)
+# Returns {allowed, tokens, retry_after} (floats as strings)
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local floor = tonumber(ARGV[4])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if cost > 0 and tokens - cost >= floor then
+    tokens = tokens - cost
+    allowed = 1
+elseif cost > 0 then
+    retry_after = (floor + cost - tokens) / rate
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 60)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class QuotaExceeded(Exception):
+    """Raised when no request budget is available for a priority class."""
+
+    def __init__(self, priority: str, retry_after: float):
+        self.priority = priority
+        self.retry_after = retry_after
+        super().__init__(
+            f"News API quota exhausted for {priority} requests; "
+            f"retry in {retry_after:.0f}s"
+        )
+
+
+class QuotaBudget:
+    """
+    Token bucket shared by every caller of one API key.
+
+    Args:
+        name: Bucket name, used in the Redis key.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = f"news:quota:{name}"
+        self._script = None
+        self._local = {}
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> float:
+        return float(settings.NEWS_API_QUOTA_REQUESTS)
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / settings.NEWS_API_QUOTA_WINDOW
+
+    # ------------------------------------------------------------------
+    # Public methods
+    # ------------------------------------------------------------------
+
+    def acquire(self, priority: str = "scheduled", cost: int = 1) -> float:
+        """
+        Take `cost` tokens for a request of the given priority class.
+
+        Waits up to the class's NEWS_API_QUOTA_MAX_WAIT for tokens to
+        refill, then raises QuotaExceeded.
+
+        Returns:
+            Tokens remaining in the bucket.
+        """
+        floor = self.capacity * settings.NEWS_API_QUOTA_RESERVE.get(priority, 0)
+        max_wait = settings.NEWS_API_QUOTA_MAX_WAIT.get(priority, 0)
+        deadline = time.monotonic() + max_wait
+
+        while True:
+            allowed, tokens, retry_after = self._take(cost, floor)
+            if allowed:
+                return tokens
+            if time.monotonic() + retry_after > deadline:
+                logger.warning(
+                    "Rejected %s News API request: %.1f tokens left",
+                    priority,
+                    tokens,
+                )
+                raise QuotaExceeded(priority, retry_after)
+            time.sleep(retry_after)
+
+    def remaining(self) -> float:
+        """Tokens currently in the bucket (refill included)."""
+        return self._take(0, 0)[1]
+
+    def metrics(self) -> dict:
+        """Remaining budget overall and per priority class."""
+        tokens = self.remaining()
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "window_seconds": settings.NEWS_API_QUOTA_WINDOW,
+            "remaining": round(tokens, 2),
+            "available": {
+                priority: max(0, int(tokens - self.capacity * reserve))
+                for priority, reserve in settings.NEWS_API_QUOTA_RESERVE.items()
+            },
+        }
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the API answered 429."""
+        self._take(self.remaining(), 0)
+
+    def reset(self) -> None:
+        """Refill the bucket completely (tests and manual intervention)."""
+        client = self._redis()
+        if client is not None:
+            client.delete(self.key)
+        with self._lock:
+            self._local.clear()
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _take(self, cost: float, floor: float) -> tuple[bool, float, float]:
+        client = self._redis()
+        if client is None:
+            return self._take_local(cost, floor)
+        if self._script is None:
+            self._script = client.register_script(TOKEN_BUCKET_LUA)
+        allowed, tokens, retry_after = self._script(
+            keys=[self.key], args=[self.capacity, self.rate, cost, floor]
+        )
+        return bool(allowed), float(tokens), float(retry_after)
+
+    def _take_local(self, cost: float, floor: float) -> tuple[bool, float, float]:
+        """Same algorithm as TOKEN_BUCKET_LUA, for a single process."""
+        with self._lock:
+            now = time.monotonic()
+            tokens = self._local.get("tokens", self.capacity)
+            ts = self._local.get("ts", now)
+            tokens = min(self.capacity, tokens + max(0, now - ts) * self.rate)
+            allowed, retry_after = False, 0.0
+            if cost > 0 and tokens - cost >= floor:
+                tokens -= cost
+                allowed = True
+            elif cost > 0:
+                retry_after = (floor + cost - tokens) / self.rate
+            self._local.update(tokens=tokens, ts=now)
+            return allowed, tokens, retry_after
+
+    @staticmethod
+    def _redis():
+        try:
+            from django_redis import get_redis_connection
+
+            return get_redis_connection("default")
+        except (ImportError, NotImplementedError):
+            return None
+
+
+newsapi_quota = QuotaBudget("newsapi")
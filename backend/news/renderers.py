@@ -0,0 +1,52 @@
+"""
+JSON rendering for the News API.
+
+FastJSONRenderer encodes with orjson, which is several times faster
+than DRF's JSONRenderer on list pages. For strings, integers, booleans,
+null, and the values it hands to DRF's own encoder (datetimes, dates,
+times, Decimals, lazy strings), it writes exactly the bytes JSONRenderer
+writes with the project settings: compact, UTF-8, U+2028/U+2029 escaped.
+
+Floats are not byte-compatible. orjson writes 1e16 where DRF writes
+1e+16, and it writes NaN and Infinity as null where DRF raises
+ValueError. That is why the renderer is set on the article list views
+(renderer_classes) and is not a project default. Data orjson rejects
+(non-string dict keys, integers beyond 64 bits) falls back to
+JSONRenderer, as it does without orjson installed or when a client asks
+for indented output.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson, for data without floats."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escapes as JSONRenderer: both are invalid in JavaScript strings
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
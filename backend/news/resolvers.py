@@ -0,0 +1,180 @@
+"""
+Process-wide resolver caches for Source and Category look-ups.
+
+Ingestion only needs the primary key of a source or category to build
+Article rows, and the same few dozen sources come back on every run.
+`KeyResolver` keeps a bounded LRU map of natural key -> primary key per
+worker process, warmed in bulk from the table on first use, so that a
+page of articles costs at most one SELECT and one multi-row INSERT for
+the keys it has never seen before.
+
+Invalidation:
+- post_save / post_delete signals drop the affected entry in the local
+  process (see signals.py).
+- The same signals bump a shared generation counter in the Django cache,
+  and every resolver checks it once per batch, so other workers clear
+  their maps after rows are edited or deleted in the admin.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Category, Source
+
+logger = logging.getLogger("news")
+
+
+class KeyResolver:
+    """
+    Bounded LRU cache mapping a unique natural key to a primary key.
+
+    Args:
+        model: Model class to resolve.
+        key_field: Name of the unique field used as the natural key.
+        maxsize: Maximum number of entries kept in memory.
+    """
+
+    def __init__(self, model, key_field: str, maxsize: int):
+        self.model = model
+        self.key_field = key_field
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmed = False
+        self._generation = None
+
+    @property
+    def generation_key(self) -> str:
+        return f"news:resolver-gen:{self.model._meta.label_lower}"
+
+    # ------------------------------------------------------------------
+    # Public methods
+    # ------------------------------------------------------------------
+
+    def resolve_many(
+        self, defaults_by_key: dict[str, dict], create: bool = True
+    ) -> dict[str, int]:
+        """
+        Map every key in `defaults_by_key` to a primary key.
+
+        Keys missing from the cache are looked up with a single query.
+        When `create` is set, keys missing from the table are inserted in
+        one multi-row INSERT using their defaults, then read back so rows
+        created concurrently by another worker resolve correctly too.
+        """
+        self._sync_generation()
+        if not self._warmed:
+            self.warm()
+
+        resolved = {}
+        with self._lock:
+            for key in defaults_by_key:
+                pk = self._entries.get(key)
+                if pk is not None:
+                    self._entries.move_to_end(key)
+                    resolved[key] = pk
+
+        missing = [key for key in defaults_by_key if key not in resolved]
+        if not missing:
+            return resolved
+
+        found = self._fetch(missing)
+        unknown = [key for key in missing if key not in found]
+        if unknown and create:
+            self.model.objects.bulk_create(
+                [
+                    self.model(**{self.key_field: key, **defaults_by_key[key]})
+                    for key in unknown
+                ],
+                ignore_conflicts=True,
+            )
+            found.update(self._fetch(unknown))
+
+        # Rows created or read inside a transaction that later rolls back
+        # must not leak into the process-wide map.
+        transaction.on_commit(lambda: self._remember(found))
+        resolved.update(found)
+        return resolved
+
+    def resolve(self, key: str, defaults: Optional[dict] = None) -> Optional[int]:
+        """Resolve a single key, creating the row if needed."""
+        return self.resolve_many({key: defaults or {}}).get(key)
+
+    def warm(self) -> None:
+        """Bulk-load up to `maxsize` rows from the table into the cache."""
+        rows = self.model.objects.order_by("-pk").values_list(
+            self.key_field, "pk"
+        )[: self.maxsize]
+        with self._lock:
+            self._entries.clear()
+            for key, pk in reversed(list(rows)):
+                self._entries[key] = pk
+            self._warmed = True
+        logger.debug(
+            "Warmed %s resolver with %d entries",
+            self.model.__name__,
+            len(self._entries),
+        )
+
+    def discard(self, key: Optional[str] = None, pk: Optional[int] = None) -> None:
+        """Drop entries by key and/or primary key from the local cache."""
+        with self._lock:
+            if key is not None:
+                self._entries.pop(key, None)
+            if pk is not None:
+                for stale in [k for k, v in self._entries.items() if v == pk]:
+                    del self._entries[stale]
+
+    def invalidate(self) -> None:
+        """Tell every process to drop its cached entries for this model."""
+        try:
+            cache.incr(self.generation_key)
+        except ValueError:
+            cache.set(self.generation_key, 1, timeout=None)
+
+    def clear(self) -> None:
+        """Empty the local cache; the next call warms it again."""
+        with self._lock:
+            self._entries.clear()
+            self._warmed = False
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _fetch(self, keys: Iterable[str]) -> dict[str, int]:
+        return dict(
+            self.model.objects.filter(
+                **{f"{self.key_field}__in": list(keys)}
+            ).values_list(self.key_field, "pk")
+        )
+
+    def _remember(self, mapping: dict[str, int]) -> None:
+        with self._lock:
+            for key, pk in mapping.items():
+                self._entries[key] = pk
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _sync_generation(self) -> None:
+        """Clear the local map if another process invalidated the model."""
+        generation = cache.get(self.generation_key, 0)
+        if generation != self._generation:
+            if self._generation is not None:
+                self.clear()
+            self._generation = generation
+
+
+source_resolver = KeyResolver(
+    Source, "source_id", maxsize=settings.NEWS_RESOLVER_CACHE_SIZE
+)
+category_resolver = KeyResolver(
+    Category, "slug", maxsize=settings.NEWS_RESOLVER_CACHE_SIZE
+)
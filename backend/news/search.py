@@ -0,0 +1,70 @@
+"""
+Article search for the `search` parameter of the article list.
+
+Full-text mode (the default on PostgreSQL) matches against the stored
+`search_vector` column added in migration 0006: a generated tsvector of
+title (weight A), description (B) and source name (C) with a GIN index.
+The query is parsed with websearch_to_tsquery, so users can write
+"quoted phrases", `or` and `-excluded` words, and results are ordered by
+ts_rank with the newest article first among equal ranks.
+
+Substring mode (`search_mode=substring`, and the only mode on other
+databases) keeps the original ICONTAINS match on title and description,
+served by the trigram indexes from migration 0002.
+
+The column is maintained by PostgreSQL, not declared on the model, so
+ingest code never writes it.
+"""
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Article
+
+SEARCH_CONFIG = "english"
+SEARCH_MODES = ("fulltext", "substring")
+
+
+def normalize_search(query: str) -> str:
+    """The search string as matched: trimmed."""
+    return (query or "").strip()
+
+
+def search_key(query: str) -> str:
+    """
+    Form of a search string in cache keys (see ArticleListView): trimmed
+    and lower-cased.
+
+    Both modes ignore case, so this does not change the result. Full
+    case folding would: it maps ß to ss, which neither search config
+    does.
+    """
+    return normalize_search(query).lower()
+
+
+def search_articles(queryset, query: str, mode: str = "fulltext"):
+    """
+    Filter `queryset` to articles matching `query`.
+
+    Full-text results are annotated with `search_rank` and ordered by
+    it; substring results keep the queryset's ordering.
+    """
+    if mode == "substring" or connection.vendor != "postgresql":
+        return queryset.filter(
+            Q(title__icontains=query) | Q(description__icontains=query)
+        )
+
+    vector = f"{Article._meta.db_table}.search_vector"
+    tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+    return (
+        queryset.annotate(
+            search_rank=RawSQL(
+                f"ts_rank({vector}, {tsquery})", [query], output_field=FloatField()
+            )
+        )
+        .filter(
+            RawSQL(f"{vector} @@ {tsquery}", [query], output_field=BooleanField())
+        )
+        .order_by("-search_rank", "-published_at")
+    )
@@ -3,8 +3,20 @@ Serializers for the News API endpoints.
 
 These serializers handle the conversion between Article/Source/Category
 model instances and JSON representations used by the REST API.
+
+The article list skips ArticleListSerializer at request time: it reads
+the same fields with values_list() and builds the dicts directly (see
+article_list_rows / article_list_data), which must stay in step with the
+serializer's fields.
+
+Both article endpoints accept `?fields=a,b,c` to return a subset of
+their fields (see parse_fields); the list then also reads only those
+columns.
 """
 
+from operator import attrgetter
+from typing import Optional
+
 from rest_framework import serializers
 
 from .models import Article, Category, Source
@@ -39,6 +51,19 @@ class SourceSerializer(serializers.ModelSerializer):
         ]
 
 
+class ArticleSourceSerializer(SourceSerializer):
+    """
+    A Source nested in article payloads. The article count is left out:
+    detail payloads are cached per article and ingest does not refresh
+    them (see caching.get_article_entries).
+    """
+
+    class Meta(SourceSerializer.Meta):
+        fields = [
+            field for field in SourceSerializer.Meta.fields if field != "article_count"
+        ]
+
+
 class ArticleSerializer(serializers.ModelSerializer):
     """
     Serializer for the Article model.
@@ -48,7 +73,7 @@ class ArticleSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(
         source="category.name", read_only=True, default=None
     )
-    source_detail = SourceSerializer(source="source", read_only=True)
+    source_detail = ArticleSourceSerializer(source="source", read_only=True)
 
     class Meta:
         model = Article
@@ -93,3 +118,85 @@ class ArticleListSerializer(serializers.ModelSerializer):
             "published_at",
             "country",
         ]
+
+
+# ArticleListSerializer.Meta.fields as columns, category name via the join
+ARTICLE_LIST_COLUMNS = [
+    "category__name" if field == "category_name" else field
+    for field in ArticleListSerializer.Meta.fields
+]
+# Read for every page whatever the fields: pagination links need them
+ARTICLE_LIST_KEY_COLUMNS = ["id", "published_at"]
+_datetime_field = serializers.DateTimeField()
+_list_values = {
+    field: attrgetter(column)
+    for field, column in zip(ArticleListSerializer.Meta.fields, ARTICLE_LIST_COLUMNS)
+}
+_list_values["published_at"] = lambda row: _datetime_field.to_representation(
+    row.published_at
+)
+
+
+def parse_fields(value: Optional[str], allowed: list[str]) -> Optional[list[str]]:
+    """
+    The fields named in a `fields` query parameter, in `allowed` order.
+
+    Returns None (all fields) when the parameter is absent or empty, and
+    raises ValidationError on a name not in `allowed`.
+    """
+    requested = {name.strip() for name in (value or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise serializers.ValidationError(
+            {
+                "fields": f"Unknown field(s): {', '.join(sorted(unknown))}. "
+                f"Choose from: {', '.join(allowed)}."
+            }
+        )
+    return [field for field in allowed if field in requested]
+
+
+def article_list_rows(queryset, fields: Optional[list[str]] = None):
+    """
+    Project an article queryset onto the list fields, as named rows.
+
+    With `fields`, only their columns (and the pagination keys) are read.
+    """
+    columns = ARTICLE_LIST_COLUMNS
+    if fields is not None:
+        wanted = set(fields)
+        columns = [
+            column
+            for field, column in zip(ArticleListSerializer.Meta.fields, columns)
+            if field in wanted or column in ARTICLE_LIST_KEY_COLUMNS
+        ]
+    return queryset.values_list(*columns, named=True)
+
+
+def article_list_data(rows, fields: Optional[list[str]] = None) -> list[dict]:
+    """
+    ArticleListSerializer's output for rows from article_list_rows,
+    limited to `fields` if given.
+    """
+    if fields is not None:
+        values = [(field, _list_values[field]) for field in fields]
+        return [{field: value(row) for field, value in values} for row in rows]
+
+    published_at = _datetime_field.to_representation
+    return [
+        {
+            "id": row.id,
+            "source_name": row.source_name,
+            "category_name": row.category__name,
+            "author": row.author,
+            "title": row.title,
+            "description": row.description,
+            "url": row.url,
+            "url_to_image": row.url_to_image,
+            "published_at": published_at(row.published_at),
+            "country": row.country,
+        }
+        for row in rows
+    ]
@@ -5,15 +5,28 @@ Handles communication with the external News API (https://newsapi.org).
 Responsible for fetching articles and upserting them into the database.
 """
 
+import hashlib
 import logging
-from datetime import datetime
-from typing import Optional
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, NamedTuple, Optional
 
 import requests
 from django.conf import settings
+from django.db import transaction
 from django.utils.text import slugify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .models import Article, Category, Source
+from .caching import bump_ingest_generations
+from .counters import add_articles
+from .dedup import dedup_index, story_simhash
+from .metrics import FeedStats, IngestStats
+from .models import Article, FeedState
+from .quota import newsapi_quota
+from .resolvers import category_resolver, source_resolver
 
 logger = logging.getLogger("news")
 
@@ -28,6 +41,91 @@ NEWS_API_CATEGORIES = [
     "technology",
 ]
 
+# Rows per INSERT statement when bulk-writing articles
+BULK_BATCH_SIZE = 1000
+
+
+def _prefetch(iterable: Iterable, depth: int) -> Iterator:
+    """
+    Consume `iterable` on a background thread, `depth` items ahead.
+
+    The producer blocks once `depth` items are waiting, which bounds memory
+    when the consumer is slower. Anything raised by the producer, even a
+    BaseException, is re-raised in the consumer; closing the generator
+    stops the producer.
+    """
+    buffer = queue.Queue(maxsize=max(depth, 1))
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as exc:
+            put(exc)
+        finally:
+            # Always end the stream, or the consumer would wait forever
+            put(done)
+
+    thread = threading.Thread(target=produce, name="newsapi-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class Feed(NamedTuple):
+    """A single News API request stream (endpoint + filters)."""
+
+    endpoint: str
+    category: Optional[str] = None
+    country: Optional[str] = None
+    query: Optional[str] = None
+
+    @classmethod
+    def top_headlines(cls, category: str, country: str) -> "Feed":
+        return cls("top-headlines", category=category, country=country)
+
+    def __str__(self):
+        return ", ".join(
+            f"{name}={value}" for name, value in self._asdict().items() if value
+        )
+
+
+class FeedResponse(NamedTuple):
+    """Raw articles of one News API response plus a body fingerprint."""
+
+    articles: list[dict]
+    fingerprint: str
+    total_results: int = 0
+
+
+class FeedResult(NamedTuple):
+    """Outcome of fetching and storing one feed."""
+
+    feed: Feed
+    created: int = 0
+    error: Optional[Exception] = None
+
 
 class NewsAPIService:
     """
@@ -36,13 +134,51 @@ class NewsAPIService:
     Methods:
         fetch_top_headlines – fetch top headlines by category / country.
         fetch_everything   – search all articles by keyword.
+        fetch_feed         – fetch and store any single Feed.
+        fetch_feeds        – fetch many feeds concurrently, store in order.
+
+    Stage timings and counters of every feed fetched by this instance are
+    collected in `self.stats` (see metrics.py).
     """
 
-    def __init__(self):
+    def __init__(self, incremental: bool = True, priority: str = "scheduled"):
+        """
+        Args:
+            incremental: Skip unchanged responses and articles already
+                covered by the feed's high-water mark (see FeedState).
+            priority: Quota class for this caller's requests, "scheduled"
+                or "manual" (see quota.py).
+        """
+        self.incremental = incremental
+        self.priority = priority
         self.api_key = settings.NEWS_API_KEY
         self.base_url = settings.NEWS_API_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({"X-Api-Key": self.api_key})
+        self.session = self._build_session()
+        self.stats = IngestStats()
+
+    def _build_session(self) -> requests.Session:
+        """
+        Create a keep-alive session shared by all fetcher threads.
+
+        The connection pool is sized for the configured concurrency and
+        transient 5xx / connection errors are retried with backoff.
+        """
+        session = requests.Session()
+        session.headers.update({"X-Api-Key": self.api_key})
+        retries = Retry(
+            total=settings.NEWS_API_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(settings.NEWS_API_CONCURRENCY, 1),
+            max_retries=retries,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     # ------------------------------------------------------------------
     # Public methods
@@ -65,60 +201,134 @@ class NewsAPIService:
         Returns:
             Number of new articles stored.
         """
-        url = f"{self.base_url}/top-headlines"
-        params = {
-            "category": category,
-            "country": country,
-            "pageSize": page_size,
-        }
-
-        logger.info(
-            "Fetching top headlines: category=%s, country=%s", category, country
-        )
-        response = self.session.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("status") != "ok":
-            raise ValueError(
-                f"News API error: {data.get('message', 'Unknown error')}"
-            )
-
-        articles = data.get("articles", [])
-        count = self._store_articles(articles, category=category, country=country)
-        logger.info(
-            "Stored %d articles for category=%s, country=%s", count, category, country
+        return self.fetch_feed(
+            Feed.top_headlines(category, country), page_size=page_size
         )
-        return count
 
     def fetch_everything(
         self,
         query: str,
         page_size: int = 100,
         sort_by: str = "publishedAt",
+        max_pages: int = 1,
     ) -> int:
         """
         Search all articles using the News API /everything endpoint.
 
+        With `max_pages` > 1 the results are streamed page by page through
+        a fetch -> normalize -> store pipeline (see _stream_feed), so deep
+        queries run with flat memory use and write as they go.
+
         Args:
             query: Keywords to search for.
             page_size: Number of results per request (max 100).
             sort_by: Sort order (relevancy, popularity, publishedAt).
+            max_pages: Maximum number of result pages to read.
+
+        Returns:
+            Number of new articles stored.
+        """
+        feed = Feed("everything", query=query)
+        if max_pages > 1:
+            return self._stream_feed(
+                feed, max_pages=max_pages, page_size=page_size, sort_by=sort_by
+            )
+        response = self._fetch_feed(feed, page_size=page_size, sort_by=sort_by)
+        return self._store_feed(feed, response)
+
+    def fetch_feed(self, feed: Feed, page_size: int = 100) -> int:
+        """
+        Fetch a single feed (one page) and store it.
 
         Returns:
             Number of new articles stored.
         """
-        url = f"{self.base_url}/everything"
-        params = {
-            "q": query,
-            "pageSize": page_size,
-            "sortBy": sort_by,
-        }
+        response = self._fetch_feed(feed, page_size=page_size)
+        return self._store_feed(feed, response)
+
+    def fetch_feeds(
+        self,
+        feeds: list[Feed],
+        concurrency: Optional[int] = None,
+        page_size: int = 100,
+    ) -> list[FeedResult]:
+        """
+        Fetch several feeds in parallel and store them in feed order.
+
+        HTTP requests run on a thread pool over the shared session, so the
+        network stage takes roughly as long as the slowest request. The
+        database stage stays in the calling thread and processes feeds in
+        the order given, as soon as each response is available.
+
+        Args:
+            feeds: Feeds to fetch.
+            concurrency: Max parallel requests (default NEWS_API_CONCURRENCY).
+            page_size: Number of results per request (max 100).
+
+        Returns:
+            One FeedResult per feed, in the same order.
+        """
+        concurrency = concurrency or settings.NEWS_API_CONCURRENCY
+        workers = max(1, min(concurrency, len(feeds)))
+        results = []
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="newsapi"
+        ) as pool:
+            futures = [
+                pool.submit(self._fetch_feed, feed, page_size=page_size)
+                for feed in feeds
+            ]
+            for feed, future in zip(feeds, futures):
+                try:
+                    created = self._store_feed(feed, future.result())
+                    results.append(FeedResult(feed, created))
+                except Exception as exc:
+                    logger.error("Error fetching feed (%s): %s", feed, exc)
+                    results.append(FeedResult(feed, error=exc))
+
+        return results
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
 
-        logger.info("Fetching everything: query=%s", query)
-        response = self.session.get(url, params=params, timeout=30)
+    def _fetch_feed(
+        self,
+        feed: Feed,
+        page_size: int = 100,
+        sort_by: str = "publishedAt",
+        page: int = 1,
+    ) -> FeedResponse:
+        """Request one page of a feed and return its raw articles."""
+        if feed.endpoint == "everything":
+            params = {"q": feed.query, "pageSize": page_size, "sortBy": sort_by}
+        else:
+            params = {
+                "category": feed.category,
+                "country": feed.country,
+                "pageSize": page_size,
+            }
+        if page > 1:
+            params["page"] = page
+
+        stats = self.stats.feed(feed)
+        with stats.timer("quota"):
+            newsapi_quota.acquire(self.priority)
+        logger.info("Fetching %s: %s (page %d)", feed.endpoint, feed, page)
+        with stats.timer("http"):
+            response = self.session.get(
+                f"{self.base_url}/{feed.endpoint}",
+                params=params,
+                timeout=settings.NEWS_API_TIMEOUT,
+            )
+        stats.add(requests=1, bytes=len(response.content))
+        if response.status_code == 429:
+            # Our budget is out of sync with the API's; stop everyone
+            newsapi_quota.drain()
         response.raise_for_status()
-        data = response.json()
+        with stats.timer("decode"):
+            data = response.json()
 
         if data.get("status") != "ok":
             raise ValueError(
@@ -126,99 +336,391 @@ class NewsAPIService:
             )
 
         articles = data.get("articles", [])
-        count = self._store_articles(articles)
-        logger.info("Stored %d articles for query=%s", count, query)
+        stats.add(seen=len(articles))
+        return FeedResponse(
+            articles=articles,
+            fingerprint=hashlib.sha256(response.content).hexdigest(),
+            total_results=data.get("totalResults", 0),
+        )
+
+    def _iter_feed_pages(
+        self,
+        feed: Feed,
+        max_pages: int,
+        page_size: int = 100,
+        sort_by: str = "publishedAt",
+    ) -> Iterator[list[dict]]:
+        """Yield the raw articles of each result page, stopping at the end."""
+        for page in range(1, max_pages + 1):
+            response = self._fetch_feed(
+                feed, page_size=page_size, sort_by=sort_by, page=page
+            )
+            yield response.articles
+            if (
+                len(response.articles) < page_size
+                or page * page_size >= response.total_results
+            ):
+                return
+
+    def _stream_feed(
+        self,
+        feed: Feed,
+        max_pages: int,
+        page_size: int = 100,
+        sort_by: str = "publishedAt",
+    ) -> int:
+        """
+        Fetch, normalize and store a multi-page feed one page at a time.
+
+        Pages are fetched ahead on a background thread, but at most
+        NEWS_API_PREFETCH_PAGES of them wait in memory; when the store
+        stage falls behind the fetcher blocks. Each page is written in its
+        own transaction, so progress survives a failure on a later page.
+
+        In incremental mode only articles newer than the feed watermark
+        are stored, and when results are sorted by publishedAt paging
+        stops at the first page with nothing past the watermark.
+        """
+        stats = self.stats.feed(feed)
+        state = self._get_feed_state(feed) if self.incremental else None
+        watermark = state.last_published_at if state else None
+        newest = None
+        created = 0
+
+        pages = _prefetch(
+            self._iter_feed_pages(feed, max_pages, page_size, sort_by),
+            depth=settings.NEWS_API_PREFETCH_PAGES,
+        )
+        try:
+            for number, articles in enumerate(pages, start=1):
+                rows = self._normalize_articles(articles, feed.country, stats)
+                if watermark:
+                    normalized = len(rows)
+                    rows = [
+                        row
+                        for row in rows
+                        if row["fields"]["published_at"] > watermark
+                    ]
+                    stats.add(filtered=normalized - len(rows))
+                if rows:
+                    page_newest = max(row["fields"]["published_at"] for row in rows)
+                    newest = page_newest if newest is None else max(newest, page_newest)
+
+                created += self._store_rows(
+                    rows, category=feed.category, country=feed.country, stats=stats
+                )
+                logger.info(
+                    "Stored page %d for %s (%d new so far)", number, feed, created
+                )
+                if watermark and not rows and sort_by == "publishedAt":
+                    break
+        finally:
+            pages.close()
+
+        if state and newest:
+            state.last_published_at = newest
+            state.save(update_fields=["last_published_at", "updated_at"])
+        stats.log()
+        return created
+
+    def _store_feed(self, feed: Feed, response: FeedResponse) -> int:
+        """
+        Store the articles of one feed and advance its high-water mark.
+
+        In incremental mode an unchanged response body is skipped without
+        touching the article table, and a changed one only stores articles
+        newer than the watermark or missing from the last response.
+        """
+        stats = self.stats.feed(feed)
+        if not self.incremental:
+            count = self._store_articles(
+                response.articles,
+                category=feed.category,
+                country=feed.country,
+                stats=stats,
+            )
+            logger.info("Stored %d articles for %s", count, feed)
+            stats.log()
+            return count
+
+        with transaction.atomic():
+            state = self._get_feed_state(feed, lock=True)
+            if state.response_hash == response.fingerprint:
+                logger.info("Unchanged response for %s, skipping", feed)
+                stats.add(filtered=len(response.articles))
+                stats.log()
+                return 0
+
+            rows = self._normalize_articles(response.articles, feed.country, stats)
+            new_rows = self._filter_new_rows(state, rows)
+            stats.add(filtered=len(rows) - len(new_rows))
+            count = self._store_rows(
+                new_rows, category=feed.category, country=feed.country, stats=stats
+            )
+            self._advance_feed_state(state, response, rows)
+
+        logger.info(
+            "Stored %d articles for %s (%d of %d past the watermark)",
+            count,
+            feed,
+            len(new_rows),
+            len(response.articles),
+        )
+        stats.log()
         return count
 
-    # ------------------------------------------------------------------
-    # Private helpers
-    # ------------------------------------------------------------------
+    @staticmethod
+    def _get_feed_state(feed: Feed, lock: bool = False) -> FeedState:
+        """Load (or create) the FeedState row for a feed."""
+        queryset = FeedState.objects.select_for_update() if lock else FeedState.objects
+        state, _ = queryset.get_or_create(
+            endpoint=feed.endpoint,
+            category=feed.category or "",
+            country=feed.country or "",
+            query=feed.query or "",
+        )
+        return state
+
+    @staticmethod
+    def _filter_new_rows(state: FeedState, rows: list[dict]) -> list[dict]:
+        """
+        Keep normalized rows (see _normalize_articles) newer than the
+        watermark or not seen last time.
+        """
+        if state.last_published_at is None:
+            return rows
+
+        recent_urls = set(state.recent_urls)
+        return [
+            row
+            for row in rows
+            if row["fields"]["published_at"] > state.last_published_at
+            or row["url"] not in recent_urls
+        ]
+
+    @staticmethod
+    def _advance_feed_state(
+        state: FeedState, response: FeedResponse, rows: list[dict]
+    ) -> None:
+        """
+        Record the response fingerprint, the newest date of its normalized
+        `rows` and its URL set.
+        """
+        dates = [row["fields"]["published_at"] for row in rows]
+        if dates:
+            newest = max(dates)
+            last = state.last_published_at
+            state.last_published_at = newest if last is None else max(last, newest)
+        state.response_hash = response.fingerprint
+        state.recent_urls = [
+            raw["url"] for raw in response.articles if raw.get("url")
+        ]
+        state.save()
 
     def _store_articles(
         self,
         articles: list[dict],
         category: Optional[str] = None,
         country: Optional[str] = None,
+        stats: Optional[FeedStats] = None,
     ) -> int:
         """
         Upsert a list of raw article dicts from the News API into the DB.
 
-        Uses get_or_create on URL to avoid duplicates.
+        Returns:
+            Number of newly created articles.
+        """
+        rows = self._normalize_articles(articles, country, stats)
+        return self._store_rows(rows, category=category, country=country, stats=stats)
+
+    def _store_rows(
+        self,
+        rows: list[dict],
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        stats: Optional[FeedStats] = None,
+    ) -> int:
+        """
+        Write normalized article rows (see _normalize_articles).
+
+        The whole batch is written set-based inside a single transaction:
+        one SELECT resolves which URLs already exist, new rows are matched
+        against recent stories (see dedup.py), and every row kept is
+        written with one INSERT ... ON CONFLICT (url) DO NOTHING.
 
         Returns:
             Number of newly created articles.
         """
-        created_count = 0
+        if not rows:
+            return 0
+        if stats is None:
+            stats = FeedStats()
+
+        with transaction.atomic():
+            with stats.timer("resolve"):
+                # Resolve or create the category
+                category_id = None
+                if category:
+                    category_id = category_resolver.resolve(
+                        slugify(category), {"name": category.title()}
+                    )
+
+                # Resolve every source in the page at once (cached per process)
+                source_ids = source_resolver.resolve_many(
+                    {
+                        self._source_key(row["source_info"]): {
+                            "name": row["source_info"].get("name") or "Unknown",
+                            "country": country or "",
+                        }
+                        for row in rows
+                    }
+                )
 
-        # Resolve or create the category
-        category_obj = None
-        if category:
-            category_obj, _ = Category.objects.get_or_create(
-                slug=slugify(category),
-                defaults={"name": category.title()},
-            )
+            with stats.timer("lookup"):
+                existing = set(
+                    Article.objects.filter(
+                        url__in=[row["url"] for row in rows]
+                    ).values_list("url", flat=True)
+                )
+            new_articles = [
+                Article(
+                    source_id=source_ids.get(self._source_key(row["source_info"])),
+                    category_id=category_id,
+                    **row["fields"],
+                )
+                for row in rows
+                if row["url"] not in existing
+            ]
+            with stats.timer("dedup"):
+                new_articles = dedup_index.assign_clusters(new_articles)
+            with stats.timer("write"):
+                inserted = self._bulk_insert_articles(new_articles)
+                created = len(inserted)
+                add_articles(
+                    (article.category_id, article.source_id) for article in inserted
+                )
+            if created:
+                # Refresh the cached list slices this batch touched
+                bump_ingest_generations(
+                    category=slugify(category) if category else None,
+                    sources=[
+                        self._source_key(row["source_info"])
+                        for row in rows
+                        if row["url"] not in existing
+                    ],
+                    countries=[article.country for article in new_articles],
+                )
 
-        for raw in articles:
-            try:
-                # Skip articles without a URL (they can't be linked)
-                article_url = raw.get("url")
-                if not article_url:
-                    continue
+        stats.add(created=created, duplicate=len(rows) - created)
+        return created
 
-                # Resolve or create the source
-                source_info = raw.get("source", {})
-                source_obj = self._get_or_create_source(source_info, country)
+    def _normalize_articles(
+        self,
+        articles: list[dict],
+        country: Optional[str] = None,
+        stats: Optional[FeedStats] = None,
+    ) -> list[dict]:
+        """
+        Validate and clean raw News API articles.
 
-                # Parse published date
-                published_at = self._parse_date(raw.get("publishedAt"))
-                if not published_at:
+        Articles without a URL or with an unparseable date are skipped, and
+        repeated URLs within the page keep their first occurrence.
+        """
+        if stats is None:
+            stats = FeedStats()
+        rows = []
+        seen_urls = set()
+        skipped = {"skipped_no_url": 0, "skipped_bad_date": 0, "skipped_invalid": 0}
+        repeated = 0
+
+        # Parse published dates
+        with stats.timer("dates"):
+            dates = [
+                self._parse_date(raw.get("publishedAt"))
+                if isinstance(raw, dict)
+                else None
+                for raw in articles
+            ]
+
+        with stats.timer("normalize"):
+            for raw, published_at in zip(articles, dates):
+                try:
+                    # Skip articles without a URL (they can't be linked)
+                    article_url = raw.get("url")
+                    if not article_url:
+                        skipped["skipped_no_url"] += 1
+                        continue
+                    if article_url in seen_urls:
+                        repeated += 1
+                        continue
+                    if not published_at:
+                        skipped["skipped_bad_date"] += 1
+                        continue
+
+                    source_info = raw.get("source") or {}
+                    seen_urls.add(article_url)
+                    rows.append(
+                        {
+                            "url": article_url,
+                            "source_info": source_info,
+                            "fields": {
+                                "url": article_url,
+                                "source_name": source_info.get("name") or "",
+                                "author": (raw.get("author") or "")[:500],
+                                "title": (raw.get("title") or "")[:1000],
+                                "description": raw.get("description") or "",
+                                "url_to_image": raw.get("urlToImage") or "",
+                                "published_at": published_at,
+                                "content": raw.get("content") or "",
+                                "country": (country or "").lower(),
+                                "simhash": story_simhash(
+                                    raw.get("title"), raw.get("description")
+                                ),
+                            },
+                        }
+                    )
+                except Exception as e:
+                    logger.warning("Skipping article: %s", e)
+                    skipped["skipped_invalid"] += 1
                     continue
 
-                # Upsert article
-                _, created = Article.objects.get_or_create(
-                    url=article_url,
-                    defaults={
-                        "source": source_obj,
-                        "category": category_obj,
-                        "source_name": source_info.get("name", ""),
-                        "author": (raw.get("author") or "")[:500],
-                        "title": (raw.get("title") or "")[:1000],
-                        "description": raw.get("description") or "",
-                        "url_to_image": raw.get("urlToImage") or "",
-                        "published_at": published_at,
-                        "content": raw.get("content") or "",
-                        "country": country or "",
-                    },
-                )
-                if created:
-                    created_count += 1
+        stats.add(duplicate=repeated, **skipped)
+        return rows
 
-            except Exception as e:
-                logger.warning("Skipping article: %s", e)
-                continue
+    @staticmethod
+    def _bulk_insert_articles(new_articles: list[Article]) -> list[Article]:
+        """
+        Insert articles with ON CONFLICT (url) DO NOTHING.
 
-        return created_count
+        A concurrent worker may insert the same URL between our existence
+        check and the INSERT, in which case the row is silently skipped.
+        To report exactly the rows created, they are read back and only
+        those carrying the ``created_at`` stamped on our instances count.
+
+        Returns:
+            The articles actually inserted.
+        """
+        if not new_articles:
+            return []
+
+        Article.objects.bulk_create(
+            new_articles, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+        )
+        stamps = {obj.url: obj.created_at for obj in new_articles}
+        stored = Article.objects.filter(url__in=list(stamps)).values_list(
+            "url", "created_at"
+        )
+        ours = {url for url, created_at in stored if stamps[url] == created_at}
+        return [obj for obj in new_articles if obj.url in ours]
 
     @staticmethod
-    def _get_or_create_source(
-        source_info: dict, country: Optional[str] = None
-    ) -> Optional[Source]:
-        """Get or create a Source record from News API source dict."""
+    def _source_key(source_info: dict) -> str:
+        """Return the source_id a News API source dict resolves to."""
         source_id = source_info.get("id")
-        source_name = source_info.get("name", "Unknown")
-
         if not source_id:
             # Use a slugified name as fallback ID
-            source_id = slugify(source_name) or "unknown"
-
-        source_obj, _ = Source.objects.get_or_create(
-            source_id=source_id,
-            defaults={
-                "name": source_name,
-                "country": country or "",
-            },
-        )
-        return source_obj
+            source_id = slugify(source_info.get("name", "Unknown")) or "unknown"
+        return source_id
 
     @staticmethod
     def _parse_date(date_string: Optional[str]) -> Optional[datetime]:
@@ -227,6 +729,9 @@ class NewsAPIService:
             return None
         try:
             # News API returns dates like "2024-01-15T10:30:00Z"
-            return datetime.fromisoformat(date_string.replace("Z", "+00:00"))
+            parsed = datetime.fromisoformat(date_string.replace("Z", "+00:00"))
         except (ValueError, AttributeError):
             return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
@@ -0,0 +1,92 @@
+"""
+Signal handlers for the News app.
+
+Keeps the process-wide Source / Category resolver caches in sync when
+rows are edited or deleted outside the ingest pipeline (e.g. in admin),
+and invalidates every cached list response when that happens, along
+with the cached detail payloads that embed the edited row. Article
+saves and deletes also move the category and source article counts.
+Ingest writes with bulk_create, sends no signals, and bumps only the
+slices it touched (see caching.py) and counts only the rows it created
+(see counters.py).
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .caching import invalidate_all, invalidate_article, invalidate_related
+from .counters import add_articles
+from .models import Article, Category, Source
+from .resolvers import category_resolver, source_resolver
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Source)
+@receiver(post_delete, sender=Source)
+def invalidate_list_responses(sender, instance, **kwargs):
+    invalidate_all()
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_detail(sender, instance, **kwargs):
+    invalidate_article(instance.pk)
+
+
+@receiver(pre_save, sender=Article)
+def remember_counted_keys(sender, instance, **kwargs):
+    # An edit may move the article to another category or source
+    instance._counted_keys = None
+    if not instance._state.adding:
+        instance._counted_keys = (
+            Article.objects.filter(pk=instance.pk)
+            .values_list("category_id", "source_id")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Article)
+def count_saved_article(sender, instance, created, **kwargs):
+    keys = (instance.category_id, instance.source_id)
+    previous = getattr(instance, "_counted_keys", None)
+    if created:
+        add_articles([keys])
+    elif previous is not None and previous != keys:
+        add_articles([previous], sign=-1)
+        add_articles([keys])
+
+
+@receiver(post_delete, sender=Article)
+def count_deleted_article(sender, instance, **kwargs):
+    add_articles([(instance.category_id, instance.source_id)], sign=-1)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Source)
+@receiver(post_delete, sender=Source)
+def invalidate_article_details(sender, instance, created=False, **kwargs):
+    # Detail payloads embed category and source names
+    if not created:
+        invalidate_related()
+
+
+@receiver(post_save, sender=Source)
+@receiver(post_delete, sender=Source)
+def invalidate_source_resolver(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    source_resolver.discard(key=instance.source_id, pk=instance.pk)
+    source_resolver.invalidate()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_resolver(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    category_resolver.discard(key=instance.slug, pk=instance.pk)
+    category_resolver.invalidate()
@@ -0,0 +1,178 @@
+"""
+Pre-rendered first pages of the article list, pushed by ingest.
+
+Most traffic is page 1 of the article list, unfiltered or filtered by
+one category or country. At the end of every ingest run `publish`
+renders the first NEWS_SNAPSHOT_PAGES pages of each of these slices:
+
+    page=N                    the global feed
+    category=<slug>&page=N    every category
+    country=<code>&page=N     every country in NEWS_API_COUNTRIES
+
+and stores each response body gzip-compressed (and brotli-compressed,
+if available; see compression.py) in Redis, keyed by the
+request's canonical query (ArticleListView.get_cache_query). Each
+snapshot records the generation counters it was rendered at (see
+caching.py). `serve` answers a request from a snapshot only while those
+counters are unchanged, so a batch committed after the last publish, or
+an admin edit, sends requests back through the normal path until the
+next run. Serving reads the snapshot and its counters with one
+get_many and runs no database query.
+
+Publishing is incremental: slices whose counters have not moved since
+their snapshot was rendered are skipped.
+
+Links in the body (`next`, `previous`) are absolute, so snapshots are
+rendered for NEWS_SNAPSHOT_ORIGIN and only served to requests for it.
+"""
+
+import gzip
+import logging
+from typing import Optional
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from .caching import (
+    EPOCH,
+    GLOBAL,
+    SNAPSHOT,
+    generation_key,
+    get_generations,
+    record_outcome,
+)
+from .compression import BROTLI, GZIP, codings, encode, negotiate
+from .counts import count_generation
+from .models import Category
+
+logger = logging.getLogger("news")
+
+SNAPSHOT_PREFIX = "news:snapshot"
+
+
+def snapshot_key(query: str) -> str:
+    return f"{SNAPSHOT_PREFIX}:{query}"
+
+
+def slices() -> list[dict]:
+    """Filters of every published slice (the global feed first)."""
+    categories = Category.objects.order_by("slug").values_list("slug", flat=True)
+    return (
+        [{}]
+        + [{"category": slug} for slug in categories]
+        + [
+            {"country": country.strip().lower()}
+            for country in settings.NEWS_API_COUNTRIES
+            if country.strip()
+        ]
+    )
+
+
+def publish() -> dict:
+    """
+    Render the first pages of every slice whose counters have moved.
+
+    Returns the number of slices rendered and skipped.
+    """
+    from .views import ArticleListView
+
+    origin = urlsplit(settings.NEWS_SNAPSHOT_ORIGIN)
+    factory = RequestFactory()
+    view = ArticleListView.as_view()
+    rendered = skipped = 0
+
+    for filters in slices():
+        queries = [
+            urlencode(sorted(dict(filters, page=str(page)).items()))
+            for page in range(1, settings.NEWS_SNAPSHOT_PAGES + 1)
+        ]
+        generations = _generations(filters)
+        versions = get_generations(generations)
+        current = cache.get(snapshot_key(queries[0]))
+        if (
+            current is not None
+            and current["versions"] == versions
+            and current["origin"] == settings.NEWS_SNAPSHOT_ORIGIN
+        ):
+            skipped += 1
+            continue
+
+        for query in queries:
+            request = factory.get(
+                f"/api/news/articles/?{query}",
+                secure=origin.scheme == "https",
+                HTTP_HOST=origin.netloc,
+            )
+            request.news_skip_cache = True
+            response = view(request).render()
+            if response.status_code != 200:
+                # Fewer pages than NEWS_SNAPSHOT_PAGES in this slice
+                cache.delete(snapshot_key(query))
+                continue
+            snapshot = {
+                "origin": settings.NEWS_SNAPSHOT_ORIGIN,
+                "generations": generations,
+                "versions": versions,
+                "content_type": response["Content-Type"],
+            }
+            # gzip is always kept: it is also how the plain body is stored
+            for coding in codings():
+                snapshot[coding] = encode(response.content, coding)
+            cache.set(
+                snapshot_key(query), snapshot, timeout=settings.NEWS_RESPONSE_CACHE_TTL
+            )
+        rendered += 1
+
+    logger.info(
+        "Published article list snapshots: %d rendered, %d unchanged",
+        rendered,
+        skipped,
+    )
+    return {"rendered": rendered, "skipped": skipped}
+
+
+def serve(view, request) -> Optional[HttpResponse]:
+    """
+    The snapshot response for `request`, or None if there is no current
+    snapshot for it (the view then takes its normal path).
+    """
+    if request.accepted_renderer.format != "json":
+        return None
+    query = view.get_cache_query(request)
+    key = snapshot_key(query)
+    generations = [generation_key(EPOCH), *view.get_cache_generations(request)]
+    found = cache.get_many([key, *generations])
+    snapshot = found.get(key)
+    if (
+        snapshot is None
+        or snapshot["generations"] != generations
+        or snapshot["versions"] != [found.get(g, 0) for g in generations]
+        or snapshot["origin"] != request.build_absolute_uri("/").rstrip("/")
+    ):
+        return None
+
+    record_outcome(view.cache_prefix, SNAPSHOT, query)
+    coding = negotiate(request, [c for c in (BROTLI, GZIP) if c in snapshot])
+    if coding is not None:
+        response = HttpResponse(snapshot[coding], content_type=snapshot["content_type"])
+        response["Content-Encoding"] = coding
+    else:
+        response = HttpResponse(
+            gzip.decompress(snapshot[GZIP]), content_type=snapshot["content_type"]
+        )
+    response["Vary"] = "Accept-Encoding"
+    response["X-Cache"] = SNAPSHOT.upper()
+    return response
+
+
+def _generations(filters: dict) -> list[str]:
+    """Counters a slice depends on, as ArticleListView computes them."""
+    scoped = [generation_key(scope, value) for scope, value in filters.items()]
+    return [
+        generation_key(EPOCH),
+        *(scoped or [generation_key(GLOBAL)]),
+        count_generation(filters),
+    ]
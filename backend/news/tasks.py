@@ -3,42 +3,167 @@ Celery tasks for periodic news fetching.
 
 The `fetch_and_store_news` task is scheduled via Celery Beat
 (see CELERY_BEAT_SCHEDULE in settings.py) to run every 30 minutes.
-It fetches top headlines for all supported categories and stores them.
+It fans out one `fetch_feed` subtask per category × country as a chord,
+so feeds spread across all worker processes and retry independently;
+`summarize_fetch_run` reports the totals once every feed has finished,
+refreshes the cached article list counts (see counts.py) and publishes
+the first-page snapshots (see snapshots.py).
+
+`run_fetch_job` runs the manual fetches queued by FetchNewsView,
+`rebuild_list_response` refreshes stale cached list responses in the
+background (see caching.py), and `reconcile_article_counts` repairs
+drifted category and source article counts (see counters.py).
 """
 
 import logging
+import time
 
-from celery import shared_task
+from celery import chord, shared_task
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone
 
-from .services import NEWS_API_CATEGORIES, NewsAPIService
+from . import counters, counts, jobs, snapshots
+from .metrics import FeedStats, IngestStats
+from .services import NEWS_API_CATEGORIES, Feed, NewsAPIService
 
 logger = logging.getLogger("news")
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def fetch_and_store_news(self):
+@shared_task
+def fetch_and_store_news():
     """
     Periodic task: fetch top headlines for every category and store them.
 
-    Retries up to 3 times with a 60-second delay on failure.
+    Dispatches one fetch_feed subtask per category × NEWS_API_COUNTRIES
+    and a summarize_fetch_run callback; returns the chord's result id.
+    """
+    feeds = [
+        Feed.top_headlines(category, country)
+        for category in NEWS_API_CATEGORIES
+        for country in settings.NEWS_API_COUNTRIES
+    ]
+    result = chord(fetch_feed.s(*feed) for feed in feeds)(summarize_fetch_run.s())
+    logger.info("[Celery] Dispatched %d feeds (run %s)", len(feeds), result.id)
+    return result.id
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def fetch_feed(self, endpoint, category=None, country=None, query=None):
+    """
+    Fetch and store a single feed.
+
+    Retries up to 3 times with exponential backoff (60s, 120s, 240s).
+    A feed that still fails reports its error instead of raising, so the
+    rest of the run and its summary are not affected.
     """
+    feed = Feed(endpoint, category, country, query)
     service = NewsAPIService()
-    total = 0
+    try:
+        count = service.fetch_feed(feed)
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            logger.warning("[Celery] Retrying %s: %s", feed, exc)
+            raise self.retry(
+                exc=exc, countdown=self.default_retry_delay * 2**self.request.retries
+            )
+        logger.error("[Celery] Giving up on %s: %s", feed, exc)
+        return {"feed": str(feed), "created": 0, "error": str(exc), "stats": None}
+
+    logger.info("[Celery] Fetched %d articles for %s", count, feed)
+    return {
+        "feed": str(feed),
+        "created": count,
+        "error": None,
+        "stats": service.stats.feed(feed).as_dict(),
+    }
+
+
+@shared_task
+def summarize_fetch_run(results):
+    """Chord callback: log and return the totals of one fetch run."""
+    run = IngestStats()
+    for result in results:
+        if result.get("stats"):
+            run.feeds[result["feed"]] = FeedStats.from_dict(result["stats"])
+    run.log()
+
+    summary = {
+        "total": sum(result["created"] for result in results),
+        "feeds": len(results),
+        "failed": [result["feed"] for result in results if result["error"]],
+        "stats": run.total().as_dict(),
+    }
+    logger.info(
+        "[Celery] Total articles fetched in this run: %d (%d feeds, %d failed)",
+        summary["total"],
+        summary["feeds"],
+        len(summary["failed"]),
+    )
+    if summary["total"]:
+        counts.refresh_counts()
+        snapshots.publish()
+    return summary
+
 
-    for category in NEWS_API_CATEGORIES:
+@shared_task
+def run_fetch_job(job_id):
+    """
+    Run a manual fetch job created by FetchNewsView (see jobs.py).
+
+    Feeds are fetched one after another with the "manual" quota class;
+    the job record is updated with each feed's count, error, timing and
+    ingest stats.
+    """
+    job = jobs.get_job(job_id)
+    if job is None:
+        logger.warning("[Celery] Fetch job %s expired before it ran", job_id)
+        return None
+
+    job["state"] = jobs.RUNNING
+    job["started_at"] = timezone.now().isoformat()
+    jobs.save_job(job)
+
+    service = NewsAPIService(priority="manual")
+    for entry in job["feeds"]:
+        feed = Feed(**entry["feed"])
+        start = time.monotonic()
         try:
-            count = service.fetch_top_headlines(category=category, country="us")
-            total += count
-            logger.info(
-                "[Celery] Fetched %d articles for category=%s", count, category
-            )
+            entry["created"] = service.fetch_feed(feed)
+            job["total"] += entry["created"]
         except Exception as exc:
-            logger.error(
-                "[Celery] Error fetching category=%s: %s", category, exc
-            )
-            # Only retry on the last category failure to avoid flooding
-            if category == NEWS_API_CATEGORIES[-1]:
-                raise self.retry(exc=exc)
+            logger.error("[Celery] Fetch job %s failed on %s: %s", job_id, feed, exc)
+            entry["error"] = str(exc)
+        entry["seconds"] = round(time.monotonic() - start, 3)
+        entry["stats"] = service.stats.feed(feed).as_dict()
+        jobs.save_job(job)
+
+    failed = all(entry["error"] for entry in job["feeds"])
+    jobs.finish_job(job, jobs.FAILED if failed else jobs.SUCCEEDED)
+    if job["total"]:
+        counts.refresh_counts()
+        snapshots.publish()
+    return job["total"]
+
+
+@shared_task
+def rebuild_list_response(path, host, secure, key):
+    """
+    Re-render a stale list response and store it under `key`.
+
+    Queued by the request that took the rebuild lock; storing the
+    response releases it.
+    """
+    request = RequestFactory().get(path, secure=secure, HTTP_HOST=host)
+    request.news_rebuild_key = key
+    match = resolve(request.path_info)
+    response = match.func(request, *match.args, **match.kwargs)
+    response.render()
+    return response.status_code
+
 
-    logger.info("[Celery] Total articles fetched in this run: %d", total)
-    return total
+@shared_task
+def reconcile_article_counts():
+    """Recount the categories and sources whose article_count drifted."""
+    return counters.reconcile()
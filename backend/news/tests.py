@@ -1,11 +1,55 @@
 """Tests for the News app."""
 
-from django.test import TestCase, override_settings
+import gzip
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.http import http_date
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
+from rest_framework.throttling import AnonRateThrottle
 
-from .models import Article, Category, Source
+from . import counts, jobs, snapshots
+from .compression import negotiate
+from .counters import reconcile
+from .counts import refresh_counts
+from .dedup import dedup_index, hamming, story_simhash
+from .management.commands.import_articles import iter_records
+from .models import Article, Category, FeedState, Source
+from .pagination import ArticlePagination, KeysetPagination
+from .plans import (
+    PlanCase,
+    QueryPlan,
+    build_cases,
+    check_case,
+    render_plan,
+    run_case,
+    seed_dataset,
+)
+from .quota import QuotaExceeded, newsapi_quota
+from .renderers import FastJSONRenderer
+from .resolvers import category_resolver, source_resolver
+from .search import search_articles
+from .serializers import ArticleListSerializer, article_list_data, article_list_rows
+from .services import Feed, FeedResponse, NewsAPIService, _prefetch
+from .tasks import (
+    fetch_feed,
+    rebuild_list_response,
+    run_fetch_job,
+    summarize_fetch_run,
+)
+from .views import ArticleDetailView, ArticleListView, CategoryListView
 
 # Use dummy cache for tests to avoid Redis dependency
 TEST_CACHES = {
@@ -15,6 +59,57 @@ TEST_CACHES = {
 }
 
 
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "news-tests",
+    }
+}
+
+
+def reset_ingest_caches():
+    """Drop process-wide ingest caches that may hold rolled-back rows."""
+    source_resolver.clear()
+    category_resolver.clear()
+    dedup_index.clear()
+
+
+def raw_article(title, path, published_at="2026-01-01T00:00:00Z"):
+    """One News API article from the "wire" source at example.com/<path>."""
+    return {
+        "source": {"id": "wire", "name": "Wire"},
+        "title": title,
+        "url": f"https://example.com/{path}",
+        "publishedAt": published_at,
+    }
+
+
+class CachedAPITestMixin:
+    """Fresh ingest and response caches, an API client and an ingest service."""
+
+    def setUp(self):
+        super().setUp()
+        reset_ingest_caches()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.service = NewsAPIService()
+
+    def store(self, raw, **kwargs):
+        """Ingest `raw` articles and run the on-commit invalidation."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.service._store_articles(raw, **kwargs)
+
+    def ingest(self, category, number, country="us"):
+        """Ingest story `number` of `category`, published `number` minutes in."""
+        raw = raw_article(
+            f"{category} {number}",
+            f"{category}/{number}",
+            f"2026-01-01T00:0{number}:00Z",
+        )
+        return self.store([raw], category=category, country=country)
+
+
 class CategoryModelTest(TestCase):
     """Test the Category model."""
 
@@ -36,6 +131,7 @@ class ArticleAPITest(TestCase):
     """Test the Article API endpoints."""
 
     def setUp(self):
+        reset_ingest_caches()
         self.client = APIClient()
         self.category = Category.objects.create(
             name="Technology", slug="technology"
@@ -90,3 +186,1557 @@ class ArticleAPITest(TestCase):
         url = reverse("news:article-list")
         response = self.client.get(url, {"search": "test"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_substring_search_mode(self):
+        """Test the substring fallback and search_mode validation."""
+        url = reverse("news:article-list")
+        response = self.client.get(
+            url, {"search": "est Art", "search_mode": "substring"}
+        )
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get(url, {"search": "test", "search_mode": "fuzzy"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_fulltext_search_query(self):
+        """Test the PostgreSQL full-text query is ranked, newest first on ties."""
+        with mock.patch("news.search.connection") as conn:
+            conn.vendor = "postgresql"
+            queryset = search_articles(Article.objects.all(), "rates -bank")
+        sql = str(queryset.query)
+        self.assertIn("news_article.search_vector @@ websearch_to_tsquery", sql)
+        self.assertEqual(queryset.query.order_by, ("-search_rank", "-published_at"))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StoreArticlesTest(TestCase):
+    """Test the bulk ingest path in NewsAPIService._store_articles."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        self.service = NewsAPIService()
+        self.raw = [
+            {
+                "source": {"id": "bbc-news", "name": "BBC News"},
+                "title": f"Article {i}",
+                "url": f"https://example.com/article-{i}",
+                "publishedAt": "2026-01-01T00:00:00Z",
+            }
+            for i in range(3)
+        ]
+
+    def test_creates_new_articles(self):
+        count = self.service._store_articles(
+            self.raw, category="technology", country="us"
+        )
+        self.assertEqual(count, 3)
+        self.assertEqual(Article.objects.count(), 3)
+        self.assertEqual(Source.objects.count(), 1)
+        article = Article.objects.get(url="https://example.com/article-0")
+        self.assertEqual(article.category.slug, "technology")
+        self.assertEqual(article.source.source_id, "bbc-news")
+
+    def test_counts_only_new_articles(self):
+        self.service._store_articles(self.raw[:2])
+        count = self.service._store_articles(self.raw)
+        self.assertEqual(count, 1)
+        self.assertEqual(Article.objects.count(), 3)
+
+    def test_skips_invalid_and_repeated_articles(self):
+        raw = self.raw + [
+            {"title": "No URL", "publishedAt": "2026-01-01T00:00:00Z"},
+            {"url": "https://example.com/bad-date", "publishedAt": "yesterday"},
+            dict(self.raw[0], title="Repeated URL"),
+        ]
+        self.assertEqual(self.service._store_articles(raw), 3)
+        self.assertEqual(
+            Article.objects.get(url="https://example.com/article-0").title,
+            "Article 0",
+        )
+
+
+@override_settings(CACHES=TEST_CACHES)
+class KeysetPaginationTest(TestCase):
+    """Test ?pagination=cursor on the article list."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("news:article-list")
+        self.source = Source.objects.create(source_id="bbc-news", name="BBC News")
+        # Pairs of articles share a timestamp to exercise the id tiebreaker
+        for i in range(7):
+            Article.objects.create(
+                source=self.source,
+                title=f"Article {i}",
+                url=f"https://example.com/{i}",
+                published_at=f"2026-01-0{i // 2 + 1}T00:00:00Z",
+                country="gb" if i % 3 else "us",
+            )
+        self.newest_first = list(
+            Article.objects.order_by("-published_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def walk(self, params):
+        pages, url = [], self.url
+        with mock.patch("news.pagination.KeysetPagination.page_size", 3):
+            response = self.client.get(url, params)
+            while True:
+                self.assertNotIn("count", response.data)
+                pages.append(response.data)
+                if not response.data["next"]:
+                    return pages
+                response = self.client.get(response.data["next"])
+
+    def ids(self, page):
+        return [article["id"] for article in page["results"]]
+
+    def test_walks_forward_and_back_without_gaps(self):
+        pages = self.walk({"pagination": "cursor"})
+        self.assertEqual(
+            [pk for page in pages for pk in self.ids(page)], self.newest_first
+        )
+        self.assertIsNone(pages[0]["previous"])
+
+        with mock.patch("news.pagination.KeysetPagination.page_size", 3):
+            back = self.client.get(pages[2]["previous"]).data
+        self.assertEqual(self.ids(back), self.ids(pages[1]))
+        self.assertIsNotNone(back["next"])
+
+    def test_cursor_keeps_filters(self):
+        pages = self.walk({"pagination": "cursor", "country": "GB"})
+        expected = list(
+            Article.objects.filter(country="gb")
+            .order_by("-published_at", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual([pk for page in pages for pk in self.ids(page)], expected)
+        self.assertIn("country=GB", pages[0]["next"])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, NEWS_COUNT_EXACT_THRESHOLD=1000)
+class CountStrategyTest(TestCase):
+    """Test exact, estimated and cached totals on the article list."""
+
+    def setUp(self):
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.url = reverse("news:article-list")
+        for i in range(3):
+            Article.objects.create(
+                title=f"Article {i}",
+                url=f"https://example.com/{i}",
+                published_at="2026-01-01T00:00:00Z",
+                country="us",
+            )
+
+    def test_small_results_are_counted_exactly(self):
+        with mock.patch("news.counts.estimate_count", return_value=5):
+            response = self.client.get(self.url, {"country": "us"})
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(response.data["count_type"], "exact")
+
+    def test_large_results_use_the_planner_estimate(self):
+        with mock.patch("news.counts.estimate_count", return_value=250000):
+            with mock.patch.object(ArticlePagination, "page_size", 2):
+                first = self.client.get(self.url, {"country": "us"})
+                second = self.client.get(first.data["next"])
+                beyond = self.client.get(self.url, {"country": "us", "page": 9})
+
+        self.assertEqual(first.data["count"], 250000)
+        self.assertEqual(first.data["count_type"], "estimated")
+        self.assertEqual(len(second.data["results"]), 1)
+        self.assertIsNone(second.data["next"])
+        self.assertEqual(beyond.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_refresh_replaces_cached_estimates_with_exact_counts(self):
+        with mock.patch("news.counts.estimate_count", return_value=250000):
+            self.client.get(self.url, {"country": "us"})
+            with self.captureOnCommitCallbacks(execute=True):
+                Article.objects.create(
+                    title="Late",
+                    url="https://example.com/late",
+                    published_at="2026-01-02T00:00:00Z",
+                    country="us",
+                )
+            self.assertEqual(refresh_counts(), 1)
+            response = self.client.get(self.url, {"country": "us"})
+
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(response.data["count_type"], "exact")
+
+    def test_deletes_retire_cached_counts(self):
+        self.assertEqual(self.client.get(self.url).data["count"], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.filter(title="Article 0").delete()
+        self.assertEqual(self.client.get(self.url).data["count"], 2)
+
+    def test_refresh_rebuilds_queries_from_their_filters(self):
+        self.client.get(self.url, {"country": "US", "search": " Article "})
+        registry = cache.get(counts.REGISTRY_KEY)
+        self.assertEqual(
+            list(registry.values()),
+            [{"country": "us", "search": "article", "search_mode": "fulltext"}],
+        )
+        Article.objects.filter(title="Article 0").update(country="gb")
+        self.assertEqual(refresh_counts(), 1)
+        response = self.client.get(self.url, {"country": "us", "search": "article"})
+        self.assertEqual(response.data["count"], 2)
+
+    def test_refined_counts_change_the_etag(self):
+        with mock.patch("news.counts.estimate_count", return_value=250000):
+            first = self.client.get(self.url, {"country": "us"})
+        self.assertEqual(first.data["count_type"], "estimated")
+
+        refresh_counts()
+        response = self.client.get(
+            self.url, {"country": "us"}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(response.data["count_type"], "exact")
+
+
+class QueryPlanCheckTest(SimpleTestCase):
+    """Test plan rendering and checks of the query-plan harness."""
+
+    plan = {
+        "Plan": {
+            "Node Type": "Limit",
+            "Shared Hit Blocks": 12,
+            "Shared Read Blocks": 3,
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "news_article",
+                    "Index Name": "idx_published_desc",
+                    "Filter": "(upper((country)::text) = 'NZ'::text)",
+                }
+            ],
+        },
+        "Execution Time": 0.8,
+    }
+
+    def test_render_plan_has_shape_but_no_numbers(self):
+        text = render_plan(self.plan["Plan"])
+        self.assertEqual(
+            text,
+            "Limit\n"
+            "  Index Scan on news_article using idx_published_desc\n"
+            "    Filter: (upper((country)::text) = 'NZ'::text)",
+        )
+
+    def test_check_flags_missing_index_and_bounds(self):
+        case = PlanCase({"country": "nz"}, "page", 1, frozenset({"idx_country_pub"}))
+        query = QueryPlan('SELECT * FROM "news_article"', self.plan)
+        problems = check_case(case, [query], max_buffers=10, max_ms=1.0)
+        self.assertEqual(len(problems), 2)
+        self.assertIn("15 buffers > 10", problems[0])
+        self.assertIn("expected one of ['idx_country_pub']", problems[1])
+
+        self.assertEqual(len(build_cases()), 96)
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN checks need PostgreSQL")
+@override_settings(CACHES=TEST_CACHES)
+class QueryPlanRegressionTest(TestCase):
+    """Every article list filter combination uses its index (PostgreSQL)."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        seed_dataset(20000)
+
+    def test_every_filter_combination_uses_its_index(self):
+        failures = {}
+        for case in build_cases(depths=(1, 5)):
+            problems = check_case(case, run_case(case), max_buffers=5000, max_ms=500)
+            if problems:
+                failures[case.name] = problems
+        self.assertEqual(failures, {})
+
+
+def fake_response(articles):
+    """A News API response as returned by requests.Session.get."""
+    response = mock.Mock(status_code=200)
+    response.content = json.dumps(
+        {"status": "ok", "totalResults": len(articles), "articles": articles}
+    ).encode()
+    response.json.side_effect = lambda: json.loads(response.content)
+    return response
+
+
+@override_settings(CACHES=TEST_CACHES, NEWS_API_KEY="test-key")
+class IngestStatsTest(TestCase):
+    """Test ingest stage timings and counters (see metrics.py)."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        newsapi_quota.reset()
+        self.addCleanup(newsapi_quota.reset)
+        Article.objects.create(
+            url="https://example.com/old",
+            title="Old",
+            published_at="2026-01-01T00:00:00Z",
+        )
+        story = {
+            "source": {"id": "bbc-news", "name": "BBC News"},
+            "publishedAt": "2026-01-02T00:00:00Z",
+        }
+        self.articles = [
+            dict(story, url="https://example.com/new", title="Rates rise"),
+            dict(story, url="https://example.com/old", title="Old"),
+            dict(story, url="https://example.com/new", title="Rates rise again"),
+            dict(story, title="No URL"),
+            dict(story, url="https://example.com/bad", publishedAt="yesterday"),
+        ]
+        self.response = fake_response(self.articles)
+
+    def test_counts_every_article_once(self):
+        service = NewsAPIService()
+        feed = Feed.top_headlines("business", "us")
+        with mock.patch.object(service.session, "get", return_value=self.response):
+            with self.assertLogs("news.ingest") as logs:
+                self.assertEqual(service.fetch_feed(feed), 1)
+
+        stats = service.stats.feed(feed)
+        self.assertEqual(stats.counts["requests"], 1)
+        self.assertEqual(stats.counts["bytes"], len(self.response.content))
+        self.assertEqual(stats.counts["seen"], 5)
+        self.assertEqual(stats.counts["skipped_no_url"], 1)
+        self.assertEqual(stats.counts["skipped_bad_date"], 1)
+        self.assertEqual(stats.counts["duplicate"], 2)
+        self.assertEqual(stats.counts["created"], 1)
+        self.assertGreater(stats.timings["http"], 0)
+
+        record = logs.records[-1]
+        self.assertEqual(record.ingest["feed"], str(feed))
+        self.assertEqual(record.ingest["created"], 1)
+
+    def test_fetch_news_prints_summary_table(self):
+        out = StringIO()
+        with mock.patch("requests.Session.get", return_value=self.response):
+            call_command("fetch_news", "--category", "business", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("endpoint=top-headlines, category=business, country=us", output)
+        self.assertRegex(output, r"total\s+5\s+0\s+2\s+2\s+1")
+        self.assertIn("normalize", output)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class KeyResolverTest(TestCase):
+    """Test the process-wide Source resolver cache."""
+
+    def setUp(self):
+        reset_ingest_caches()
+
+    def test_resolves_existing_and_creates_unknown_sources(self):
+        bbc = Source.objects.create(source_id="bbc-news", name="BBC News")
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = source_resolver.resolve_many(
+                {"bbc-news": {"name": "BBC News"}, "cnn": {"name": "CNN"}}
+            )
+        self.assertEqual(ids["bbc-news"], bbc.pk)
+        self.assertEqual(Source.objects.get(pk=ids["cnn"]).name, "CNN")
+
+        with self.assertNumQueries(0):
+            source_resolver.resolve_many({"bbc-news": {}, "cnn": {}})
+
+    def test_delete_invalidates_entry(self):
+        source = Source.objects.create(source_id="cnn", name="CNN")
+        with self.captureOnCommitCallbacks(execute=True):
+            source_resolver.resolve("cnn")
+        source.delete()
+
+        new_pk = source_resolver.resolve("cnn", {"name": "CNN"})
+        self.assertNotEqual(new_pk, source.pk)
+        self.assertTrue(Source.objects.filter(pk=new_pk).exists())
+
+
+@override_settings(CACHES=TEST_CACHES)
+class FetchFeedsTest(TestCase):
+    """Test concurrent feed fetching in NewsAPIService.fetch_feeds."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        self.service = NewsAPIService()
+
+    def fake_fetch(self, feed, page_size=100):
+        if feed.category == "sports":
+            raise ValueError("News API error: rateLimited")
+        articles = [
+            {
+                "source": {"id": "bbc-news", "name": "BBC News"},
+                "title": f"{feed.category} story",
+                "url": f"https://example.com/{feed.category}",
+                "publishedAt": "2026-01-01T00:00:00Z",
+            }
+        ]
+        return FeedResponse(articles, fingerprint=feed.category)
+
+    def test_results_keep_feed_order_and_isolate_errors(self):
+        feeds = [
+            Feed.top_headlines(category, "us")
+            for category in ("business", "sports", "health")
+        ]
+        with mock.patch.object(self.service, "_fetch_feed", self.fake_fetch):
+            results = self.service.fetch_feeds(feeds, concurrency=3)
+
+        self.assertEqual([result.feed for result in results], feeds)
+        self.assertEqual([result.created for result in results], [1, 0, 1])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual(
+            Article.objects.get(url="https://example.com/health").category.slug,
+            "health",
+        )
+
+
+@override_settings(CACHES=TEST_CACHES)
+class IncrementalFetchTest(TestCase):
+    """Test feed high-water marks and response fingerprints."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        self.service = NewsAPIService()
+        self.feed = Feed.top_headlines("technology", "us")
+
+    def article(self, n, published_at):
+        return {
+            "source": {"id": "bbc-news", "name": "BBC News"},
+            "title": f"Story {n}",
+            "url": f"https://example.com/story-{n}",
+            "publishedAt": published_at,
+        }
+
+    def test_unchanged_response_skips_article_writes(self):
+        response = FeedResponse([self.article(1, "2026-01-01T00:00:00Z")], "abc")
+        self.assertEqual(self.service._store_feed(self.feed, response), 1)
+
+        with mock.patch.object(self.service, "_store_rows") as store:
+            self.assertEqual(self.service._store_feed(self.feed, response), 0)
+        store.assert_not_called()
+
+    def test_changed_response_only_stores_past_watermark(self):
+        first = [self.article(1, "2026-01-01T10:00:00Z")]
+        self.service._store_feed(self.feed, FeedResponse(first, "v1"))
+        state = FeedState.objects.get(endpoint="top-headlines", category="technology")
+        self.assertEqual(state.recent_urls, ["https://example.com/story-1"])
+
+        second = first + [
+            self.article(2, "2026-01-01T11:00:00Z"),
+            # Older than the watermark but never seen before
+            self.article(3, "2026-01-01T09:00:00Z"),
+        ]
+        parse_date = self.service._parse_date
+        with mock.patch.object(
+            self.service, "_store_rows", return_value=2
+        ) as store, mock.patch.object(
+            self.service, "_parse_date", side_effect=parse_date
+        ) as parse:
+            self.service._store_feed(self.feed, FeedResponse(second, "v2"))
+        # Each date is parsed once, by normalization
+        self.assertEqual(parse.call_count, len(second))
+        stored_urls = [row["url"] for row in store.call_args.args[0]]
+        self.assertEqual(
+            stored_urls,
+            ["https://example.com/story-2", "https://example.com/story-3"],
+        )
+        state.refresh_from_db()
+        self.assertEqual(state.last_published_at.hour, 11)
+        self.assertEqual(state.response_hash, "v2")
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StreamEverythingTest(TestCase):
+    """Test paginated streaming in NewsAPIService.fetch_everything."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        self.service = NewsAPIService()
+        self.requested_pages = []
+
+    def fake_fetch(self, feed, page_size=100, sort_by="publishedAt", page=1):
+        self.requested_pages.append(page)
+        articles = [
+            {
+                "source": {"id": "bbc-news", "name": "BBC News"},
+                "title": f"Result {page}-{i}",
+                "url": f"https://example.com/{page}/{i}",
+                "publishedAt": f"2026-01-{10 - page:02d}T00:00:00Z",
+            }
+            for i in range(page_size)
+        ]
+        return FeedResponse(articles, f"page-{page}", total_results=5 * page_size)
+
+    def test_streams_all_pages_up_to_limit(self):
+        with mock.patch.object(self.service, "_fetch_feed", self.fake_fetch):
+            created = self.service.fetch_everything(
+                "ai", page_size=2, max_pages=4
+            )
+        self.assertEqual(created, 8)
+        self.assertEqual(self.requested_pages[:4], [1, 2, 3, 4])
+        state = FeedState.objects.get(endpoint="everything", query="ai")
+        self.assertEqual(state.last_published_at.day, 9)
+
+    def test_stops_at_watermark(self):
+        with mock.patch.object(self.service, "_fetch_feed", self.fake_fetch):
+            self.service.fetch_everything("ai", page_size=2, max_pages=2)
+            self.requested_pages.clear()
+            created = self.service.fetch_everything(
+                "ai", page_size=2, max_pages=5
+            )
+        self.assertEqual(created, 0)
+        self.assertEqual(self.requested_pages[0], 1)
+        self.assertLess(len(self.requested_pages), 5)
+
+    def test_prefetch_propagates_errors(self):
+        def pages():
+            yield 1
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            list(_prefetch(pages(), depth=1))
+
+    def test_prefetch_propagates_base_exceptions(self):
+        class Abort(BaseException):
+            pass
+
+        def pages():
+            yield 1
+            raise Abort()
+
+        with self.assertRaises(Abort):
+            list(_prefetch(pages(), depth=1))
+
+
+class ImportArticlesTest(SimpleTestCase):
+    """Test the NDJSON reader behind the import_articles command."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.paths = [
+            os.path.join(tmp.name, "a.ndjson"),
+            os.path.join(tmp.name, "b.ndjson.gz"),
+        ]
+        with open(self.paths[0], "w") as handle:
+            handle.write(json.dumps({"url": "https://example.com/1"}) + "\n")
+            handle.write("not json\n")
+        with gzip.open(self.paths[1], "wt") as handle:
+            handle.write(json.dumps({"url": "https://example.com/3"}) + "\n")
+
+    def test_offsets_span_files_and_resume(self):
+        records = list(iter_records(self.paths))
+        self.assertEqual([offset for offset, _ in records], [1, 2, 3])
+        self.assertEqual(records[1][1], {})
+        self.assertEqual(
+            list(iter_records(self.paths, offset=2)),
+            [(3, {"url": "https://example.com/3"})],
+        )
+
+    def test_requires_postgresql(self):
+        if connection.vendor == "postgresql":
+            self.skipTest("Only relevant on non-PostgreSQL databases.")
+        with self.assertRaises(CommandError):
+            call_command("import_articles", self.paths[0])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class NearDuplicateTest(TestCase):
+    """Test SimHash clustering of near-duplicate stories at ingest."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        self.service = NewsAPIService()
+        title = "Central bank raises rates by half a point to fight inflation"
+        self.raw = [
+            {
+                "source": {"id": source, "name": source},
+                "title": title + suffix,
+                "description": "Policy makers voted to lift borrowing costs again.",
+                "url": f"https://{source}.example.com/rates",
+                "publishedAt": "2026-01-01T00:00:00Z",
+            }
+            for source, suffix in (
+                ("reuters", ""),
+                ("ap", " - AP"),
+                ("cnn", " | CNN News"),
+            )
+        ]
+        self.raw.append(
+            {
+                "source": {"id": "espn", "name": "ESPN"},
+                "title": "Local team wins championship after overtime thriller",
+                "url": "https://espn.example.com/final",
+                "publishedAt": "2026-01-01T00:00:00Z",
+            }
+        )
+
+    def test_simhash_is_close_for_near_duplicates(self):
+        a, b, c, other = (
+            story_simhash(raw["title"], raw.get("description"))
+            for raw in self.raw
+        )
+        self.assertLessEqual(hamming(a, b), 3)
+        self.assertLessEqual(hamming(a, c), 3)
+        self.assertGreater(hamming(a, other), 3)
+
+    def test_copies_share_cluster_and_collapse(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.service._store_articles(self.raw), 4)
+        clusters = set(
+            Article.objects.filter(url__contains="/rates").values_list(
+                "cluster_id", flat=True
+            )
+        )
+        self.assertEqual(len(clusters), 1)
+
+        response = APIClient().get(
+            reverse("news:article-list"), {"collapse": "true"}
+        )
+        self.assertEqual(response.data["count"], 2)
+
+    @override_settings(NEWS_DEDUP_POLICY="skip")
+    def test_skip_policy_drops_copies(self):
+        self.assertEqual(self.service._store_articles(self.raw), 2)
+
+    def test_matches_rows_committed_by_other_workers(self):
+        dedup_index.warm()
+        # Stored by another worker process, whose index this one never sees
+        first = self.raw[0]
+        value = story_simhash(first["title"], first["description"])
+        Article.objects.create(
+            title=first["title"],
+            url=first["url"],
+            published_at=first["publishedAt"],
+            simhash=value,
+            cluster_id=value,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service._store_articles(self.raw[1:2])
+        copy = Article.objects.get(url=self.raw[1]["url"])
+        self.assertTrue(copy.is_duplicate)
+        self.assertEqual(copy.cluster_id, value)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_imported_copies_are_clustered(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "archive.ndjson")
+        with open(path, "w") as handle:
+            handle.writelines(json.dumps(raw) + "\n" for raw in self.raw)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_articles", path, stdout=StringIO())
+
+        copies = Article.objects.filter(url__contains="/rates")
+        self.assertEqual(len(set(copies.values_list("cluster_id", flat=True))), 1)
+        self.assertEqual(copies.filter(is_duplicate=True).count(), 2)
+
+
+class FetchFeedTaskTest(SimpleTestCase):
+    """Test the per-feed Celery subtask and the run summary."""
+
+    def test_failing_feed_reports_error_after_retries(self):
+        with mock.patch.object(
+            NewsAPIService, "fetch_feed", side_effect=ValueError("rateLimited")
+        ) as fetch:
+            result = fetch_feed.apply(args=("top-headlines", "sports", "us")).get()
+        self.assertEqual(fetch.call_count, 4)
+        self.assertEqual(result["created"], 0)
+        self.assertEqual(result["error"], "rateLimited")
+
+    def test_summary_totals(self):
+        with mock.patch("news.tasks.snapshots.publish") as publish:
+            summary = summarize_fetch_run(
+                [
+                    {"feed": "business", "created": 3, "error": None},
+                    {"feed": "sports", "created": 0, "error": "rateLimited"},
+                    {"feed": "health", "created": 2, "error": None},
+                ]
+            )
+        self.assertEqual(summary["total"], 5)
+        self.assertEqual(summary["feeds"], 3)
+        self.assertEqual(summary["failed"], ["sports"])
+        publish.assert_called_once_with()
+
+
+@override_settings(
+    CACHES=TEST_CACHES,
+    NEWS_API_KEY="test-key",
+    NEWS_API_QUOTA_REQUESTS=10,
+    NEWS_API_QUOTA_MAX_WAIT={"scheduled": 0, "manual": 0},
+)
+class QuotaBudgetTest(TestCase):
+    """Test the shared News API request budget."""
+
+    def setUp(self):
+        newsapi_quota.reset()
+        self.addCleanup(newsapi_quota.reset)
+
+    def test_manual_requests_leave_reserve_for_scheduled(self):
+        for _ in range(8):
+            newsapi_quota.acquire("manual")
+        with self.assertRaises(QuotaExceeded):
+            newsapi_quota.acquire("manual")
+
+        newsapi_quota.acquire("scheduled")
+        newsapi_quota.acquire("scheduled")
+        with self.assertRaises(QuotaExceeded):
+            newsapi_quota.acquire("scheduled")
+
+    def test_quota_view_reports_available_budget(self):
+        newsapi_quota.drain()
+        response = APIClient().get(reverse("news:quota"))
+        self.assertEqual(response.data["available"]["manual"], 0)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    NEWS_API_KEY="test-key",
+    NEWS_API_QUOTA_MAX_WAIT={"scheduled": 0, "manual": 0},
+)
+class FetchJobTest(CachedAPITestMixin, TestCase):
+    """Test asynchronous manual fetches."""
+
+    def setUp(self):
+        super().setUp()
+        newsapi_quota.reset()
+        self.addCleanup(newsapi_quota.reset)
+        patcher = mock.patch("news.views.run_fetch_job.apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_post_returns_job_handle(self):
+        response = self.client.post(reverse("news:fetch-news"), {})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["state"], jobs.QUEUED)
+        self.assertFalse(response.data["coalesced"])
+        self.assertEqual(
+            response["Location"], f"/api/news/fetch/{response.data['job_id']}/"
+        )
+        self.apply_async.assert_called_once_with(
+            args=[response.data["job_id"]], task_id=response.data["job_id"]
+        )
+
+    def test_identical_requests_share_in_flight_job(self):
+        first = self.client.post(reverse("news:fetch-news"), {"category": "sports"})
+        second = self.client.post(reverse("news:fetch-news"), {"category": "sports"})
+        other = self.client.post(reverse("news:fetch-news"), {"category": "health"})
+
+        self.assertEqual(first.data["job_id"], second.data["job_id"])
+        self.assertTrue(second.data["coalesced"])
+        self.assertNotEqual(first.data["job_id"], other.data["job_id"])
+        self.assertEqual(self.apply_async.call_count, 2)
+
+        jobs.finish_job(jobs.get_job(first.data["job_id"]), jobs.SUCCEEDED)
+        third = self.client.post(reverse("news:fetch-news"), {"category": "sports"})
+        self.assertNotEqual(first.data["job_id"], third.data["job_id"])
+
+    def test_feed_parameters_are_normalized_and_validated(self):
+        url = reverse("news:fetch-news")
+        first = self.client.post(url, {"category": "Sports", "country": "US"})
+        second = self.client.post(url, {"category": "sports", "country": " us"})
+        self.assertEqual(first.data["job_id"], second.data["job_id"])
+        self.assertEqual(
+            jobs.get_job(first.data["job_id"])["feeds"][0]["feed"]["country"], "us"
+        )
+
+        for body in ({"category": "weather"}, {"country": "usa"}):
+            response = self.client.post(url, body)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(body)), response.data)
+        self.assertEqual(self.apply_async.call_count, 1)
+
+    def test_claim_is_published_after_the_job_record(self):
+        feeds = [Feed.top_headlines("sports", "us")]
+        add = jobs.cache.add
+
+        def claim(key, job_id, **kwargs):
+            # Whoever sees the claim must be able to read the job
+            self.assertIsNotNone(jobs.get_job(job_id))
+            return add(key, job_id, **kwargs)
+
+        with mock.patch.object(jobs.cache, "add", side_effect=claim):
+            job, created = jobs.create_job(feeds)
+        self.assertTrue(created)
+
+        # A claim whose record cannot be read is not taken over
+        cache.set(job["inflight_key"], "unknown")
+        coalesced, created = jobs.create_job(feeds)
+        self.assertFalse(created)
+        self.assertEqual(coalesced["id"], "unknown")
+        self.assertEqual(cache.get(job["inflight_key"]), "unknown")
+
+    def test_run_fetch_job_records_per_feed_results(self):
+        response = self.client.post(
+            reverse("news:fetch-news"), {"category": "business", "query": "ai"}
+        )
+        job_id = response.data["job_id"]
+
+        with mock.patch.object(NewsAPIService, "fetch_feed", side_effect=[4, 1]):
+            self.assertEqual(run_fetch_job(job_id), 5)
+
+        status_response = self.client.get(
+            reverse("news:fetch-job", kwargs={"job_id": job_id})
+        )
+        self.assertEqual(status_response.data["state"], jobs.SUCCEEDED)
+        self.assertEqual(status_response.data["total"], 5)
+        self.assertEqual(
+            [entry["created"] for entry in status_response.data["feeds"]], [4, 1]
+        )
+        self.assertNotIn("inflight_key", status_response.data)
+
+    def test_job_fails_when_quota_is_spent(self):
+        newsapi_quota.drain()
+        job_id = self.client.post(reverse("news:fetch-news"), {}).data["job_id"]
+
+        run_fetch_job(job_id)
+
+        job = jobs.get_job(job_id)
+        self.assertEqual(job["state"], jobs.FAILED)
+        self.assertIn("quota exhausted", job["feeds"][0]["error"])
+
+    def test_unknown_job_returns_404(self):
+        response = self.client.get(
+            reverse("news:fetch-job", kwargs={"job_id": "missing"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ResponseCacheTest(CachedAPITestMixin, TestCase):
+    """Test generation-versioned caching of the list endpoints."""
+
+    def setUp(self):
+        super().setUp()
+        for category in ("sports", "health"):
+            self.ingest(category, 0)
+
+    def titles(self, **params):
+        response = self.client.get(reverse("news:article-list"), params)
+        return [article["title"] for article in response.json()["results"]]
+
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.client.get(reverse("news:article-list"), {"category": "sports"})
+        with self.assertNumQueries(0):
+            second = self.client.get(
+                reverse("news:article-list"), {"category": "sports"}
+            )
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second["Content-Type"], "application/json")
+
+    def test_ingest_refreshes_only_touched_slices(self):
+        self.titles()
+        self.titles(category="sports")
+        self.titles(category="health")
+        self.client.get(reverse("news:category-list"))
+
+        self.assertEqual(self.ingest("sports", 1), 1)
+
+        self.assertEqual(self.titles(category="sports"), ["sports 1", "sports 0"])
+        self.assertEqual(len(self.titles()), 3)
+        self.assertEqual(self.titles(country="US")[0], "sports 1")
+        with self.assertNumQueries(0):
+            self.titles(category="health")
+        counts = {
+            row["slug"]: row["article_count"]
+            for row in self.client.get(reverse("news:category-list")).json()
+        }
+        self.assertEqual(counts["sports"], 2)
+
+    def test_batches_without_new_rows_keep_cache(self):
+        self.titles(category="sports")
+        self.assertEqual(self.ingest("sports", 0), 0)
+        with self.assertNumQueries(0):
+            self.titles(category="sports")
+
+    def test_admin_edit_invalidates_every_response(self):
+        self.titles(category="health")
+        article = Article.objects.get(title="health 0")
+        article.title = "Edited"
+        with self.captureOnCommitCallbacks(execute=True):
+            article.save()
+        self.assertEqual(self.titles(category="health"), ["Edited"])
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    NEWS_RESPONSE_CACHE_SOFT_TTL=0,
+    NEWS_RESPONSE_REBUILD="background",
+)
+class StaleWhileRevalidateTest(CachedAPITestMixin, TestCase):
+    """Test stale serving and single-flight rebuilds of list responses."""
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name="Sports", slug="sports")
+        # Every stale hit queues a rebuild; none may reach a real broker
+        patcher = mock.patch("news.tasks.rebuild_list_response.delay")
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self):
+        return self.client.get(reverse("news:category-list"))
+
+    def rename(self, name):
+        # A queryset update sends no signals, so the generation is unchanged
+        Category.objects.filter(pk=self.category.pk).update(name=name)
+
+    def test_stale_entry_is_served_while_one_task_rebuilds(self):
+        self.assertEqual(self.get()["X-Cache"], "MISS")
+        self.rename("Football")
+
+        stale = self.get()
+        again = self.get()
+        self.assertEqual(stale["X-Cache"], "STALE")
+        self.assertEqual(stale.json()[0]["name"], "Sports")
+        self.assertEqual(again.json()[0]["name"], "Sports")
+        self.delay.assert_called_once()
+
+        self.assertEqual(rebuild_list_response(*self.delay.call_args.args), 200)
+        self.assertEqual(self.get().json()[0]["name"], "Football")
+        self.assertEqual(
+            self.client.get(reverse("news:cache-stats")).json()["categories"],
+            {"hit": 0, "stale": 3, "miss": 1, "snapshot": 0},
+        )
+
+    def test_rebuild_is_not_throttled(self):
+        self.get()
+        self.rename("Football")
+        self.get()
+        # The client has used up its budget; the worker must not share it
+        with mock.patch.dict(AnonRateThrottle.THROTTLE_RATES, {"anon": "1/minute"}):
+            self.assertEqual(self.get().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            status_code = rebuild_list_response(*self.delay.call_args.args)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(self.get().json()[0]["name"], "Football")
+
+    @override_settings(NEWS_RESPONSE_REBUILD="inline")
+    def test_inline_rebuild_by_lock_holder(self):
+        self.get()
+        self.rename("Football")
+
+        rebuilt = self.get()
+        self.assertEqual(rebuilt["X-Cache"], "MISS")
+        self.assertEqual(rebuilt.json()[0]["name"], "Football")
+        self.assertEqual(self.get().json()[0]["name"], "Football")
+
+    @override_settings(NEWS_RESPONSE_CACHE_SOFT_TTL=60)
+    def test_miss_waits_for_concurrent_build(self):
+        key = "news:response:test"
+        entry = {"content": b"[]", "content_type": "application/json"}
+        cache.add(f"{key}:lock", 1)  # another request is building it
+
+        def other_request_finishes(seconds):
+            cache.set(key, dict(entry, fresh_until=time.time() + 60))
+
+        with mock.patch.object(
+            CategoryListView, "get_response_cache_key", return_value=key
+        ), mock.patch("news.caching.time.sleep", side_effect=other_request_finishes):
+            with self.assertNumQueries(0):
+                response = self.get()
+        self.assertEqual(response.content, b"[]")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class NormalizedCacheKeyTest(CachedAPITestMixin, TestCase):
+    """Test that equivalent article list requests share one cache entry."""
+
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name="Sports", slug="sports")
+        Article.objects.create(
+            category=category,
+            title="Glacier final",
+            url="https://example.com/glacier",
+            country="us",
+            published_at="2026-01-01T00:00:00Z",
+        )
+
+    def assert_shared(self, *queries):
+        url = reverse("news:article-list")
+        first = self.client.get(f"{url}?{queries[0]}")
+        self.assertEqual(first["X-Cache"], "MISS")
+        for query in queries[1:]:
+            with self.assertNumQueries(0):
+                response = self.client.get(f"{url}?{query}")
+            self.assertEqual(response["X-Cache"], "HIT", query)
+            self.assertEqual(response.json()["results"], first.json()["results"])
+
+    def test_parameter_order_default_page_and_unknown_parameters(self):
+        self.assert_shared(
+            "category=sports&page=1",
+            "page=1&category=sports",
+            "category=sports",
+            "category=sports&utm_source=mail&country=",
+        )
+
+    def test_country_and_search_case(self):
+        self.assert_shared("country=US", "country=us")
+        self.assert_shared("search=glacier", "search=%20GLACIER%20")
+
+    def test_search_is_not_case_folded(self):
+        with mock.patch("news.views.search_articles", wraps=search_articles) as spy:
+            self.client.get(reverse("news:article-list"), {"search": " Straße "})
+            self.client.get(reverse("news:article-list"), {"search": "STRASSE"})
+        searched = [call.args[1] for call in spy.call_args_list]
+        self.assertEqual(searched, ["Straße", "STRASSE"])
+
+    def test_per_key_statistics(self):
+        self.assert_shared("page=1&category=sports", "category=sports")
+        self.client.get(reverse("news:article-list"), {"page": 2})
+
+        rows = self.client.get(reverse("news:cache-key-stats")).json()
+        self.assertEqual(
+            rows[0],
+            {
+                "endpoint": "articles",
+                "query": "category=sports&page=1",
+                "hit": 1,
+                "stale": 0,
+                "miss": 1,
+                "snapshot": 0,
+            },
+        )
+        self.assertEqual(rows[1]["query"], "page=2")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ArticleDetailCacheTest(CachedAPITestMixin, TestCase):
+    """Test the read-through article detail cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.source = Source.objects.create(source_id="wire", name="Wire")
+        self.articles = [
+            Article.objects.create(
+                source=self.source,
+                title=f"Article {i}",
+                url=f"https://example.com/{i}",
+                content="Body " * 100,
+                published_at="2026-01-01T00:00:00Z",
+            )
+            for i in range(3)
+        ]
+
+    def detail(self, article):
+        return self.client.get(
+            reverse("news:article-detail", kwargs={"pk": article.pk})
+        )
+
+    def test_detail_is_read_through(self):
+        first = self.detail(self.articles[0])
+        with self.assertNumQueries(0):
+            second = self.detail(self.articles[0])
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(second.json()["source_detail"]["name"], "Wire")
+
+    def test_entries_of_the_old_shape_are_not_read(self):
+        pk = self.articles[0].pk
+        cache.set(f"news:article:0:{pk}", {"id": pk, "title": "Old shape"})
+        response = self.detail(self.articles[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Article 0")
+
+    def test_unknown_article_returns_404(self):
+        response = self.client.get(reverse("news:article-detail", kwargs={"pk": 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_saves_invalidate_only_their_row(self):
+        self.detail(self.articles[0])
+        self.detail(self.articles[1])
+        self.articles[0].title = "Edited"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.articles[0].save()
+
+        self.assertEqual(self.detail(self.articles[0]).json()["title"], "Edited")
+        with self.assertNumQueries(0):
+            self.detail(self.articles[1])
+
+        self.source.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.source.save()
+        payload = self.detail(self.articles[1]).json()
+        self.assertEqual(payload["source_detail"]["name"], "Renamed")
+
+    def test_ingest_of_known_urls_keeps_entries(self):
+        self.detail(self.articles[0])
+        raw = [raw_article("Changed upstream", "0")]
+        self.assertEqual(self.store(raw), 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.detail(self.articles[0]).json()["title"], "Article 0")
+
+    def test_batch_multi_get(self):
+        self.detail(self.articles[1])
+        ids = [self.articles[2].pk, 999, self.articles[1].pk, self.articles[0].pk]
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("news:article-batch"), {"ids": ",".join(map(str, ids))}
+            )
+        self.assertEqual(
+            [article["id"] for article in response.json()["results"]],
+            [self.articles[2].pk, self.articles[1].pk, self.articles[0].pk],
+        )
+        self.assertEqual(response.json()["missing"], [999])
+
+        bad = self.client.get(reverse("news:article-batch"), {"ids": "1,x"})
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ArticleListFastPathTest(TestCase):
+    """Test that the serializer-free list path matches the DRF output."""
+
+    def setUp(self):
+        reset_ingest_caches()
+        category = Category.objects.create(name="Wörld", slug="world")
+        Article.objects.create(
+            category=category,
+            title="Line\u2028separator \"quoted\" ✓",
+            description="Tab\there\nnewline \x01 control",
+            url="https://example.com/a",
+            published_at="2026-01-01T10:00:00.123456Z",
+            country="de",
+        )
+        Article.objects.create(
+            title="No category 😀",
+            url="https://example.com/b",
+            published_at="2026-01-01T09:00:00Z",
+        )
+
+    def test_fast_path_is_byte_compatible(self):
+        queryset = Article.objects.order_by("-published_at")
+        expected = JSONRenderer().render(
+            ArticleListSerializer(queryset, many=True).data
+        )
+        actual = FastJSONRenderer().render(
+            article_list_data(article_list_rows(queryset))
+        )
+        self.assertEqual(actual, expected)
+
+    def test_list_response_uses_fast_path(self):
+        response = APIClient().get(reverse("news:article-list"))
+        expected = ArticleListSerializer(
+            Article.objects.order_by("-published_at"), many=True
+        ).data
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render(
+                {
+                    "count": 2,
+                    "count_type": "exact",
+                    "next": None,
+                    "previous": None,
+                    "results": expected,
+                }
+            ),
+        )
+
+    def test_cursor_links_from_named_rows(self):
+        with mock.patch.object(KeysetPagination, "page_size", 1):
+            first = APIClient().get(
+                reverse("news:article-list"), {"pagination": "cursor"}
+            )
+            second = APIClient().get(first.json()["next"])
+        self.assertEqual(second.json()["results"][0]["title"], "No category 😀")
+
+    def test_data_orjson_rejects_falls_back_to_json_renderer(self):
+        data = {1: "one", "big": 2**70}
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_fast_path_only_on_list_views(self):
+        self.assertIs(ArticleListView.renderer_classes[0], FastJSONRenderer)
+        self.assertIs(ArticleDetailView.renderer_classes[0], JSONRenderer)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    NEWS_API_COUNTRIES=["us", "gb"],
+    NEWS_SNAPSHOT_ORIGIN="http://testserver",
+    NEWS_SNAPSHOT_PAGES=2,
+)
+class SnapshotTest(CachedAPITestMixin, TestCase):
+    """Test first-page snapshots published at the end of ingest."""
+
+    def setUp(self):
+        super().setUp()
+        self.ingest("sports", 0)
+        self.ingest("health", 0, country="gb")
+
+    def test_snapshots_are_served_without_queries(self):
+        self.assertEqual(snapshots.publish(), {"rendered": 5, "skipped": 0})
+
+        url = reverse("news:article-list")
+        expected = self.client.get(url, {"category": "sports", "page": 2})
+        self.assertEqual(expected.status_code, status.HTTP_404_NOT_FOUND)
+        with self.assertNumQueries(0):
+            plain = self.client.get(url, {"category": "sports"})
+            compressed = self.client.get(
+                url, {"country": "GB"}, HTTP_ACCEPT_ENCODING="gzip, br;q=0.5"
+            )
+        self.assertEqual(plain["X-Cache"], "SNAPSHOT")
+        self.assertEqual(plain.json()["results"][0]["title"], "sports 0")
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(
+            json.loads(gzip.decompress(compressed.content))["results"][0]["title"],
+            "health 0",
+        )
+
+    def test_publish_is_incremental_and_stale_snapshots_are_bypassed(self):
+        snapshots.publish()
+        self.ingest("sports", 1)
+
+        # Not yet republished: the normal path serves the new article
+        response = self.client.get(reverse("news:article-list"))
+        self.assertNotEqual(response["X-Cache"], "SNAPSHOT")
+        self.assertEqual(response.json()["results"][0]["title"], "sports 1")
+
+        # Global, sports and us moved; health and gb did not
+        self.assertEqual(snapshots.publish(), {"rendered": 3, "skipped": 2})
+        self.assertEqual(
+            self.client.get(reverse("news:article-list"))["X-Cache"], "SNAPSHOT"
+        )
+
+    @override_settings(NEWS_SNAPSHOT_ORIGIN="https://news.example.com")
+    def test_other_origins_take_the_normal_path(self):
+        snapshots.publish()
+        response = self.client.get(reverse("news:article-list"))
+        self.assertEqual(response["X-Cache"], "MISS")
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    NEWS_API_COUNTRIES=["us"],
+    NEWS_SNAPSHOT_ORIGIN="http://testserver",
+)
+class ConditionalGetTest(CachedAPITestMixin, TestCase):
+    """Test ETag / Last-Modified validators and 304 responses."""
+
+    def setUp(self):
+        super().setUp()
+        self.ingest("sports", 0)
+        self.ingest("health", 0)
+
+    def test_list_revalidation_needs_no_query(self):
+        url = reverse("news:article-list")
+        first = self.client.get(url, {"category": "health"})
+        self.assertTrue(first["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(0):
+            by_etag = self.client.get(
+                url, {"category": "health"}, HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+            by_date = self.client.get(
+                url,
+                {"category": "health"},
+                HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+            )
+        self.assertEqual(by_etag.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(by_etag["ETag"], first["ETag"])
+        self.assertEqual(by_date.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # New articles elsewhere keep the ETag; in the slice they change it
+        self.ingest("sports", 1)
+        again = self.client.get(
+            url, {"category": "health"}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.ingest("health", 1)
+        changed = self.client.get(
+            url, {"category": "health"}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_compressed_snapshot_etag_revalidates(self):
+        snapshots.publish()
+        url = reverse("news:article-list")
+        plain = self.client.get(url)
+        compressed = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(compressed["ETag"], plain["ETag"][:-1] + '-gzip"')
+
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=compressed["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_revalidation(self):
+        article = Article.objects.get(title="sports 0")
+        url = reverse("news:article-detail", kwargs={"pk": article.pk})
+        first = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        article.title = "Edited"
+        with self.captureOnCommitCallbacks(execute=True):
+            article.save()
+        edited = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(edited.status_code, status.HTTP_200_OK)
+        self.assertEqual(edited.json()["title"], "Edited")
+
+    def test_detail_last_modified_follows_category_edits(self):
+        article = Article.objects.get(title="sports 0")
+        url = reverse("news:article-detail", kwargs={"pk": article.pk})
+        first = self.client.get(url)
+
+        category = article.category
+        category.name = "Sport"
+        later = time.time() + 3600
+        with mock.patch("news.caching.time.time", return_value=later):
+            with self.captureOnCommitCallbacks(execute=True):
+                category.save()
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Last-Modified"], http_date(int(later)))
+        self.assertEqual(response.json()["category_name"], "Sport")
+
+
+@override_settings(CACHES=LOCMEM_CACHES, NEWS_COMPRESSION_MIN_BYTES=100)
+class SparseFieldsTest(CachedAPITestMixin, TestCase):
+    """Test ?fields= on the article endpoints and response compression."""
+
+    def setUp(self):
+        super().setUp()
+        self.article = Article.objects.create(
+            title="Sparse",
+            description="Not asked for " * 20,
+            url="https://example.com/sparse",
+            published_at="2026-01-01T10:00:00Z",
+        )
+
+    def test_list_reads_and_returns_only_requested_fields(self):
+        url = reverse("news:article-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "title, published_at"})
+        self.assertEqual(
+            list(response.json()["results"][0]), ["title", "published_at"]
+        )
+        page_sql = queries.captured_queries[-1]["sql"]
+        self.assertIn("published_at", page_sql)
+        self.assertNotIn("description", page_sql)
+
+        unknown = self.client.get(url, {"fields": "title,content"})
+        self.assertEqual(unknown.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("content", unknown.json()["fields"])
+
+    def test_field_sets_are_part_of_the_cache_key(self):
+        url = reverse("news:article-list")
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        sparse = self.client.get(url, {"fields": "title,id"})
+        self.assertEqual(sparse["X-Cache"], "MISS")
+        reordered = self.client.get(url, {"fields": "id,title,"})
+        self.assertEqual(reordered["X-Cache"], "HIT")
+        self.assertEqual(reordered.content, sparse.content)
+
+    def test_detail_fields(self):
+        url = reverse("news:article-detail", kwargs={"pk": self.article.pk})
+        full = self.client.get(url)
+        sparse = self.client.get(url, {"fields": "title,id"})
+        self.assertEqual(sparse.json(), {"id": self.article.pk, "title": "Sparse"})
+        self.assertNotEqual(sparse["ETag"], full["ETag"])
+
+    def test_detail_field_sets_revalidate(self):
+        url = reverse("news:article-detail", kwargs={"pk": self.article.pk})
+        for fields, encoding in (("id,title", ""), ("id,description", "gzip")):
+            first = self.client.get(
+                url, {"fields": fields}, HTTP_ACCEPT_ENCODING=encoding
+            )
+            self.assertEqual(first.get("Content-Encoding"), encoding or None)
+            response = self.client.get(
+                url,
+                {"fields": fields},
+                HTTP_ACCEPT_ENCODING=encoding,
+                HTTP_IF_NONE_MATCH=first["ETag"],
+            )
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_responses_are_compressed_above_the_threshold(self):
+        url = reverse("news:article-list")
+        plain = self.client.get(url)
+        hit = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        miss = self.client.get(url, {"collapse": 1}, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertIn("Accept-Encoding", plain["Vary"])
+        self.assertEqual(hit["X-Cache"], "HIT")
+        self.assertEqual(hit["ETag"], plain["ETag"][:-1] + '-gzip"')
+        self.assertEqual(miss["X-Cache"], "MISS")
+        self.assertTrue(miss["ETag"].endswith('-gzip"'))
+        for response in (hit, miss):
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertEqual(gzip.decompress(response.content), plain.content)
+
+        small = self.client.get(
+            url, {"fields": "id"}, HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertNotIn("Content-Encoding", small)
+
+    def test_negotiation(self):
+        def pick(accept):
+            request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept)
+            return negotiate(request, ["br", "gzip"])
+
+        self.assertEqual(pick("gzip, br"), "br")
+        self.assertEqual(pick("gzip;q=1.0, br;q=0.5"), "gzip")
+        self.assertEqual(pick("*;q=0.1, br;q=0"), "gzip")
+        self.assertIsNone(pick("identity"))
+        self.assertIsNone(pick(""))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ArticleCounterTest(CachedAPITestMixin, TestCase):
+    """Test the maintained category and source article counts."""
+
+    def ingest_paths(self, category, *paths):
+        raw = [raw_article(path, path) for path in paths]
+        return self.store(raw, category=category)
+
+    def counts(self):
+        return {
+            **dict(Category.objects.values_list("slug", "article_count")),
+            **dict(Source.objects.values_list("source_id", "article_count")),
+        }
+
+    def test_ingest_and_edits_keep_counts(self):
+        self.ingest_paths("sports", "a", "b")
+        self.ingest_paths("sports", "b", "c")
+        self.ingest_paths("health", "d")
+        self.assertEqual(self.counts(), {"sports": 3, "health": 1, "wire": 4})
+
+        article = Article.objects.get(title="a")
+        article.category = Category.objects.get(slug="health")
+        article.save()
+        Article.objects.filter(title="d").delete()
+        self.assertEqual(self.counts(), {"sports": 2, "health": 1, "wire": 3})
+        self.assertEqual(reconcile(), 0)
+
+    def test_reconcile_repairs_drift(self):
+        self.ingest_paths("sports", "a", "b")
+        Category.objects.update(article_count=7)
+        Source.objects.update(article_count=0)
+        self.assertEqual(reconcile(), 2)
+        self.assertEqual(self.counts(), {"sports": 2, "wire": 2})
+
+    def test_lists_read_counters_without_aggregating(self):
+        self.ingest_paths("sports", "a")
+        with CaptureQueriesContext(connection) as queries:
+            categories = self.client.get(reverse("news:category-list")).json()
+        self.assertEqual(categories[0]["article_count"], 1)
+        self.assertNotIn("COUNT(", queries.captured_queries[-1]["sql"])
+
+    def test_counts_are_only_on_the_source_list(self):
+        self.ingest_paths("sports", "a")
+        url = reverse("news:article-detail", kwargs={"pk": Article.objects.get().pk})
+        self.assertNotIn("article_count", self.client.get(url).json()["source_detail"])
+        sources = self.client.get(reverse("news:source-list")).json()["results"]
+        self.assertEqual(sources[0]["article_count"], 1)
+
+    def test_source_list_is_paginated_and_filtered(self):
+        for source_id, name in (("bbc", "BBC News"), ("bbc-sport", "BBC Sport")):
+            Source.objects.create(source_id=source_id, name=name)
+        Source.objects.create(source_id="cnn", name="CNN")
+        url = reverse("news:source-list")
+
+        page = self.client.get(url, {"name": "bbc", "page_size": 1}).json()
+        self.assertEqual(page["count"], 2)
+        self.assertEqual([row["name"] for row in page["results"]], ["BBC News"])
+        self.assertIsNotNone(page["next"])
+
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url, {"name": "cnn"})["X-Cache"], "MISS")
+        response = self.client.get(url, {"name": " CNN", "page": 1})
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.json()["results"][0]["source_id"], "cnn")
+
+        # Page sizes are clamped into the key: invalid ones are the default
+        for page_size, outcome in (
+            ("100", "HIT"),
+            ("abc", "HIT"),
+            ("0", "HIT"),
+            ("500", "MISS"),
+            ("9999", "HIT"),
+        ):
+            response = self.client.get(url, {"page_size": page_size})
+            self.assertEqual(response["X-Cache"], outcome, page_size)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FacetTest(CachedAPITestMixin, TestCase):
+    """Test grouped article counts for the dashboard filters."""
+
+    def setUp(self):
+        super().setUp()
+        sports = Category.objects.create(name="Sports", slug="sports")
+        health = Category.objects.create(name="Health", slug="health")
+        wire = Source.objects.create(source_id="wire", name="Wire")
+        bbc = Source.objects.create(source_id="bbc-news", name="BBC News")
+        for number, (category, source, country) in enumerate(
+            [
+                (sports, wire, "us"),
+                (sports, wire, "us"),
+                (sports, bbc, "gb"),
+                (health, bbc, "gb"),
+                (health, wire, "us"),
+                (None, None, ""),
+            ]
+        ):
+            Article.objects.create(
+                category=category,
+                source=source,
+                country=country,
+                title=f"Story {number}",
+                url=f"https://example.com/{number}",
+                published_at="2026-01-01T00:00:00Z",
+            )
+
+    def test_counts_per_facet(self):
+        response = self.client.get(reverse("news:article-facets"))
+        self.assertEqual(
+            response.json(),
+            {
+                "total": 6,
+                "category": [
+                    {"value": "sports", "name": "Sports", "count": 3},
+                    {"value": "health", "name": "Health", "count": 2},
+                ],
+                "source": [
+                    {"value": "wire", "name": "Wire", "count": 3},
+                    {"value": "bbc-news", "name": "BBC News", "count": 2},
+                ],
+                "country": [
+                    {"value": "us", "count": 3},
+                    {"value": "gb", "count": 2},
+                ],
+            },
+        )
+
+    @override_settings(NEWS_FACET_LIMIT=1)
+    def test_filters_and_limit(self):
+        facets = self.client.get(
+            reverse("news:article-facets"), {"source": "bbc-news"}
+        ).json()
+        self.assertEqual(facets["total"], 2)
+        self.assertEqual(facets["country"], [{"value": "gb", "count": 2}])
+        self.assertEqual(len(facets["category"]), 1)
+
+    def test_cached_per_normalized_filters(self):
+        url = reverse("news:article-facets")
+        first = self.client.get(url, {"country": "US"})
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            again = self.client.get(url, {"country": "us", "page": 3})
+        self.assertEqual(again["X-Cache"], "HIT")
+        self.assertEqual(again.json()["total"], 3)
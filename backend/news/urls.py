@@ -13,6 +13,16 @@ app_name = "news"
 urlpatterns = [
     # Article endpoints
     path("articles/", views.ArticleListView.as_view(), name="article-list"),
+    path(
+        "articles/facets/",
+        views.ArticleFacetView.as_view(),
+        name="article-facets",
+    ),
+    path(
+        "articles/batch/",
+        views.ArticleBatchView.as_view(),
+        name="article-batch",
+    ),
     path(
         "articles/<int:pk>/",
         views.ArticleDetailView.as_view(),
@@ -21,6 +31,14 @@ urlpatterns = [
     # Category & Source endpoints
     path("categories/", views.CategoryListView.as_view(), name="category-list"),
     path("sources/", views.SourceListView.as_view(), name="source-list"),
-    # Manual fetch trigger
+    # Manual fetch trigger and job status
     path("fetch/", views.FetchNewsView.as_view(), name="fetch-news"),
+    path(
+        "fetch/<str:job_id>/",
+        views.FetchJobStatusView.as_view(),
+        name="fetch-job",
+    ),
+    path("quota/", views.QuotaView.as_view(), name="quota"),
+    path("cache/", views.CacheStatsView.as_view(), name="cache-stats"),
+    path("cache/keys/", views.CacheKeyStatsView.as_view(), name="cache-key-stats"),
 ]
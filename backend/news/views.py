@@ -3,51 +3,116 @@ Views for the News API endpoints.
 
 Implements:
 - ArticleListView: paginated list with filters (category, source, country, search)
+- ArticleFacetView: article counts per category, source and country
 - ArticleDetailView: single article detail
+- ArticleBatchView: several article details at once
 - CategoryListView: all categories with article counts
-- SourceListView: all sources with article counts
-- FetchNewsView: manually trigger news fetching
-
-Caching is applied to list views to reduce database load.
+- SourceListView: paginated sources with article counts
+- FetchNewsView: queue a manual news fetch
+- FetchJobStatusView: state of a queued fetch
+- QuotaView: remaining News API request budget
+- CacheStatsView: list response cache hit / stale / miss counters
+- CacheKeyStatsView: the same counters per normalized request
+
+List responses are cached under generation-versioned keys that ingest
+bumps for the slices it touches (see caching.py).
 """
 
 import logging
+from urllib.parse import urlencode
 
 from django.conf import settings
-from django.db.models import Count, Q
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.test import RequestFactory
+from django.urls import reverse
 from rest_framework import generics, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from . import jobs, snapshots
+from .caching import (
+    GLOBAL,
+    GenerationCacheMixin,
+    article_etag,
+    cache_stats,
+    generation_key,
+    get_article_entries,
+    get_article_payloads,
+    key_stats,
+    not_modified,
+    set_validators,
+)
+from .counts import count_generation
+from .facets import facet_counts
 from .models import Article, Category, Source
+from .pagination import ArticlePagination, KeysetPagination, SourcePagination
+from .search import SEARCH_MODES, normalize_search, search_articles, search_key
 from .serializers import (
     ArticleListSerializer,
     ArticleSerializer,
     CategorySerializer,
     SourceSerializer,
+    article_list_data,
+    article_list_rows,
+    parse_fields,
 )
-from .services import NewsAPIService
+from .quota import newsapi_quota
+from .renderers import FastJSONRenderer
+from .resolvers import category_resolver, source_resolver
+from .services import NEWS_API_CATEGORIES, Feed
+from .tasks import run_fetch_job
 
 logger = logging.getLogger("news")
 
 
-class ArticleListView(generics.ListAPIView):
+class ArticleListView(GenerationCacheMixin, generics.ListAPIView):
     """
     GET /api/news/articles/
 
-    Returns a paginated list of news articles (50 per page).
+    Returns a paginated list of news articles (50 per page). The total is
+    exact for small results and a planner estimate for large ones; the
+    response's `count_type` says which (see counts.py).
+    Pass ?pagination=cursor for keyset pagination (see pagination.py),
+    which follows opaque next/previous cursors instead of page numbers.
     Supports filtering by:
       - category (slug)
       - source (source_id)
       - country (ISO 3166-1 alpha-2)
-      - search (full-text search on title and description)
-
-    Results are cached for 10 minutes to reduce database load.
+      - search (ranked full-text search on title, description and source)
+      - search_mode (substring: plain ICONTAINS match instead)
+      - collapse (1/true: one article per near-duplicate story cluster)
+    and returns only the comma-separated `fields` given, if any.
+
+    Responses are cached until ingest adds articles to one of the
+    slices the request filters on (see caching.py), and carry an ETag
+    and Last-Modified derived from the same generation counters, so a
+    matching conditional request gets 304 without a query. The first
+    pages of the global feed and of each category and country are
+    pre-rendered by ingest and served without the ORM (see
+    snapshots.py).
     """
 
     serializer_class = ArticleListSerializer
+    pagination_class = ArticlePagination
+    # List pages only hold strings, integers, null and datetimes, which
+    # FastJSONRenderer writes exactly as JSONRenderer does
+    renderer_classes = [
+        FastJSONRenderer if renderer is JSONRenderer else renderer
+        for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+    ]
+    cache_prefix = "articles"
+
+    @property
+    def paginator(self):
+        """Switch to keyset pagination when the request opts in."""
+        if not hasattr(self, "_paginator") and KeysetPagination.requested(
+            self.request
+        ):
+            self._paginator = KeysetPagination()
+        return super().paginator
 
     def get_queryset(self):
         """Build an optimised queryset with select_related and filters."""
@@ -59,104 +124,319 @@ class ArticleListView(generics.ListAPIView):
             .order_by("-published_at")  # Explicit ordering for index usage
         )
 
+        # Category and source are filtered on the foreign key, resolved
+        # through the cached resolvers, so the query needs no join and
+        # can use idx_category_pub / idx_source_pub (see plans.py).
+
         # --- Filter by category slug ---
         category = self.request.query_params.get("category")
         if category:
-            queryset = queryset.filter(category__slug=category)
+            queryset = queryset.filter(
+                category_id=self._resolve(category_resolver, category)
+            )
 
         # --- Filter by source ---
         source = self.request.query_params.get("source")
         if source:
-            queryset = queryset.filter(source__source_id=source)
+            queryset = queryset.filter(
+                source_id=self._resolve(source_resolver, source)
+            )
 
-        # --- Filter by country ---
+        # --- Filter by country (stored lower-case, see services.py) ---
         country = self.request.query_params.get("country")
         if country:
-            queryset = queryset.filter(country__iexact=country)
+            queryset = queryset.filter(country=country.lower())
 
-        # --- Full-text search on title & description ---
-        search = self.request.query_params.get("search")
+        # --- Ranked full-text search (or substring match, see search.py) ---
+        search = normalize_search(self.request.query_params.get("search"))
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            )
+            mode = self.request.query_params.get("search_mode", "fulltext")
+            if mode not in SEARCH_MODES:
+                raise ValidationError(
+                    {"search_mode": f"Must be one of: {', '.join(SEARCH_MODES)}."}
+                )
+            queryset = search_articles(queryset, search, mode)
+
+        # --- Collapse near-duplicate stories to their first copy ---
+        if self.request.query_params.get("collapse") in ("1", "true"):
+            queryset = queryset.filter(is_duplicate=False)
 
         return queryset
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
+    def get_prebuilt_response(self, request):
+        """Serve page 1..N of the main slices from ingest snapshots."""
+        return snapshots.serve(self, request)
+
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        """
+        Serializer-free list: the page is read with values_list() and
+        turned into ArticleListSerializer's dicts directly, so no model
+        instances or serializer fields are built per row.
+        """
+        fields = self.get_fields()
+        queryset = article_list_rows(
+            self.filter_queryset(self.get_queryset()), fields
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(article_list_data(page, fields))
+
+    def get_fields(self):
+        """Fields requested with ?fields=, or None for all of them."""
+        return parse_fields(
+            self.request.query_params.get("fields"),
+            self.serializer_class.Meta.fields,
+        )
+
+    @staticmethod
+    def _resolve(resolver, key):
+        """Primary key for a filter value; 0 (matches nothing) if unknown."""
+        return resolver.resolve_many({key: {}}, create=False).get(key, 0)
+
+    def get_cache_query(self, request):
+        """
+        Canonical query string of the filters, so that equivalent requests
+        share one cache entry: parameters sorted, unknown ones and empty
+        filters dropped, country lower-cased, search trimmed and
+        lower-cased, fields in serializer order, and page 1 explicit
+        unless cursor pagination is used.
+        """
+        params = request.query_params
+        canonical = self.get_canonical_filters(request)
+        fields = self.get_fields()
+        if fields is not None:
+            canonical["fields"] = ",".join(fields)
+        if KeysetPagination.requested(request):
+            canonical["pagination"] = "cursor"
+            if params.get("cursor"):
+                canonical["cursor"] = params["cursor"]
+        else:
+            canonical["page"] = params.get("page") or "1"
+        return urlencode(sorted(canonical.items()))
+
+    @staticmethod
+    def get_canonical_filters(request) -> dict:
+        """The filter parameters in use, normalized (see get_cache_query)."""
+        params = request.query_params
+        canonical = {
+            name: params[name] for name in ("category", "source") if params.get(name)
+        }
+        if params.get("country"):
+            canonical["country"] = params["country"].lower()
+        search = search_key(params.get("search"))
+        if search:
+            canonical["search"] = search
+            canonical["search_mode"] = params.get("search_mode") or "fulltext"
+        if params.get("collapse") in ("1", "true"):
+            canonical["collapse"] = "1"
+        return canonical
+
+    def get_cache_generations(self, request):
+        """
+        Counters of the category / source / country filters in use.
+
+        Any one of them is bumped whenever ingest adds a matching
+        article; lists without those filters follow the global counter.
+        The count of the filter set has a counter too (see counts.py).
+        """
+        params = request.query_params
+        keys = [
+            generation_key(scope, value)
+            for scope, value in (
+                ("category", params.get("category")),
+                ("source", params.get("source")),
+                ("country", (params.get("country") or "").lower()),
+            )
+            if value
+        ]
+        return [
+            *(keys or [generation_key(GLOBAL)]),
+            count_generation(self.get_canonical_filters(request)),
+        ]
+
+    @classmethod
+    def filtered_queryset(cls, filters: dict):
+        """The list queryset of canonical `filters` (get_canonical_filters)."""
+        view = cls(request=Request(RequestFactory().get("/", filters)))
+        return view.filter_queryset(view.get_queryset())
+
+
+class ArticleFacetView(ArticleListView):
+    """
+    GET /api/news/articles/facets/
+
+    Returns the number of articles per category, source and country
+    (the top NEWS_FACET_LIMIT of each) and in total, under the same
+    filters as ArticleListView, from one aggregate query (see
+    facets.py). Cached per normalized filter set, on the same
+    generation counters as the list.
+    """
+
+    cache_prefix = "facets"
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(facet_counts(queryset, settings.NEWS_FACET_LIMIT))
+
+    def get_cache_query(self, request):
+        """Canonical query string of the filters alone."""
+        return urlencode(sorted(self.get_canonical_filters(request).items()))
+
+    def get_prebuilt_response(self, request):
+        return None
 
 
 class ArticleDetailView(generics.RetrieveAPIView):
     """
     GET /api/news/articles/<id>/
 
-    Returns full details for a single article.
+    Returns full details for a single article, read through the
+    per-article cache (see caching.get_article_entries). Responses carry
+    an ETag and Last-Modified from the cached entry, and matching
+    conditional requests get 304 Not Modified.
+    Pass ?fields=a,b,c for a subset of the fields; it is cut from the
+    cached payload, which serves every field set.
     """
 
     queryset = Article.objects.select_related("category", "source").all()
     serializer_class = ArticleSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        fields = parse_fields(
+            request.query_params.get("fields"), self.serializer_class.Meta.fields
+        )
+        entry = get_article_entries([kwargs["pk"]]).get(kwargs["pk"])
+        if entry is None:
+            raise NotFound()
+        variant = request.accepted_renderer.format
+        if fields is not None:
+            variant = f"{variant}:{','.join(fields)}"
+        # Digested, since If-None-Match lists are split on commas
+        etag = article_etag(entry, variant)
+        last_modified = entry["last_modified"]
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            data = entry["data"]
+            if fields is not None:
+                data = {field: data[field] for field in fields}
+            response = Response(data)
+            set_validators(response, etag, last_modified)
+        return response
+
+
+class ArticleBatchView(APIView):
+    """
+    GET /api/news/articles/batch/?ids=1,2,3
+
+    Returns the details of up to NEWS_ARTICLE_BATCH_MAX articles in the
+    order requested, from one cache multi-get (and at most one query for
+    the articles not cached). Unknown ids are listed under `missing`.
+    """
+
+    def get(self, request):
+        raw = request.query_params.get("ids", "")
+        try:
+            ids = [int(value) for value in raw.split(",") if value.strip()]
+        except ValueError:
+            raise ValidationError({"ids": "Must be a comma-separated list of ids."})
+        if not ids or len(ids) > settings.NEWS_ARTICLE_BATCH_MAX:
+            raise ValidationError(
+                {"ids": f"Give 1 to {settings.NEWS_ARTICLE_BATCH_MAX} ids."}
+            )
+
+        payloads = get_article_payloads(ids)
+        return Response(
+            {
+                "results": [payloads[pk] for pk in ids if pk in payloads],
+                "missing": [pk for pk in ids if pk not in payloads],
+            }
+        )
+
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(GenerationCacheMixin, generics.ListAPIView):
     """
     GET /api/news/categories/
 
-    Returns all categories with article counts.
-    Cached for 15 minutes.
+    Returns all categories with their maintained article counts (see
+    counters.py). Cached until the next ingest batch that creates
+    articles.
     """
 
     serializer_class = CategorySerializer
     pagination_class = None
+    cache_prefix = "categories"
 
     def get_queryset(self):
-        return Category.objects.annotate(
-            article_count=Count("articles")
-        ).order_by("name")
-
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return Category.objects.order_by("name")
 
 
-class SourceListView(generics.ListAPIView):
+class SourceListView(GenerationCacheMixin, generics.ListAPIView):
     """
     GET /api/news/sources/
 
-    Returns all sources with article counts.
-    Cached for 15 minutes.
+    Returns sources with their maintained article counts (see
+    counters.py), 100 per page (?page_size= up to 500). Supports
+    filtering by:
+      - name (case-insensitive substring)
+
+    Cached until the next ingest batch that creates articles.
     """
 
     serializer_class = SourceSerializer
-    pagination_class = None
+    pagination_class = SourcePagination
+    cache_prefix = "sources"
 
     def get_queryset(self):
-        return Source.objects.annotate(
-            article_count=Count("articles")
-        ).order_by("name")
+        queryset = Source.objects.order_by("name", "id")
+        name = self.request.query_params.get("name", "").strip()
+        if name:
+            queryset = queryset.filter(name__icontains=name)
+        return queryset
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    def get_cache_query(self, request):
+        """
+        Canonical query string: name trimmed and lower-cased, page and
+        page size explicit, the page size as SourcePagination clamps it.
+        """
+        params = request.query_params
+        canonical = {
+            "page": params.get("page") or "1",
+            "page_size": str(self.paginator.get_page_size(request)),
+        }
+        name = params.get("name", "").strip().lower()
+        if name:
+            canonical["name"] = name
+        return urlencode(sorted(canonical.items()))
 
 
 class FetchNewsView(APIView):
     """
     POST /api/news/fetch/
 
-    Manually trigger a news fetch from the News API.
+    Queue a manual news fetch from the News API and return 202 Accepted
+    with a job id; poll FetchJobStatusView for progress. Identical
+    requests made while a job is still running return that job.
     Accepts optional body parameters:
-      - category: e.g. technology, business
-      - country: e.g. us, gb
+      - category: one of NEWS_API_CATEGORIES, e.g. technology, business
+      - country: ISO 3166-1 alpha-2, e.g. us, gb
       - query: keyword search
+    Category and country are lower-cased, so US and us share one job.
     """
 
     def post(self, request):
-        category = request.data.get("category", "general")
-        country = request.data.get("country", "us")
+        category = str(request.data.get("category") or "general").strip().lower()
+        country = str(request.data.get("country") or "us").strip().lower()
         query = request.data.get("query", None)
 
+        if category not in NEWS_API_CATEGORIES:
+            raise ValidationError(
+                {"category": f"Must be one of: {', '.join(NEWS_API_CATEGORIES)}."}
+            )
+        if not (len(country) == 2 and country.isascii() and country.isalpha()):
+            raise ValidationError(
+                {"country": "Must be an ISO 3166-1 alpha-2 code, e.g. us."}
+            )
+
         if settings.NEWS_API_KEY == "YOUR_NEWS_API_KEY_HERE":
             return Response(
                 {
@@ -166,20 +446,83 @@ class FetchNewsView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        service = NewsAPIService()
-        try:
-            count = service.fetch_top_headlines(
-                category=category, country=country
-            )
-            if query:
-                count += service.fetch_everything(query=query)
+        feeds = [Feed.top_headlines(category, country)]
+        if query:
+            feeds.append(Feed("everything", query=query))
+
+        job, created = jobs.create_job(feeds)
+        if created:
+            try:
+                run_fetch_job.apply_async(args=[job["id"]], task_id=job["id"])
+            except Exception as e:
+                logger.error("Error queueing fetch job: %s", e)
+                jobs.finish_job(job, jobs.FAILED)
+                return Response(
+                    {"error": str(e)},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+        status_url = reverse("news:fetch-job", kwargs={"job_id": job["id"]})
+        return Response(
+            {
+                "job_id": job["id"],
+                "state": job["state"],
+                "coalesced": not created,
+                "status_url": request.build_absolute_uri(status_url),
+            },
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": status_url},
+        )
+
+
+class FetchJobStatusView(APIView):
+    """
+    GET /api/news/fetch/<job_id>/
+
+    Returns the state of a fetch job (queued, running, succeeded, failed)
+    with per-feed article counts, errors and timings.
+    """
+
+    def get(self, request, job_id):
+        job = jobs.get_job(job_id)
+        if job is None:
             return Response(
-                {"message": f"Successfully fetched and stored {count} articles."},
-                status=status.HTTP_200_OK,
-            )
-        except Exception as e:
-            logger.error("Error fetching news: %s", e)
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND
             )
+        return Response(jobs.public_job(job))
+
+
+class QuotaView(APIView):
+    """
+    GET /api/news/quota/
+
+    Returns the remaining shared News API request budget, overall and per
+    priority class.
+    """
+
+    def get(self, request):
+        return Response(newsapi_quota.metrics())
+
+
+class CacheStatsView(APIView):
+    """
+    GET /api/news/cache/
+
+    Returns hit, stale and miss counters of the list response cache per
+    endpoint (see caching.py).
+    """
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class CacheKeyStatsView(APIView):
+    """
+    GET /api/news/cache/keys/
+
+    Returns hit, stale and miss counters per normalized list request
+    (e.g. `category=sports&page=1`), most requested first.
+    """
+
+    def get(self, request):
+        return Response(key_stats())
@@ -9,7 +9,7 @@
 
 import { HttpClient, HttpParams } from '@angular/common/http';
 import { Injectable } from '@angular/core';
-import { Observable, catchError, of } from 'rxjs';
+import { Observable, catchError, map, of } from 'rxjs';
 
 import { Article, Category, PaginatedResponse, Source } from '../models/news.model';
 
@@ -69,12 +69,14 @@ export class NewsService {
   }
 
   /**
-   * Get all available sources.
+   * Get the sources for the filter dropdown (the largest page the API serves).
    */
   getSources(): Observable<Source[]> {
     const url = `${this.baseUrl}/sources/`;
+    const params = new HttpParams().set('page_size', '500');
     console.log('Fetching sources from:', url);
-    return this.http.get<Source[]>(url).pipe(
+    return this.http.get<PaginatedResponse<Source>>(url, { params }).pipe(
+      map((response) => response.results),
       catchError((error) => {
         console.error('Error fetching sources:', error);
         return of([]);